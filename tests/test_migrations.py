@@ -0,0 +1,83 @@
+# tests/test_migrations.py
+
+# ---Several desks starting at once on the same shared folder must each end up with fully
+# ---migrated databases, with every migration applied exactly once.
+
+
+import multiprocessing
+import sqlite3
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from ui.database.connection import DB_MAP, close_connections, use_database_dir
+from ui.database.migrations import MIGRATIONS, latest_version, migrate, migrate_all, schema_version
+
+DESKS = 4
+
+
+def _desk(directory: str, start: threading.Barrier, results: multiprocessing.Queue) -> None:
+    use_database_dir(Path(directory))
+    start.wait()
+    try:
+        migrate_all()
+        close_connections()
+        results.put({db_key: _file_version(path) for db_key, path in DB_MAP.items()})
+    except Exception as e:
+        results.put(repr(e))
+
+
+def _file_version(path: Path) -> int:
+    conn = sqlite3.connect(str(path))
+    try:
+        return schema_version(conn)
+    finally:
+        conn.close()
+
+
+def _run_desks(directory: Path) -> list[dict[str, int] | str]:
+    # ---Each desk is its own process, released together once all of them have started
+    context = multiprocessing.get_context("spawn")
+    start = context.Barrier(DESKS)
+    results = context.Queue()
+    desks = [context.Process(target=_desk, args=(str(directory), start, results)) for _ in range(DESKS)]
+    for desk in desks:
+        desk.start()
+    outcomes = [results.get(timeout=60) for _ in desks]
+    for desk in desks:
+        desk.join()
+    return outcomes
+
+
+@pytest.fixture
+def database_dir(tmp_path: Path) -> Iterator[Path]:
+    saved = dict(DB_MAP)
+    use_database_dir(tmp_path)
+    yield tmp_path
+    close_connections()
+    DB_MAP.update(saved)
+
+
+@pytest.mark.parametrize("round_", range(3))
+def test_desks_migrate_a_new_folder_at_once(database_dir: Path, round_: int) -> None:
+    latest = {db_key: latest_version(db_key) for db_key in MIGRATIONS}
+    assert _run_desks(database_dir) == [latest] * DESKS
+
+
+def test_desks_finish_an_upgrade_at_once(database_dir: Path) -> None:
+    # ---Files left at the first version, as an older release would have
+    first_only = {db_key: [m for m in migrations if m.version == 1] for db_key, migrations in MIGRATIONS.items()}
+    saved = dict(MIGRATIONS)
+    MIGRATIONS.update(first_only)
+    try:
+        for db_key in MIGRATIONS:
+            migrate(db_key)
+    finally:
+        MIGRATIONS.update(saved)
+    close_connections()
+
+    latest = {db_key: latest_version(db_key) for db_key in MIGRATIONS}
+    assert _run_desks(database_dir) == [latest] * DESKS
+
@@ -1,9 +1,28 @@
-from .main_window import *
-from .new_patients import *
-from .reports_window import *
-from .schedule_window import *
-from .update_providers import *
-from .visit_details import *
-from .working_area import *
-
-__all__ = ["MainWindow", "NewPatientWindow", "ReportsWindow", "Schedule", "UpdateProvidersWindow", "VisitDetailsWindow", "WorkingArea"]
+# ---Windows are imported on first access, so importing ui.config or ui.database (or starting the
+# ---app) does not pull in every screen.
+
+import importlib
+
+_MODULES = {
+    "DiagnosticsWindow": ".diagnostics_window",
+    "ImportPatientsWindow": ".import_window",
+    "MainWindow": ".main_window",
+    "NewPatientWindow": ".new_patients",
+    "NotesSearchWindow": ".notes_search_window",
+    "ReportsWindow": ".reports_window",
+    "Schedule": ".schedule_window",
+    "ScheduleOverviewWindow": ".schedule_overview",
+    "UpdateProvidersWindow": ".update_providers",
+    "VisitDetailsWindow": ".visit_details",
+    "WorkingArea": ".working_area",
+}
+
+
+def __getattr__(name: str) -> object:
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
+
+
+__all__ = ["DiagnosticsWindow", "ImportPatientsWindow", "MainWindow", "NewPatientWindow", "NotesSearchWindow", "ReportsWindow", "Schedule", "ScheduleOverviewWindow", "UpdateProvidersWindow", "VisitDetailsWindow", "WorkingArea"]
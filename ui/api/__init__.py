@@ -0,0 +1,20 @@
+# ---HTTP/JSON access to the clinic databases for terminals that do not run the desktop app.
+# ---Started with python main.py serve; see ui/api/server.py.
+
+import importlib
+
+_MODULES = {
+    "ApiError": ".server",
+    "ApiServer": ".server",
+    "serve": ".server",
+}
+
+
+def __getattr__(name: str) -> object:
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
+
+
+__all__ = ["ApiError", "ApiServer", "serve"]
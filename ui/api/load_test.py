@@ -0,0 +1,257 @@
+# ui/api/load_test.py
+
+# ---Requests per second and latency for the API server on localhost. Unless --port names a server
+# ---that is already running, starts "main.py serve" in its own process on a free port (against
+# -----db-dir, e.g. a copy filled by ui.database.seed), then keeps --concurrency keep-alive
+# ---connections busy for --duration seconds with the kiosk's reads, plus patient sign-ups and
+# ---bookings with --writes. Bookings go to far-future days, so point --db-dir at a scratch copy.
+
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, NamedTuple
+from urllib.parse import quote
+
+from ui.api.server import DEFAULT_HOST, DEFAULT_READ_THREADS
+from ui.database.benchmark import percentile
+
+DEFAULT_CONCURRENCY = 16
+DEFAULT_DURATION = 10.0
+DEFAULT_WARMUP = 1.0
+SERVER_START_TIMEOUT = 15.0
+MAIN = Path(__file__).resolve().parents[2] / "main.py"
+NAME_PREFIXES = "ABCDEFGHJKLMNPRSTW"
+
+
+class Sample(NamedTuple):
+    # ---Read from the server once before the run
+    patient_ids: list[str]
+    name_fragments: list[str]
+    provider_ids: list[str]
+
+
+class Call(NamedTuple):
+    name: str
+    weight: int
+    build: Callable[[random.Random, Sample, int], tuple[str, str, dict | None]]  # ---(method, target, body)
+    writes: bool = False
+
+
+class CallResult(NamedTuple):
+    name: str
+    requests: int
+    rejected: int  # ---4xx: a taken slot, a provider at their daily limit, ...
+    errors: int  # ---5xx and dropped connections
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    requests_per_sec: float
+
+
+def _day(rng: random.Random) -> str:
+    return (date.today() + timedelta(days=rng.randint(0, 60))).isoformat()
+
+
+def _booking(rng: random.Random, s: Sample, i: int) -> tuple[str, str, dict | None]:
+    # ---A different (provider, day, slot) per call, decades ahead of any real booking
+    providers = len(s.provider_ids)
+    day = date.today() + timedelta(days=365 * 50 + i // (providers * 8))
+    body = {"provider_id": s.provider_ids[i % providers], "patient_id": rng.choice(s.patient_ids), "date": day.isoformat(), "slot": 9 + (i // providers) % 8}
+    return "POST", "/bookings", body
+
+
+def _sign_up(rng: random.Random, _s: Sample, i: int) -> tuple[str, str, dict | None]:
+    body = {"name": f"Load Test {i}", "dob": "1980-01-01", "phone": f"(555) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}", "email": f"load{i}@example.com"}
+    return "POST", "/patients", body
+
+
+CALLS: tuple[Call, ...] = (
+    Call("providers", 2, lambda _r, _s, _i: ("GET", "/providers", None)),
+    Call("patients.search", 4, lambda r, s, _i: ("GET", f"/patients?q={quote(r.choice(s.name_fragments))}&limit=20", None)),
+    Call("schedule.day", 4, lambda r, s, _i: ("GET", f"/schedule?provider_id={quote(r.choice(s.provider_ids))}&date={_day(r)}", None)),
+    Call("availability", 2, lambda r, _s, _i: ("GET", f"/availability?start={_day(r)}&limit=10", None)),
+    Call("visits.page", 3, lambda r, s, _i: ("GET", f"/patients/{quote(r.choice(s.patient_ids))}/visits?limit=50", None)),
+    Call("bookings.create", 1, _booking, writes=True),
+    Call("patients.create", 1, _sign_up, writes=True),
+)
+
+
+class _Client:
+    # ---One keep-alive HTTP/1.1 connection
+    def __init__(self, host: str, port: int, token: str | None) -> None:
+        self.host = host
+        self.port = port
+        self.auth = f"Authorization: Bearer {token}\r\n" if token else ""
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def request(self, method: str, target: str, body: dict | None = None) -> tuple[int, Any]:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        payload = json.dumps(body).encode() if body is not None else b""
+        head = f"{method} {target} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\nContent-Length: {len(payload)}\r\n{self.auth}\r\n"
+        try:
+            self._writer.write(head.encode("latin-1") + payload)
+            await self._writer.drain()
+            status = int((await self._reader.readline()).split()[1])
+            length = 0
+            while (line := await self._reader.readline()) not in (b"\r\n", b""):
+                name, _, value = line.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    length = int(value)
+            data = await self._reader.readexactly(length)
+        except (ConnectionError, IndexError, ValueError, asyncio.IncompleteReadError):
+            self.close()
+            raise
+        return status, json.loads(data) if data else None
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+
+async def draw_sample(client: _Client) -> Sample:
+    _, providers = await client.request("GET", "/providers")
+    patient_ids, names = [], []
+    for prefix in NAME_PREFIXES:
+        _, matches = await client.request("GET", f"/patients?q={prefix}&limit=50")
+        patient_ids.extend(m["patient_id"] for m in matches)
+        names.extend(m["name"] for m in matches)
+    fragments = sorted({name.split()[-1][:4] for name in names if name.strip()})
+    return Sample(patient_ids, fragments, [p["provider_id"] for p in providers])
+
+
+async def run_load(host: str, port: int, concurrency: int, duration: float, warmup: float, writes: bool, seed: int, token: str | None) -> list[CallResult]:
+    rng = random.Random(seed)
+    sample = await draw_sample(_Client(host, port, token))
+    if not sample.patient_ids or not sample.provider_ids:
+        raise ValueError("No patients or providers to load test; seed the databases first (python main.py seed)")
+
+    calls = [c for c in CALLS if writes or not c.writes]
+    weights = [c.weight for c in calls]
+    timings: dict[str, list[float]] = {c.name: [] for c in calls}
+    rejected = dict.fromkeys(timings, 0)
+    errors = dict.fromkeys(timings, 0)
+    counters = dict.fromkeys(timings, 0)
+    loop = asyncio.get_running_loop()
+    record_from = loop.time() + warmup
+    stop_at = record_from + duration
+
+    async def worker(worker_rng: random.Random) -> None:
+        client = _Client(host, port, token)
+        while (now := loop.time()) < stop_at:
+            call = worker_rng.choices(calls, weights)[0]
+            counters[call.name] += 1
+            method, target, body = call.build(worker_rng, sample, counters[call.name])
+            start = time.perf_counter()
+            try:
+                status, _ = await client.request(method, target, body)
+            except (OSError, IndexError, ValueError, asyncio.IncompleteReadError):
+                status = 599
+            if now < record_from:
+                continue
+            timings[call.name].append((time.perf_counter() - start) * 1000)
+            if status >= 500:
+                errors[call.name] += 1
+            elif status >= 400:
+                rejected[call.name] += 1
+        client.close()
+
+    await asyncio.gather(*(worker(random.Random(rng.random())) for _ in range(concurrency)))
+
+    results = []
+    for name, samples in timings.items():
+        samples.sort()
+        results.append(
+            CallResult(
+                name,
+                len(samples),
+                rejected[name],
+                errors[name],
+                round(percentile(samples, 50), 3),
+                round(percentile(samples, 95), 3),
+                round(percentile(samples, 99), 3),
+                round(samples[-1], 3) if samples else 0.0,
+                round(len(samples) / duration, 1),
+            )
+        )
+    return results
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind((DEFAULT_HOST, 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int, db_dir: Path | None, read_threads: int, token: str | None) -> subprocess.Popen:
+    command = [sys.executable, str(MAIN), *(["--db-dir", str(db_dir)] if db_dir else []), "serve", "--port", str(port), "--read-threads", str(read_threads)]
+    env = {**os.environ, "HEALTHCARE_LOG_LEVELS": os.environ.get("HEALTHCARE_LOG_LEVELS", "WARNING")}
+    if token:
+        env["HEALTHCARE_API_TOKEN"] = token
+    server = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL)  # noqa: S603
+
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"API server exited with code {server.returncode}")
+        try:
+            socket.create_connection((DEFAULT_HOST, port), timeout=0.2).close()
+            return server
+        except OSError:
+            time.sleep(0.05)
+    server.terminate()
+    raise RuntimeError("API server did not start")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the API server on localhost.")
+    parser.add_argument("--port", type=int, default=None, help="test a server already running on this port")
+    parser.add_argument("--db-dir", type=Path, default=None, help="serve the databases in this directory (when starting a server)")
+    parser.add_argument("--read-threads", type=int, default=DEFAULT_READ_THREADS, help="the started server's read threads")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="connections kept busy at once")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="seconds measured")
+    parser.add_argument("--warmup", type=float, default=DEFAULT_WARMUP, help="seconds run before measuring")
+    parser.add_argument("--writes", action="store_true", help="include patient sign-ups and bookings")
+    parser.add_argument("--token", default=os.environ.get("HEALTHCARE_API_TOKEN"))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = None
+    port = args.port
+    try:
+        if port is None:
+            port = _free_port()
+            server = start_server(port, args.db_dir, args.read_threads, args.token)
+        results = asyncio.run(run_load(DEFAULT_HOST, port, args.concurrency, args.duration, args.warmup, args.writes, args.seed, args.token))
+    except (OSError, RuntimeError, ValueError) as e:
+        print(f"Load test failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(10)
+
+    print(f"{args.concurrency} connections for {args.duration:g} s")
+    print(f"{'call':<20}{'requests':>10}{'4xx':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'req/s':>10}")
+    for r in results:
+        print(f"{r.name:<20}{r.requests:>10}{r.rejected:>8}{r.errors:>8}{r.p50_ms:>10.2f}{r.p95_ms:>10.2f}{r.p99_ms:>10.2f}{r.max_ms:>10.2f}{r.requests_per_sec:>10.0f}")
+    total = sum(r.requests for r in results)
+    print(f"{'total':<20}{total:>10}{sum(r.rejected for r in results):>8}{sum(r.errors for r in results):>8}{'':>40}{total / args.duration:>10.0f}")
+    return 1 if any(r.errors for r in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,451 @@
+# ui/api/server.py
+
+# ---HTTP/1.1 JSON server on asyncio (standard library only) for a check-in kiosk or a second
+# ---front-desk terminal: the same repository and service calls the Schedule and Reports screens
+# ---make, without the desktop app. Reads run concurrently on a small thread pool, each thread with
+# ---its own SQLite connection (WAL lets them read while a write commits). Every write is queued to
+# ---one writer task that runs them one at a time on a single thread, so requests never contend
+# ---for SQLite's write lock or sit out busy_timeout behind each other.
+# ---There is no TLS: bind to localhost or the clinic network, and set a token to require
+# ---"Authorization: Bearer <token>" on every request.
+
+
+import asyncio
+import base64
+import binascii
+import hmac
+import json
+import re
+import signal
+import sqlite3
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from http import HTTPStatus
+from typing import Any, NamedTuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from ui.config.logger_config import logger
+from ui.database.availability import DEFAULT_HOURS, find_available_slots
+from ui.database.connection import close_connections
+from ui.database.reference_cache import reference_cache
+from ui.database.repositories import VisitRepository, billing_repo, patient_repo, schedule_repo, visit_repo
+from ui.services.billing import overdue_bills
+from ui.services.errors import ServiceError
+from ui.services.patients import onboard_patient
+from ui.services.scheduling import SlotTaken, book_visit
+from ui.services.visits import add_visit
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_READ_THREADS = 4
+WRITE_QUEUE_SIZE = 256  # ---writers wait for room beyond this, rather than queueing without bound
+MAX_BODY_BYTES = 64 * 1024
+MAX_HEADERS = 100
+MAX_LIMIT = 500
+MAX_RANGE_DAYS = 93
+DEFAULT_SEARCH_DAYS = 30
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Request(NamedTuple):
+    method: str
+    path: str
+    params: dict[str, str]  # ---captured from the path
+    query: dict[str, str]
+    body: dict[str, Any]
+
+
+class Route(NamedTuple):
+    method: str
+    pattern: re.Pattern[str]
+    handler: Callable[[Request], object]
+    write: bool = False
+    status: int = 200
+
+
+# ******************************************************************************************
+#  / Arguments
+# ******************************************************************************************
+
+
+def _text(request: Request, name: str, default: str | None = None) -> str:
+    value = request.query.get(name, default)
+    if value is None:
+        raise ApiError(400, f"Missing query parameter: {name}")
+    return value
+
+
+def _int(request: Request, name: str, default: int, maximum: int = MAX_LIMIT) -> int:
+    try:
+        value = int(request.query.get(name, default))
+    except ValueError:
+        raise ApiError(400, f"{name} must be a whole number") from None
+    return max(1, min(value, maximum))
+
+
+def _date(request: Request, name: str, default: date | None = None) -> date:
+    value = request.query.get(name)
+    if value is None:
+        if default is None:
+            raise ApiError(400, f"Missing query parameter: {name}")
+        return default
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ApiError(400, f"{name} must be a date, yyyy-mm-dd") from None
+
+
+def _field[T](request: Request, name: str, kind: type[T] = str, required: bool = True) -> T | None:
+    value = request.body.get(name)
+    if value is None:
+        if required:
+            raise ApiError(400, f"Missing field: {name}")
+        return None
+    if kind is int and isinstance(value, str) and value.isdigit():
+        value = int(value)
+    if not isinstance(value, kind) or isinstance(value, bool):
+        raise ApiError(400, f"{name} must be a {kind.__name__}")
+    return value
+
+
+def _encode_cursor(value: object, visit_id: int) -> str:
+    # ---Opaque to clients; JSON keeps the sort value's type (text and numbers compare differently)
+    return base64.urlsafe_b64encode(json.dumps([value, visit_id]).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[object, int]:
+    try:
+        value, visit_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return value, int(visit_id)
+    except (ValueError, TypeError, binascii.Error):
+        raise ApiError(400, "Invalid cursor") from None
+
+
+# ******************************************************************************************
+#  / Handlers
+# ******************************************************************************************
+
+
+def _health(_request: Request) -> object:
+    return {"status": "ok"}
+
+
+def _search_patients(request: Request) -> object:
+    return patient_repo.search(_text(request, "q").strip(), _int(request, "limit", 20))
+
+
+def _get_patient(request: Request) -> object:
+    patient = patient_repo.get(request.params["patient_id"])
+    if patient is None:
+        raise ApiError(404, "No such patient")
+    return patient
+
+
+def _create_patient(request: Request) -> object:
+    patient_id = onboard_patient(_field(request, "name"), _field(request, "dob"), _field(request, "phone"), _field(request, "email"))
+    return {"patient_id": patient_id}
+
+
+def _providers(_request: Request) -> object:
+    return reference_cache.providers()
+
+
+def _schedule_day(request: Request) -> object:
+    # ---The Schedule screen's day grid, booked slots in hour order
+    day = schedule_repo.day_view(_text(request, "provider_id"), _date(request, "date").isoformat())
+    return sorted(day.values())
+
+
+def _schedule_range(request: Request) -> object:
+    # ---The schedule overview: every provider's bookings between two dates
+    start = _date(request, "start")
+    end = _date(request, "end")
+    if not 0 <= (end - start).days < MAX_RANGE_DAYS:
+        raise ApiError(400, f"end must be on or after start and at most {MAX_RANGE_DAYS} days later")
+    return schedule_repo.range_view(start.isoformat(), end.isoformat())
+
+
+def _availability(request: Request) -> object:
+    start = _date(request, "start", date.today())
+    end = _date(request, "end", start + timedelta(days=DEFAULT_SEARCH_DAYS))
+    provider_id = request.query.get("provider_id")
+    return find_available_slots(start, end, [provider_id] if provider_id else None, limit=_int(request, "limit", 10))
+
+
+def _book(request: Request) -> object:
+    date_str = _field(request, "date")
+    try:
+        date.fromisoformat(date_str)
+    except ValueError:
+        raise ApiError(400, "date must be a date, yyyy-mm-dd") from None
+    slot = _field(request, "slot", int)
+    if slot not in DEFAULT_HOURS:
+        raise ApiError(400, f"slot must be an hour from {DEFAULT_HOURS.start} to {DEFAULT_HOURS.stop - 1}")
+    return book_visit(_field(request, "provider_id"), _field(request, "patient_id"), date_str, slot)
+
+
+def _visits(request: Request) -> object:
+    # ---The Reports screen's visit list, a page at a time; pass "next" back as cursor for more
+    sort_key = _text(request, "sort", "visit_date")
+    if sort_key not in VisitRepository.SORT_EXPRESSIONS:
+        raise ApiError(400, f"sort must be one of {', '.join(VisitRepository.SORT_EXPRESSIONS)}")
+    cursor = request.query.get("cursor")
+    limit = _int(request, "limit", 50)
+    rows = visit_repo.page_for_patient(
+        request.params["patient_id"],
+        _decode_cursor(cursor) if cursor else None,
+        sort_key,
+        request.query.get("descending", "").lower() in ("1", "true", "yes"),
+        request.query.get("filter", ""),
+        limit,
+    )
+    next_cursor = _encode_cursor(rows[-1].sort_value, rows[-1].visit_id) if len(rows) == limit else None
+    return {"visits": [{k: v for k, v in row._asdict().items() if k != "sort_value"} for row in rows], "next": next_cursor}
+
+
+def _add_visit(request: Request) -> object:
+    visit_date = _field(request, "visit_date", required=False) or date.today().isoformat()
+    return add_visit(
+        _field(request, "patient_id"),
+        _field(request, "provider_id"),
+        visit_date,
+        _field(request, "notes", required=False) or "",
+        _field(request, "follow_up", required=False) or "",
+    )
+
+
+def _overdue_bills(request: Request) -> object:
+    return overdue_bills(_date(request, "as_of", date.today()))
+
+
+def _pay_bill(request: Request) -> object:
+    if not billing_repo.mark_paid(request.params["bill_id"]):
+        raise ApiError(404, "No unpaid bill with that ID")
+    return {"bill_id": request.params["bill_id"], "paid": True}
+
+
+def _route(method: str, path: str, handler: Callable[[Request], object], write: bool = False, status: int = 200) -> Route:
+    # ---"/patients/{patient_id}" captures patient_id
+    pattern = re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", path)
+    return Route(method, re.compile(f"^{pattern}$"), handler, write, status)
+
+
+ROUTES: tuple[Route, ...] = (
+    _route("GET", "/health", _health),
+    _route("GET", "/patients", _search_patients),
+    _route("POST", "/patients", _create_patient, write=True, status=201),
+    _route("GET", "/patients/{patient_id}", _get_patient),
+    _route("GET", "/patients/{patient_id}/visits", _visits),
+    _route("GET", "/providers", _providers),
+    _route("GET", "/schedule", _schedule_day),
+    _route("GET", "/schedule/range", _schedule_range),
+    _route("GET", "/availability", _availability),
+    _route("POST", "/bookings", _book, write=True, status=201),
+    _route("POST", "/visits", _add_visit, write=True, status=201),
+    _route("GET", "/bills/overdue", _overdue_bills),
+    _route("POST", "/bills/{bill_id}/pay", _pay_bill, write=True),
+)
+
+
+# ******************************************************************************************
+#  / Server
+# ******************************************************************************************
+
+
+def _plain(value: object) -> object:
+    # ---NamedTuples become objects rather than json's default arrays
+    if isinstance(value, tuple) and hasattr(value, "_asdict"):
+        return {key: _plain(item) for key, item in value._asdict().items()}
+    if isinstance(value, list | tuple):
+        return [_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _plain(item) for key, item in value.items()}
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _response(status: int, payload: object, keep_alive: bool) -> bytes:
+    body = json.dumps(_plain(payload), separators=(",", ":")).encode()
+    head = (
+        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+class ApiServer:
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, read_threads: int = DEFAULT_READ_THREADS, token: str | None = None) -> None:
+        self.host = host
+        self.port = port  # ---0 picks a free port; the real one is set by start()
+        self.token = token
+        self._readers = ThreadPoolExecutor(read_threads, thread_name_prefix="api-read")
+        self._writer_thread = ThreadPoolExecutor(1, thread_name_prefix="api-write")
+        self._writes: asyncio.Queue[tuple[Callable[[Request], object], Request, asyncio.Future] | None] | None = None
+        self._writer_task: asyncio.Task | None = None
+        self._server: asyncio.Server | None = None
+        self._clients: set[asyncio.StreamWriter] = set()
+
+    async def start(self) -> None:
+        self._writes = asyncio.Queue(WRITE_QUEUE_SIZE)
+        self._writer_task = asyncio.create_task(self._write_loop(), name="api-writer")
+        self._server = await asyncio.start_server(self._serve_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"API listening on http://{self.host}:{self.port}")
+
+    async def serve_forever(self) -> None:
+        # ---Until cancelled. (asyncio.Server.serve_forever would wait out idle keep-alive clients
+        # ---when cancelled, before close() gets to drop them.)
+        await asyncio.get_running_loop().create_future()
+
+    async def close(self) -> None:
+        # ---Stops accepting, drops idle keep-alive connections, lets queued writes finish
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._clients):
+                writer.close()
+            await self._server.wait_closed()
+        if self._writer_task is not None:
+            await self._writes.put(None)
+            await self._writer_task
+            await asyncio.get_running_loop().run_in_executor(self._writer_thread, close_connections)
+        self._readers.shutdown()
+        self._writer_thread.shutdown()
+        logger.info("API server stopped")
+
+    async def _write_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._writes.get()
+            if item is None:
+                return
+            handler, request, future = item
+            try:
+                result = await loop.run_in_executor(self._writer_thread, handler, request)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+    async def _call(self, route: Route, request: Request) -> object:
+        loop = asyncio.get_running_loop()
+        if not route.write:
+            return await loop.run_in_executor(self._readers, route.handler, request)
+        future = loop.create_future()
+        await self._writes.put((route.handler, request, future))
+        return await future
+
+    def _match(self, method: str, path: str) -> tuple[Route, dict[str, str]]:
+        allowed = False
+        for route in ROUTES:
+            found = route.pattern.match(path)
+            if found is None:
+                continue
+            if route.method == method:
+                return route, {key: unquote(value) for key, value in found.groupdict().items()}
+            allowed = True
+        raise ApiError(405 if allowed else 404, "Method not allowed" if allowed else "Not found")
+
+    async def _respond(self, method: str, target: str, headers: dict[str, str], body: bytes) -> tuple[int, object]:
+        started = time.perf_counter()
+        url = urlsplit(target)
+        try:
+            if self.token and not hmac.compare_digest(headers.get("authorization", ""), f"Bearer {self.token}"):
+                raise ApiError(401, "Unauthorized")
+            route, params = self._match(method, url.path)
+            try:
+                payload = json.loads(body) if body else {}
+            except ValueError:
+                raise ApiError(400, "Body must be JSON") from None
+            if not isinstance(payload, dict):
+                raise ApiError(400, "Body must be a JSON object")
+            result = await self._call(route, Request(method, url.path, params, dict(parse_qsl(url.query)), payload))
+            status = route.status
+        except ApiError as e:
+            status, result = e.status, {"error": e.message}
+        except SlotTaken as e:
+            status, result = 409, {"error": e.message, "title": e.title}
+        except ServiceError as e:
+            status, result = 422, {"error": e.message, "title": e.title}
+        except sqlite3.Error as e:
+            logger.error(f"{method} {url.path} failed: {e}")
+            status, result = 500, {"error": "Database error"}
+        except Exception as e:
+            logger.exception(f"{method} {url.path} failed: {e}")
+            status, result = 500, {"error": "Internal error"}
+        logger.debug(f"{method} {url.path} {status} in {(time.perf_counter() - started) * 1000:.1f} ms")
+        return status, result
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # ---One coroutine per connection, serving its requests in turn (keep-alive, no pipelining)
+        self._clients.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    writer.write(_response(400, {"error": "Bad request line"}, False))
+                    return
+
+                method, target, version = parts
+                headers: dict[str, str] = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    if len(headers) >= MAX_HEADERS:
+                        writer.write(_response(431, {"error": "Too many headers"}, False))
+                        return
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length") or 0)
+                if not 0 <= length <= MAX_BODY_BYTES:
+                    writer.write(_response(413, {"error": "Body too large"}, False))
+                    return
+                body = await reader.readexactly(length) if length else b""
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+                status, payload = await self._respond(method.upper(), target, headers, body)
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+            return
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, read_threads: int = DEFAULT_READ_THREADS, token: str | None = None) -> None:
+    # ---Runs until Ctrl+C or SIGTERM
+    async def run() -> None:
+        server = ApiServer(host, port, read_threads, token)
+        await server.start()
+        task = asyncio.current_task()
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, task.cancel)
+        except NotImplementedError:
+            pass  # ---Windows: Ctrl+C only
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
@@ -0,0 +1,146 @@
+# ui/app.py
+
+# ---The desktop app: schema check, first-run setup, login, then the main window. Started by
+# ---main.py when it is run without a command.
+
+
+import sys
+from pathlib import Path
+
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QApplication, QDialog, QMessageBox
+
+from ui.config.logger_config import log_operation, logger, set_log_context
+from ui.config.paths import CORE_DB, STYLES
+from ui.database.connection import close_connections
+from ui.database.init_db_tables import init_databases
+from ui.database.reference_cache import reference_cache
+from ui.database.repositories import user_repo
+from ui.setup_page import AdminSetupDialog, LoginDialog, SetupPage
+from ui.util.async_query import query_pool
+from ui.util.gui_dispatch import install_gui_dispatcher
+from ui.util.resize_window import size_and_center_window
+from ui.util.startup_profiler import startup
+
+startup.mark("imports")
+
+
+class RootApp(QApplication):
+    def __init__(self) -> None:
+        super().__init__([])
+        install_gui_dispatcher(self)
+        self.aboutToQuit.connect(query_pool.shutdown)
+        self.aboutToQuit.connect(close_connections)
+
+    def _check_setup(self) -> str:
+        if not CORE_DB.exists():
+            return "company"
+        try:
+            if reference_cache.company() is None:
+                return "company"
+            if not user_repo.has_admin():
+                return "admin"
+            return "login"
+        except Exception as e:
+            logger.error(f"Error checking setup: {e}")
+            return "company"
+
+    def _run_setup(self) -> bool:
+        setup_dialog = SetupPage()
+        return setup_dialog.exec() == QDialog.DialogCode.Accepted
+
+    def _run_admin_setup(self) -> bool:
+        admin_dialog = AdminSetupDialog()
+        return admin_dialog.exec() == QDialog.DialogCode.Accepted
+
+    def _run_login(self) -> tuple[bool, str, str]:
+        login_dialog = LoginDialog()
+        if login_dialog.exec() == QDialog.DialogCode.Accepted:
+            return True, *login_dialog.get_credentials()
+        return False, "", ""
+
+    def _load_stylesheet(self, path: Path) -> str:
+        try:
+            return path.read_text(encoding="utf-8")
+        except Exception as err:
+            logger.error(f"Failed to load stylesheet from {path}: {err}")
+            return ""
+
+    def boot_app(self) -> None:
+        init_databases()
+        startup.mark("schema_check")
+        self.setStyleSheet(self._load_stylesheet(STYLES))
+        startup.mark("stylesheet")
+
+        setup_status = self._check_setup()
+        startup.mark("setup_check")
+        # ---Fires once the first dialog (setup or login) is on screen and its event loop runs
+        QTimer.singleShot(0, lambda: startup.finish("first_dialog"))
+
+        if setup_status == "company":
+            QMessageBox.information(None, "Setup", "Starting Software Configuration", QMessageBox.StandardButton.Ok)  # type: ignore
+            if not self._run_setup():
+                sys.exit(0)
+            setup_status = self._check_setup()
+
+        if setup_status == "admin":
+            if not self._run_admin_setup():
+                sys.exit(0)
+            setup_status = self._check_setup()
+
+        if setup_status == "login":
+            while True:
+                success, username, password = self._run_login()
+
+                if not success:
+                    logger.info("Login dialog cancelled by user; exiting.")
+                    sys.exit(0)
+
+                # Validate credentials on the query pool so a locked database cannot freeze the dialog
+                try:
+                    authenticated = query_pool.wait(user_repo.authenticate, username, password)
+                except RuntimeError as e:
+                    logger.error(f"Login check failed: {e}")
+                    authenticated = False
+                if authenticated:
+                    set_log_context(user=username)
+                    logger.info("Logged in")
+                    break
+
+                QMessageBox.warning(
+                    None,
+                    "Login Failed",
+                    "Invalid username or password. Please try again.",
+                )
+
+            # ---Diagnostics are offered to admins only
+            try:
+                is_admin = query_pool.wait(user_repo.is_admin, username, password)
+            except RuntimeError as e:
+                logger.error(f"Privilege check failed: {e}")
+                is_admin = False
+
+            # ---Read once by the setup check above and cached since
+            company_name = reference_cache.company_name() or "Smart Healthcare Systems"
+            self.processEvents()
+
+        # ---Screens are imported as they are opened, and the main window only after login
+        with log_operation("open_main_window"):
+            from ui.main_window import MainWindow  # noqa: PLC0415
+            from ui.util.backgrounds import background_cache  # noqa: PLC0415
+
+            self.aboutToQuit.connect(background_cache.shutdown)
+
+            self.main_window = MainWindow(self, company_name, username, is_admin)
+            size_and_center_window(self.main_window, 0.85, 0.75)
+            self.main_window.show()
+
+        self.processEvents()
+        sys.exit(self.exec())
+
+
+def run() -> None:
+    app = RootApp()
+    app.setStyle("Fusion")
+    startup.mark("qapplication")
+    app.boot_app()
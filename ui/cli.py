@@ -0,0 +1,120 @@
+# ui/cli.py
+
+# ---Headless commands: python main.py <command> [options]. Nothing here imports PySide6, so the
+# ---commands run on a server, in cron or in CI without a display. seed, import and export hand
+# ---their arguments to the matching ui.database module; run "<command> --help" for its options.
+
+
+import argparse
+import importlib
+import os
+import sqlite3
+from collections.abc import Callable
+from datetime import date
+from pathlib import Path
+
+from ui.config.logger_config import flush_logs, logger
+from ui.database.connection import DB_MAP, get_connection, use_database_dir
+from ui.database.init_db_tables import init_databases
+from ui.database.migrations import latest_version, schema_version
+
+
+def _init(argv: list[str]) -> int:
+    argparse.ArgumentParser(prog="main.py init", description="Create the databases, or upgrade them to the latest schema.").parse_args(argv)
+    try:
+        init_databases()
+        for db_key, path in DB_MAP.items():
+            print(f"{db_key:<10}v{schema_version(get_connection(db_key))}/{latest_version(db_key)}  {path}")
+    except sqlite3.Error as e:
+        logger.error(f"Database set-up failed: {e}")
+        return 1
+    return 0
+
+
+def _bill_run(argv: list[str]) -> int:
+    from ui.services.billing import bill_run  # noqa: PLC0415
+
+    parser = argparse.ArgumentParser(prog="main.py bill-run", description="Send a reminder for every unpaid bill past its due date.")
+    parser.add_argument("--as-of", type=date.fromisoformat, default=None, help="treat this day as today, yyyy-mm-dd")
+    parser.add_argument("--dry-run", action="store_true", help="count the overdue bills without sending reminders")
+    args = parser.parse_args(argv)
+
+    init_databases()
+    try:
+        result = bill_run(args.as_of, args.dry_run)
+    except sqlite3.Error:
+        return 1
+    print(f"{result.overdue} overdue bills, {result.notified} reminders sent, {result.outstanding:.2f} outstanding")
+    return 0
+
+
+def _maintenance(argv: list[str]) -> int:
+    from ui.services.maintenance import run_maintenance  # noqa: PLC0415
+
+    parser = argparse.ArgumentParser(prog="main.py maintenance", description="Check, analyze and vacuum every database, then rebuild the search indexes.")
+    parser.add_argument("--no-vacuum", action="store_true", help="only check, analyze and checkpoint")
+    args = parser.parse_args(argv)
+
+    init_databases()
+    try:
+        results = run_maintenance(vacuum=not args.no_vacuum)
+    except sqlite3.Error:
+        return 1
+    for r in results:
+        print(f"{r.db_key:<10}{r.integrity:<8}{r.bytes_before:>14,} -> {r.bytes_after:>14,} bytes{r.duration_ms:>10.0f} ms")
+    return 0 if all(r.integrity == "ok" for r in results) else 1
+
+
+def _serve(argv: list[str]) -> int:
+    from ui.api.server import DEFAULT_HOST, DEFAULT_PORT, DEFAULT_READ_THREADS, serve  # noqa: PLC0415
+
+    parser = argparse.ArgumentParser(prog="main.py serve", description="Serve patients, providers, schedules, visits and bills as HTTP/JSON.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="address to listen on; 0.0.0.0 for every interface")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--read-threads", type=int, default=DEFAULT_READ_THREADS, help="concurrent read queries")
+    parser.add_argument("--token", default=os.environ.get("HEALTHCARE_API_TOKEN"), help="require this bearer token (default: $HEALTHCARE_API_TOKEN)")
+    args = parser.parse_args(argv)
+
+    init_databases()
+    if not args.token and args.host not in ("127.0.0.1", "localhost", "::1"):
+        logger.warning(f"Serving patient data on {args.host} without a token")
+    serve(args.host, args.port, args.read_threads, args.token)
+    return 0
+
+
+def _module_main(module: str) -> Callable[[list[str]], int]:
+    def run(argv: list[str]) -> int:
+        return importlib.import_module(module).main(argv)
+
+    return run
+
+
+COMMANDS: dict[str, tuple[Callable[[list[str]], int], str]] = {
+    "init": (_init, "create or upgrade the databases"),
+    "seed": (_module_main("ui.database.seed"), "fill the databases with synthetic data"),
+    "import": (_module_main("ui.database.patient_import"), "bulk import patients from CSV or JSONL"),
+    "export": (_module_main("ui.database.visit_export"), "export visit history to CSV"),
+    "bill-run": (_bill_run, "send reminders for overdue bills"),
+    "maintenance": (_maintenance, "integrity check, ANALYZE, VACUUM and index rebuilds"),
+    "serve": (_serve, "HTTP/JSON API for kiosks and other terminals"),
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Run without a command to open the app.",
+        epilog="commands:\n" + "\n".join(f"  {name:<14}{summary}" for name, (_, summary) in COMMANDS.items()),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--db-dir", type=Path, default=None, help="use the databases in this directory instead of the app's")
+    parser.add_argument("command", choices=COMMANDS, metavar="command")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="options for the command")
+    args = parser.parse_args(argv)
+
+    if args.db_dir:
+        use_database_dir(args.db_dir)
+    try:
+        return COMMANDS[args.command][0](args.args)
+    finally:
+        flush_logs()
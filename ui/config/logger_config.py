@@ -1,18 +1,191 @@
 # logger_config.py
 
+# ---Sinks are loguru's own, with enqueue=True: a log call renders the record and hands it to
+# ---loguru's writer thread, so file I/O, rotation, compression and retention never run on the GUI
+# ---thread. Where logs go follows the original set-up: files in frozen builds (or with
+# ---HEALTHCARE_LOG_FILE=1), the console when running from source.
+# ---The main log is JSON lines carrying the current user and window, plus operation and duration
+# ---for timed work (log_operation). Levels can be set per module, in LOG_LEVELS or through the
+# ---HEALTHCARE_LOG_LEVELS environment variable, e.g. "INFO,ui.database=DEBUG,ui.util=WARNING".
 
+
+import json
+import os
 import sys
+import time
+import traceback
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, TextIO
 
 from loguru import logger
 
-from ui.config.paths import LOG_FILE
+from ui.config.paths import LOG_FILE, SLOW_QUERY_LOG
+
+# ---Module prefix -> minimum level; "" is every other module
+LOG_LEVELS: dict[str, str] = {
+    "": "INFO",
+}
+
+LOG_MAX_BYTES = 10 * 1024 * 1024  # ---the main log also rolls over at midnight, whichever comes first
+LOG_RETENTION = timedelta(days=14)
+SLOW_QUERY_LOG_MAX_BYTES = 1024 * 1024
+SLOW_QUERY_LOG_BACKUPS = 5
+
+# ---Process-wide context added to every record that does not carry its own
+_context: dict[str, Any] = {"user": None, "window": None}
+_logging_to_files = False
+
+
+def _truthy(name: str) -> bool:
+    return os.environ.get(name, "").lower() in ("1", "true", "on", "yes")
+
+
+# ******************************************************************************************
+#  / Formatting
+# ******************************************************************************************
+
+
+def _parse_levels(spec: str) -> dict[str, str]:
+    # ---"LEVEL" sets the default, "module=LEVEL" a module and everything under it
+    levels = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        module, _, level = part.rpartition("=")
+        levels[module.strip()] = level.strip().upper()
+    return levels
+
+
+def _with_context(record: dict) -> None:
+    # ---Patcher: fill in the process-wide context without overriding bound/contextualized values
+    extra = record["extra"]
+    for key, value in _context.items():
+        if value is not None:
+            extra.setdefault(key, value)
+
+
+def _exception_text(record: dict) -> str:
+    return "".join(traceback.format_exception(*record["exception"])) if record["exception"] is not None else ""
+
+
+def _json_format(record: dict) -> str:
+    # ---loguru formats take a template, so the finished line is passed through extra
+    entry = {
+        "time": record["time"].isoformat(timespec="milliseconds"),
+        "level": record["level"].name,
+        "module": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        "thread": record["thread"].name,
+        "message": record["message"],
+    }
+    entry.update((key, value) for key, value in record["extra"].items() if not key.startswith("_"))
+    if record["exception"] is not None:
+        entry["exception"] = _exception_text(record)
+    record["extra"]["_json"] = json.dumps(entry, default=str)
+    return "{extra[_json]}\n"
+
+
+def _console_format(record: dict) -> str:
+    extra = record["extra"]
+    suffix = f" ({extra['duration_ms']:.1f} ms)" if "duration_ms" in extra else ""
+    context = " ".join(f"{key}={extra[key]}" for key in ("user", "window", "operation") if extra.get(key) is not None)
+    if context:
+        suffix += f" [{context}]"
+    extra["_suffix"] = suffix
+    return "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}{extra[_suffix]}\n{exception}"
+
+
+class _SizeOrMidnight:
+    # ---loguru rotation condition for the main log: past max_bytes, or the first message after
+    # ---midnight (a file left by an earlier run rolls at the first midnight after its last write)
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._rollover: datetime | None = None
+
+    def __call__(self, message: Any, file: TextIO) -> bool:  # noqa: ANN401
+        when = message.record["time"]
+        if self._rollover is None:
+            size = file.tell()
+            written = datetime.fromtimestamp(os.fstat(file.fileno()).st_mtime, tz=when.tzinfo) if size else when
+            self._rollover = _next_midnight(written)
+        if file.tell() + len(message) > self.max_bytes or when >= self._rollover:
+            self._rollover = _next_midnight(when)
+            return file.tell() > 0
+        return False
+
+
+def _next_midnight(moment: datetime) -> datetime:
+    return (moment + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+# ******************************************************************************************
+#  / Setup
+# ******************************************************************************************
+
+
+def configure_logging(levels: dict[str, str] | None = None, console: bool | None = None, files: bool | None = None) -> None:
+    # ---(Re)installs every sink. Runs once at import; call again to change levels at runtime.
+    global _logging_to_files  # noqa: PLW0603
+    levels = {**LOG_LEVELS, **(levels or {}), **_parse_levels(os.environ.get("HEALTHCARE_LOG_LEVELS", ""))}
+    frozen = getattr(sys, "frozen", False)
+    if console is None:
+        console = not frozen
+    if files is None:
+        files = frozen or _truthy("HEALTHCARE_LOG_FILE")
+
+    logger.remove()
+    logger.configure(patcher=_with_context)
+    common = {"filter": levels, "level": 0, "enqueue": True, "backtrace": False, "diagnose": False}
+
+    if files:
+        logger.add(LOG_FILE, format=_json_format, rotation=_SizeOrMidnight(LOG_MAX_BYTES), retention=LOG_RETENTION, compression="gz", encoding="utf-8", **common)
+        # ---Slow SQL statements (ui/database/query_stats.py) also get a file of their own
+        logger.add(
+            SLOW_QUERY_LOG,
+            format="{time:YYYY-MM-DD HH:mm:ss} | {message}",
+            filter=lambda record: bool(record["extra"].get("slow_query")),
+            level=0,
+            rotation=SLOW_QUERY_LOG_MAX_BYTES,
+            retention=SLOW_QUERY_LOG_BACKUPS,
+            encoding="utf-8",
+            enqueue=True,
+            backtrace=False,
+            diagnose=False,
+        )
+    if console and sys.stdout is not None:
+        logger.add(sys.stdout, format=_console_format, colorize=False, **common)
+    _logging_to_files = files
+
+
+def logging_to_files() -> bool:
+    return _logging_to_files
+
+
+def flush_logs() -> None:
+    # ---For CLIs and tests that read the log files back: waits for queued records to be written
+    logger.complete()
+
 
-#logger.remove()
+def set_log_context(**context: Any) -> None:  # noqa: ANN401
+    # ---e.g. set_log_context(user="admin") after login; None clears a key
+    _context.update(context)
 
 
-if getattr(sys, "frozen", False):
-    logger.add(sink=LOG_FILE, format="{time:YYYY-MM-DD HH:mm} | {level}    | {message}", rotation="500KB")
+@contextmanager
+def log_operation(operation: str, level: str = "INFO", **context: Any) -> Iterator[None]:  # noqa: ANN401
+    # ---Logs one record when the block ends, with its duration; records logged inside the block
+    # ---on this thread carry the operation too. Failures are logged as errors and re-raised.
+    start = time.perf_counter()
+    with logger.contextualize(operation=operation, **context):
+        try:
+            yield
+        except Exception as e:
+            logger.opt(depth=2).bind(duration_ms=round((time.perf_counter() - start) * 1000, 3)).error(f"{operation} failed: {e}")
+            raise
+        logger.opt(depth=2).bind(duration_ms=round((time.perf_counter() - start) * 1000, 3)).log(level, f"{operation} finished")
 
 
-else:
-    logger.add(sink=sys.stdout)
+configure_logging()
+slow_query_logger = logger.bind(slow_query=True)
@@ -10,7 +10,8 @@ DATABASE_DIR = UI_DIR / "database"
 
 STYLES = CONFIG_DIR / "styles.css"
 
-LOG_FILE = ROOT_DIR / "logs" / "log.log"
+LOG_FILE = ROOT_DIR / "logs" / "log.jsonl"
+SLOW_QUERY_LOG = ROOT_DIR / "logs" / "slow_queries.log"
 
 ROOT_BACKGROUND = RESOURCE_DIR / "gooddr.png"
 
@@ -21,5 +22,5 @@ BILLING_DB = DB_ROOT / "billing.db"
 
 LOG_DIR = ROOT_DIR / "logs"
 
-for path in [RESOURCE_DIR, CONFIG_DIR, UTIL_DIR, DATABASE_DIR, DB_ROOT, LOG_DIR]:
-    path.mkdir(parents=True, exist_ok=True)
+# ---Nothing is created at import: the database folder is made by the first migration and the log
+# ---folder by the log writer, so a normal start does no filesystem writes here.
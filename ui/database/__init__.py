@@ -1,4 +1,25 @@
-from .write_to_db import write_to_database
+# ---Names are imported on first access, so importing one submodule (e.g. ui.database.connection)
+# ---does not load the write path and the repositories behind it.
 
-__all__ = ["write_to_database"]
+import importlib
 
+_MODULES = {
+    "RecordedVisit": ".record_visit",
+    "close_connections": ".connection",
+    "event_bus": ".events",
+    "get_connection": ".connection",
+    "record_visit": ".record_visit",
+    "transaction": ".connection",
+    "write_many": ".write_to_db",
+    "write_to_database": ".write_to_db",
+}
+
+
+def __getattr__(name: str) -> object:
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
+
+
+__all__ = ["RecordedVisit", "close_connections", "event_bus", "get_connection", "record_visit", "transaction", "write_many", "write_to_database"]
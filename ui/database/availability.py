@@ -0,0 +1,127 @@
+# ui/database/availability.py
+
+# ---"Find first available" search over provider schedules.
+# ---Bookings are read in date-range chunks into a per-(provider, day) occupancy bitmap, one bit per
+# ---hour slot, and free slots are found with bit operations instead of a query per day. Chunks are
+# ---loaded lazily, so a search that is satisfied next week never reads the rest of the year.
+
+
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
+from typing import NamedTuple
+
+from ui.database.connection import get_connection
+from ui.database.reference_cache import reference_cache
+from ui.database.repositories import Provider
+
+DEFAULT_HOURS = range(9, 17)
+CHUNK_DAYS = 31
+
+
+class OpenSlot(NamedTuple):
+    slot_date: date
+    hour: int
+    provider_id: str
+    provider_name: str
+
+
+class Occupancy(NamedTuple):
+    booked: int  # ---bit h set when hour h is booked
+    count: int
+
+
+def _mask(hours: Iterable[int]) -> int:
+    mask = 0
+    for hour in hours:
+        mask |= 1 << hour
+    return mask
+
+
+def load_occupancy(start: date, end: date, provider_ids: Iterable[str] | None = None) -> dict[tuple[str, str], Occupancy]:
+    # ---One range query; keys are (ProviderId, yyyy-mm-dd). A provider filter lets SQLite walk
+    # ---idx_schedule_day per provider instead of every provider's bookings on idx_schedule_date.
+    params: list[str] = [start.isoformat(), end.isoformat()]
+    sql = "SELECT ProviderId, ScheduleDate, ScheduleSlot FROM Schedule WHERE ScheduleDate BETWEEN ? AND ?"
+    if provider_ids is not None:
+        ids = list(provider_ids)
+        sql += f" AND ProviderId IN ({', '.join('?' * len(ids))})"
+        params.extend(ids)
+
+    booked: dict[tuple[str, str], int] = {}
+    counts: dict[tuple[str, str], int] = {}
+    for provider_id, day, slot in get_connection("patients").execute(sql, params):
+        key = (provider_id, day)
+        booked[key] = booked.get(key, 0) | (1 << int(slot))
+        counts[key] = counts.get(key, 0) + 1
+    return {key: Occupancy(bits, counts[key]) for key, bits in booked.items()}
+
+
+def find_available_slots(
+    start: date,
+    end: date,
+    provider_ids: Iterable[str] | None = None,
+    hours: Iterable[int] = DEFAULT_HOURS,
+    weekdays: Iterable[int] | None = None,
+    limit: int = 10,
+    providers: list[Provider] | None = None,
+    now: datetime | None = None,
+) -> list[OpenSlot]:
+    # ---Earliest free slots first (by date, then hour, then provider order).
+    # ---provider_ids=None means any provider; weekdays use date.isoweekday() (1 = Monday).
+    # ---Provider-days that already hold MaxVisitsPerDay bookings are skipped, and so are past
+    # ---days and today's hours up to and including the current one.
+    if now is None:
+        now = datetime.now()  # noqa: DTZ005
+    start = max(start, now.date())
+    if providers is None:
+        providers = reference_cache.providers()
+    if provider_ids is not None:
+        wanted = set(provider_ids)
+        providers = [p for p in providers if p.provider_id in wanted]
+    if not providers or limit <= 0 or end < start:
+        return []
+
+    window = _mask(hours)
+    allowed_days = set(weekdays) if weekdays is not None else None
+    ids = [p.provider_id for p in providers] if provider_ids is not None else None
+    found: list[OpenSlot] = []
+
+    chunk_start = start
+    while chunk_start <= end and len(found) < limit:
+        chunk_end = min(end, chunk_start + timedelta(days=CHUNK_DAYS - 1))
+        occupancy = load_occupancy(chunk_start, chunk_end, ids)
+
+        day = chunk_start
+        while day <= chunk_end:
+            if allowed_days is None or day.isoweekday() in allowed_days:
+                day_str = day.isoformat()
+                day_window = window & ~((2 << now.hour) - 1) if day == now.date() else window
+                free_by_provider: list[tuple[int, Provider]] = []
+                for provider in providers:
+                    used = occupancy.get((provider.provider_id, day_str))
+                    if used is None:
+                        if day_window:
+                            free_by_provider.append((day_window, provider))
+                        continue
+                    if provider.max_visits_per_day and used.count >= provider.max_visits_per_day:
+                        continue
+                    free = day_window & ~used.booked
+                    if free:
+                        free_by_provider.append((free, provider))
+
+                combined = 0
+                for free, _provider in free_by_provider:
+                    combined |= free
+                while combined:
+                    low = combined & -combined
+                    hour = low.bit_length() - 1
+                    combined ^= low
+                    for free, provider in free_by_provider:
+                        if free & low:
+                            found.append(OpenSlot(day, hour, provider.provider_id, provider.name))
+                            if len(found) >= limit:
+                                return found
+            day += timedelta(days=1)
+        chunk_start = chunk_end + timedelta(days=1)
+
+    return found
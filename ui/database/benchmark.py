@@ -0,0 +1,298 @@
+# ui/database/benchmark.py
+
+# ---Headless benchmark of each screen's data path: the same repository calls the windows make,
+# ---timed over many iterations with randomised inputs drawn from the data present. Reports
+# ---latency percentiles and throughput, and compares against a stored baseline so a slower p95
+# ---fails the run. Seed a scratch copy first (ui.database.seed --db-dir) and point --db-dir at it.
+
+
+import argparse
+import json
+import math
+import random
+import sqlite3
+import tempfile
+import time
+import uuid
+from collections.abc import Callable
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import NamedTuple
+
+from ui.config.logger_config import logger
+from ui.database.availability import find_available_slots
+from ui.database.connection import get_connection, use_database_dir
+from ui.database.init_db_tables import init_databases
+from ui.database.notes_search import search_notes
+from ui.database.record_visit import record_visit
+from ui.database.repositories import Booking, patient_repo, schedule_repo, visit_repo
+from ui.database.visit_export import export_visits
+
+DEFAULT_ITERATIONS = 200
+DEFAULT_WARMUP = 10
+DEFAULT_TOLERANCE = 0.25  # ---p95 may grow this much over the baseline before it counts as a regression
+NOISE_FLOOR_MS = 0.5  # ---...and by at least this much, so sub-millisecond jitter is ignored
+SAMPLE_SIZE = 500
+REPORT_PAGE_SIZE = 200  # ---VisitTableModel.PAGE_SIZE
+NOTE_TERMS = ("cough", "pain", "amoxicillin", '"blood pressure"', "rash OR fever", "metf*", "physical", "x-ray")
+
+
+class Sample(NamedTuple):
+    # ---Inputs drawn once per run from the rows present
+    patient_ids: list[str]  # ---patients with visits
+    provider_ids: list[str]
+    visit_ids: list[int]
+    name_fragments: list[str]
+    free_from: date  # ---first day with no bookings at all, for the booking scenario
+
+
+class Scenario(NamedTuple):
+    name: str
+    run: Callable[[random.Random, Sample, int], object]  # ---(rng, sample, call number from 0, warm-up included)
+    writes: bool = False
+
+
+class ScenarioResult(NamedTuple):
+    name: str
+    iterations: int
+    p50_ms: float
+    p90_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    ops_per_sec: float
+
+
+class Regression(NamedTuple):
+    name: str
+    baseline_ms: float
+    current_ms: float
+
+
+# ******************************************************************************************
+#  / Scenarios
+# ******************************************************************************************
+
+
+def _today() -> date:
+    return date.today()
+
+
+def _day_view_cold(rng: random.Random, s: Sample, _i: int) -> object:
+    provider_id, day = rng.choice(s.provider_ids), (_today() + timedelta(days=rng.randint(0, 60))).isoformat()
+    schedule_repo.invalidate_day(provider_id, day)
+    return schedule_repo.day_view(provider_id, day)
+
+
+def _range(days: int) -> Callable[[random.Random, Sample, int], object]:
+    def run(rng: random.Random, _s: Sample, _i: int) -> object:
+        start = _today() + timedelta(days=rng.randint(-30, 30))
+        return schedule_repo.range_view(start.isoformat(), (start + timedelta(days=days - 1)).isoformat())
+
+    return run
+
+
+def _export_patient(rng: random.Random, s: Sample, _i: int) -> object:
+    # ---Each export logs its path; muted so the log write is not part of the timing
+    logger.disable("ui.database.visit_export")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            return export_visits(Path(tmp) / "visits.csv", rng.choice(s.patient_ids))
+    finally:
+        logger.enable("ui.database.visit_export")
+
+
+def _record_visit(rng: random.Random, s: Sample, _i: int) -> object:
+    return record_visit(rng.choice(s.patient_ids), rng.choice(s.provider_ids), _today().isoformat(), "Benchmark visit; vitals normal.", "")
+
+
+def _book(rng: random.Random, s: Sample, i: int) -> object:
+    # ---Empty days past the last booking, one cell per call, so the unique (provider, day, slot)
+    # ---key never clashes
+    day = (s.free_from + timedelta(days=i // 8)).isoformat()
+    booking = Booking(str(uuid.uuid4()), rng.choice(s.provider_ids), rng.choice(s.patient_ids), day, 9 + i % 8)
+    return schedule_repo.book(booking)
+
+
+SCENARIOS: tuple[Scenario, ...] = (
+    Scenario("reports.first_page", lambda r, s, _i: visit_repo.page_for_patient(r.choice(s.patient_ids), None, "visit_date", False, "", REPORT_PAGE_SIZE)),
+    Scenario("reports.sort_amount_desc", lambda r, s, _i: visit_repo.page_for_patient(r.choice(s.patient_ids), None, "amount", True, "", REPORT_PAGE_SIZE)),
+    Scenario("reports.filter", lambda r, s, _i: visit_repo.page_for_patient(r.choice(s.patient_ids), None, "visit_date", False, "pain", REPORT_PAGE_SIZE)),
+    Scenario("reports.notes", lambda r, s, _i: visit_repo.notes_for(r.choice(s.visit_ids))),
+    Scenario("reports.export_patient", _export_patient),
+    Scenario("schedule.day_view", _day_view_cold),
+    Scenario("schedule.find_slot", lambda r, s, _i: find_available_slots(_today(), _today() + timedelta(days=365), [r.choice(s.provider_ids)], limit=10)),
+    Scenario("schedule_overview.week", _range(7)),
+    Scenario("schedule_overview.month", _range(31)),
+    Scenario("patient_picker.search", lambda r, s, _i: patient_repo.search(r.choice(s.name_fragments))),
+    Scenario("notes_search.search", lambda r, _s, _i: search_notes(r.choice(NOTE_TERMS))),
+    Scenario("visit_details.save", _record_visit, writes=True),
+    Scenario("schedule.book", _book, writes=True),
+)
+
+
+# ******************************************************************************************
+#  / Running
+# ******************************************************************************************
+
+
+def draw_sample(rng: random.Random, size: int = SAMPLE_SIZE) -> Sample:
+    # ---Random rowids rather than ORDER BY random(), so drawing stays cheap at a million rows
+    conn = get_connection("patients")
+
+    def rowids(table: str) -> list[int]:
+        top = conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {table}").fetchone()[0]  # noqa: S608
+        return [rng.randint(1, top) for _ in range(size)] if top else []
+
+    def pick(sql: str, ids: list[int]) -> list:
+        return [row[0] for row in conn.execute(sql.format(marks=", ".join("?" * len(ids))), ids)] if ids else []
+
+    visit_rows = pick("SELECT VisitId FROM VisitDetails WHERE VisitId IN ({marks})", rowids("VisitDetails"))
+    patient_ids = pick("SELECT PatientId FROM VisitDetails WHERE VisitId IN ({marks})", visit_rows)
+    names = pick("SELECT PatientName FROM Patients WHERE rowid IN ({marks})", rowids("Patients"))
+    provider_ids = [row[0] for row in conn.execute("SELECT ProviderId FROM Provider")]
+    last_booked = conn.execute("SELECT MAX(ScheduleDate) FROM Schedule").fetchone()[0]
+    free_from = max(_today(), date.fromisoformat(last_booked) + timedelta(days=1)) if last_booked else _today()
+
+    # ---What staff type into the picker: a surname start, a whole name, a first name
+    fragments = []
+    for name in names:
+        first, _, last = (name or "").partition(" ")
+        fragments.append(rng.choice([last[:4], name, first]) or name)
+    return Sample(patient_ids, provider_ids, visit_rows, [f for f in fragments if f], free_from)
+
+
+def percentile(ordered: list[float], pct: float) -> float:
+    # ---Nearest-rank on an ascending list
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))]
+
+
+def run_scenario(scenario: Scenario, sample: Sample, iterations: int, warmup: int, seed: int = 0) -> ScenarioResult:
+    rng = random.Random(f"{seed}:{scenario.name}")
+    for i in range(warmup):
+        scenario.run(rng, sample, i)
+
+    timings: list[float] = []
+    for i in range(iterations):
+        start = time.perf_counter_ns()
+        scenario.run(rng, sample, warmup + i)
+        timings.append((time.perf_counter_ns() - start) / 1e6)
+
+    timings.sort()
+    total_s = sum(timings) / 1000
+    return ScenarioResult(
+        scenario.name,
+        iterations,
+        round(percentile(timings, 50), 3),
+        round(percentile(timings, 90), 3),
+        round(percentile(timings, 95), 3),
+        round(percentile(timings, 99), 3),
+        round(timings[-1], 3) if timings else 0.0,
+        round(iterations / total_s, 1) if total_s else 0.0,
+    )
+
+
+def run_benchmarks(
+    iterations: int = DEFAULT_ITERATIONS,
+    warmup: int = DEFAULT_WARMUP,
+    only: list[str] | None = None,
+    writes: bool = False,
+    seed: int = 0,
+    progress: Callable[[ScenarioResult], None] | None = None,
+) -> list[ScenarioResult]:
+    sample = draw_sample(random.Random(seed))
+    if not sample.patient_ids or not sample.provider_ids:
+        raise ValueError("No visits or providers to benchmark; seed the databases first (python -m ui.database.seed)")
+
+    results = []
+    for scenario in SCENARIOS:
+        if scenario.writes and not writes:
+            continue
+        if only and not any(pattern in scenario.name for pattern in only):
+            continue
+        result = run_scenario(scenario, sample, iterations, warmup, seed)
+        results.append(result)
+        if progress:
+            progress(result)
+    return results
+
+
+# ******************************************************************************************
+#  / Baselines
+# ******************************************************************************************
+
+
+def data_size() -> dict[str, int]:
+    conn = get_connection("patients")
+    return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in ("Patients", "Provider", "VisitDetails", "Schedule")}  # noqa: S608
+
+
+def save_baseline(path: Path, results: list[ScenarioResult]) -> None:
+    payload = {
+        "created": datetime.now().isoformat(timespec="seconds"),  # noqa: DTZ005
+        "data": data_size(),
+        "results": {r.name: r._asdict() for r in results},
+    }
+    Path(path).write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+def compare(results: list[ScenarioResult], baseline_path: Path, tolerance: float = DEFAULT_TOLERANCE) -> list[Regression]:
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    if baseline.get("data") != data_size():
+        logger.warning(f"Baseline {baseline_path} was recorded on different data sizes: {baseline.get('data')}")
+
+    regressions = []
+    for result in results:
+        previous = baseline.get("results", {}).get(result.name)
+        if previous is None:
+            continue
+        before = previous["p95_ms"]
+        if result.p95_ms > before * (1 + tolerance) and result.p95_ms - before > NOISE_FLOOR_MS:
+            regressions.append(Regression(result.name, before, result.p95_ms))
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark each screen's database calls and compare against a baseline.")
+    parser.add_argument("--db-dir", type=Path, default=None, help="benchmark databases in this directory instead of the app's")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    parser.add_argument("--only", nargs="*", default=None, help="run scenarios whose name contains any of these")
+    parser.add_argument("--writes", action="store_true", help="include scenarios that save visits and bookings")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", type=Path, default=None, help="baseline JSON to compare against; regressions exit 1")
+    parser.add_argument("--save-baseline", type=Path, default=None, help="write these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed p95 growth over the baseline, 0.25 = 25%%")
+    args = parser.parse_args(argv)
+
+    if args.db_dir:
+        use_database_dir(args.db_dir)
+    init_databases()
+    print(", ".join(f"{table}: {count}" for table, count in data_size().items()))
+    print(f"{'scenario':<28}{'p50 ms':>10}{'p90 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'ops/s':>10}")
+
+    def report(r: ScenarioResult) -> None:
+        print(f"{r.name:<28}{r.p50_ms:>10.2f}{r.p90_ms:>10.2f}{r.p95_ms:>10.2f}{r.p99_ms:>10.2f}{r.max_ms:>10.2f}{r.ops_per_sec:>10.0f}")
+
+    try:
+        results = run_benchmarks(args.iterations, args.warmup, args.only, args.writes, args.seed, report)
+    except (ValueError, sqlite3.Error) as e:
+        logger.error(f"Benchmark failed: {e}")
+        return 1
+
+    status = 0
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        for reg in regressions:
+            print(f"REGRESSION {reg.name}: p95 {reg.baseline_ms:.2f} ms -> {reg.current_ms:.2f} ms")
+        status = 1 if regressions else 0
+    if args.save_baseline:
+        save_baseline(args.save_baseline, results)
+        print(f"Baseline written to {args.save_baseline}")
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
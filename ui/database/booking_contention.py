@@ -0,0 +1,180 @@
+# ui/database/booking_contention.py
+
+# ---Simulates N front desks booking at once, each in its own process with its own connection, all
+# ---competing for the same few days of every provider's calendar. Reports throughput and latency,
+# ---then checks the guarantees: no slot booked twice, no provider over MaxVisitsPerDay, and every
+# ---booking a desk was told succeeded is in the table (and nothing else). Bookings go to days past
+# ---the last existing booking, so run it on a scratch copy (--db-dir).
+
+
+import argparse
+import multiprocessing
+import multiprocessing.queues
+import multiprocessing.synchronize
+import random
+import sqlite3
+import time
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+from typing import NamedTuple
+
+from ui.database.benchmark import percentile
+from ui.database.connection import get_connection, retry_busy, use_database_dir
+from ui.database.init_db_tables import init_databases
+from ui.database.repositories import Booking, schedule_repo
+
+DEFAULT_DESKS = 8
+DEFAULT_ATTEMPTS = 200  # ---per desk
+DEFAULT_DAYS = 3
+HOURS = range(9, 17)
+
+
+class DeskResult(NamedTuple):
+    booked: list[str]  # ---ScheduleIds this desk was told it booked
+    taken: int
+    full: int
+    failed: int  # ---still locked after every retry, or another database error
+    latencies_ms: list[float]
+
+
+class ContentionResult(NamedTuple):
+    desks: int
+    attempts: int
+    booked: int
+    taken: int
+    full: int
+    failed: int
+    seconds: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    double_booked: int  # ---slots holding more than one booking
+    over_limit: int  # ---provider-days past MaxVisitsPerDay
+    missing: int  # ---reported booked but not in the table
+    unexpected: int  # ---in the table but no desk reported booking it
+
+
+def _desk(db_dir: str | None, cells: list[tuple[str, str, int]], patient_ids: list[str], attempts: int, seed: int, start: multiprocessing.synchronize.Barrier, results: multiprocessing.queues.Queue) -> None:
+    if db_dir:
+        use_database_dir(Path(db_dir))
+    get_connection("patients")  # ---connect before the start line, not inside the timed loop
+    rng = random.Random(seed)
+    booked: list[str] = []
+    taken = full = failed = 0
+    latencies: list[float] = []
+
+    start.wait()
+    for _ in range(attempts):
+        provider_id, day, slot = rng.choice(cells)
+        booking = Booking(str(uuid.uuid4()), provider_id, rng.choice(patient_ids), day, slot)
+        began = time.perf_counter()
+        try:
+            outcome = retry_busy(lambda b=booking: schedule_repo.book(b), "patients")
+        except sqlite3.Error:
+            failed += 1
+            outcome = None
+        latencies.append((time.perf_counter() - began) * 1000)
+        if outcome == "booked":
+            booked.append(booking.schedule_id)
+        elif outcome == "taken":
+            taken += 1
+        elif outcome == "full":
+            full += 1
+    results.put(DeskResult(booked, taken, full, failed, latencies))
+
+
+def run_contention(desks: int, attempts: int, days: int, seed: int = 0, db_dir: Path | None = None) -> ContentionResult:
+    conn = get_connection("patients")
+    providers = [row[0] for row in conn.execute("SELECT ProviderId FROM Provider ORDER BY ProviderId")]
+    patient_ids = [row[0] for row in conn.execute("SELECT PatientId FROM Patients LIMIT 1000")]
+    if not providers or not patient_ids:
+        raise ValueError("No providers or patients; seed the databases first (python main.py seed)")
+
+    # ---Days no one has booked yet, so every booking in them comes from this run
+    last = conn.execute("SELECT MAX(ScheduleDate) FROM Schedule").fetchone()[0]
+    first_day = max(date.today(), date.fromisoformat(last) + timedelta(days=1)) if last else date.today()
+    day_list = [(first_day + timedelta(days=i)).isoformat() for i in range(days)]
+    cells = [(provider_id, day, hour) for provider_id in providers for day in day_list for hour in HOURS]
+
+    context = multiprocessing.get_context("spawn")
+    start = context.Barrier(desks + 1)
+    results = context.Queue()
+    processes = [
+        context.Process(target=_desk, args=(str(db_dir) if db_dir else None, cells, patient_ids, attempts, seed * 1000 + i, start, results), name=f"desk-{i}")
+        for i in range(desks)
+    ]
+    for process in processes:
+        process.start()
+    start.wait()
+    began = time.perf_counter()
+    desk_results = [results.get() for _ in processes]
+    seconds = time.perf_counter() - began
+    for process in processes:
+        process.join()
+
+    booked = {schedule_id for r in desk_results for schedule_id in r.booked}
+    latencies = sorted(ms for r in desk_results for ms in r.latencies_ms)
+    between = (day_list[0], day_list[-1])
+    double_booked = conn.execute(
+        """SELECT COUNT(*) FROM (
+                SELECT 1 FROM Schedule WHERE ScheduleDate BETWEEN ? AND ?
+                GROUP BY ProviderId, ScheduleDate, ScheduleSlot HAVING COUNT(*) > 1)""",
+        between,
+    ).fetchone()[0]
+    over_limit = conn.execute(
+        """SELECT COUNT(*) FROM (
+                SELECT 1 FROM Schedule s JOIN Provider p ON p.ProviderId = s.ProviderId
+                WHERE s.ScheduleDate BETWEEN ? AND ? AND p.MaxVisitsPerDay > 0
+                GROUP BY s.ProviderId, s.ScheduleDate HAVING COUNT(*) > MAX(p.MaxVisitsPerDay))""",
+        between,
+    ).fetchone()[0]
+    stored = {row[0] for row in conn.execute("SELECT ScheduleId FROM Schedule WHERE ScheduleDate BETWEEN ? AND ?", between)}
+
+    return ContentionResult(
+        desks,
+        desks * attempts,
+        len(booked),
+        sum(r.taken for r in desk_results),
+        sum(r.full for r in desk_results),
+        sum(r.failed for r in desk_results),
+        round(seconds, 3),
+        round(percentile(latencies, 50), 3),
+        round(percentile(latencies, 95), 3),
+        round(percentile(latencies, 99), 3),
+        double_booked,
+        over_limit,
+        len(booked - stored),
+        len(stored - booked),
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Book the same slots from many processes at once and check nothing is double booked.")
+    parser.add_argument("--db-dir", type=Path, default=None, help="use the databases in this directory instead of the app's")
+    parser.add_argument("--desks", type=int, default=DEFAULT_DESKS, help="concurrent booking processes")
+    parser.add_argument("--attempts", type=int, default=DEFAULT_ATTEMPTS, help="bookings each desk tries")
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS, help="days of every provider's calendar the desks compete for")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.db_dir:
+        use_database_dir(args.db_dir)
+    init_databases()
+    try:
+        r = run_contention(args.desks, args.attempts, args.days, args.seed, args.db_dir)
+    except (ValueError, sqlite3.Error) as e:
+        print(f"Contention test failed: {e}")
+        return 1
+
+    print(f"{r.desks} desks, {r.attempts} attempts in {r.seconds:.2f} s: {r.attempts / r.seconds:.0f} attempts/s, {r.booked / r.seconds:.0f} bookings/s")
+    print(f"booked {r.booked}  slot taken {r.taken}  provider full {r.full}  failed {r.failed}")
+    print(f"latency p50 {r.p50_ms:.2f} ms  p95 {r.p95_ms:.2f} ms  p99 {r.p99_ms:.2f} ms")
+    print(f"double booked {r.double_booked}  over daily limit {r.over_limit}  missing {r.missing}  unexpected {r.unexpected}")
+    violations = r.double_booked + r.over_limit + r.missing + r.unexpected
+    print("OK: no double bookings" if not violations else "FAILED: booking guarantees violated")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,188 @@
+# ui/database/connection.py
+
+# ---Long-lived, per-thread SQLite connections with tuned PRAGMAs.
+# ---Every query in the app goes through get_connection()/transaction() instead of opening
+# ---its own sqlite3.connect(), so connection setup is paid once per thread rather than per click.
+
+
+import random
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from ui.config.paths import BILLING_DB, CORE_DB, PATIENT_DB
+from ui.database.query_stats import ProfiledConnection
+
+DB_MAP = {
+    "core": CORE_DB,
+    "patients": PATIENT_DB,
+    "billing": BILLING_DB,
+}
+
+# ---Databases attached to a connection under their key, so joins and writes can span files.
+ATTACHMENTS: dict[str, tuple[str, ...]] = {
+    "patients": ("billing",),
+}
+
+BUSY_TIMEOUT_MS = 5000
+
+# ---journal_mode is set by enable_wal()
+PRAGMAS = (
+    f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA temp_store = MEMORY",
+)
+
+# ---A write that still finds the database locked once busy_timeout has run out is retried after
+# ---a randomised, doubling pause, so desks that collided do not all come back at the same moment
+BUSY_RETRIES = 4
+BUSY_BACKOFF_S = 0.05
+
+_local = threading.local()
+
+# ---id(connection) -> callbacks waiting for its outermost transaction() to commit
+_after_commit: dict[int, list[Callable[[], None]]] = {}
+
+
+def enable_wal(conn: sqlite3.Connection, schema: str = "main") -> None:
+    # ---Switching a new file to WAL needs it to itself and fails at once rather than waiting on
+    # ---busy_timeout, so a desk that finds another one migrating it retries for as long instead
+    deadline = time.monotonic() + BUSY_TIMEOUT_MS / 1000
+    while True:
+        try:
+            conn.execute(f"PRAGMA {schema}.journal_mode = WAL")
+            return
+        except sqlite3.OperationalError as e:
+            if not is_busy(e) or time.monotonic() > deadline:
+                raise
+        time.sleep(BUSY_BACKOFF_S * random.uniform(0.5, 1.5))  # noqa: S311
+
+
+def _apply_pragmas(conn: sqlite3.Connection, schema: str = "main") -> None:
+    enable_wal(conn, schema)
+    for pragma in PRAGMAS:
+        name = pragma.removeprefix("PRAGMA ")
+        # ---busy_timeout and temp_store are per connection, the rest per schema
+        conn.execute(pragma if name.startswith(("busy_timeout", "temp_store")) else f"PRAGMA {schema}.{name}")
+
+
+def open_connection(db_key: str) -> sqlite3.Connection:
+    # ---Autocommit mode; callers that write use transaction() for explicit BEGIN/COMMIT.
+    # ---Every statement is timed into query_stats.
+    conn = sqlite3.connect(str(DB_MAP[db_key]), isolation_level=None, factory=ProfiledConnection)
+    _apply_pragmas(conn)
+    for attached in ATTACHMENTS.get(db_key, ()):
+        conn.execute("ATTACH DATABASE ? AS " + attached, (str(DB_MAP[attached]),))
+        _apply_pragmas(conn, attached)
+    return conn
+
+
+def get_connection(db_key: str) -> sqlite3.Connection:
+    connections: dict[str, sqlite3.Connection] = _local.__dict__.setdefault("connections", {})
+    conn = connections.get(db_key)
+    if conn is None:
+        if db_key not in DB_MAP:
+            raise KeyError(f"Unknown database: {db_key}")
+        conn = connections[db_key] = open_connection(db_key)
+    return conn
+
+
+@contextmanager
+def transaction(db_key: str) -> Iterator[sqlite3.Connection]:
+    # ---BEGIN IMMEDIATE takes the write lock up front; nested calls become savepoints.
+    conn = get_connection(db_key)
+    if conn.in_transaction:
+        pending = _after_commit.get(id(conn))
+        mark = len(pending) if pending is not None else 0
+        conn.execute("SAVEPOINT nested")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK TO nested")
+            conn.execute("RELEASE nested")
+            if pending is not None:
+                del pending[mark:]
+            raise
+        conn.execute("RELEASE nested")
+        return
+
+    conn.execute("BEGIN IMMEDIATE")
+    _after_commit[id(conn)] = []
+    try:
+        yield conn
+    except BaseException:
+        _after_commit.pop(id(conn), None)
+        conn.execute("ROLLBACK")
+        raise
+    try:
+        conn.execute("COMMIT")
+    finally:
+        callbacks = _after_commit.pop(id(conn), [])
+    for callback in callbacks:
+        callback()
+
+
+def is_busy(error: sqlite3.Error) -> bool:
+    # ---SQLITE_BUSY/SQLITE_LOCKED, including extended codes such as SQLITE_BUSY_SNAPSHOT
+    return isinstance(error, sqlite3.OperationalError) and getattr(error, "sqlite_errorcode", 0) & 0xFF in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+
+
+def retry_busy[T](write: Callable[[], T], db_key: str, retries: int = BUSY_RETRIES, backoff: float = BUSY_BACKOFF_S) -> T:
+    # ---Runs write (a whole transaction() on db_key) again when it fails on a locked database.
+    # ---Inside a caller's transaction it runs once: only the outermost transaction can be retried.
+    attempt = 0
+    while True:
+        try:
+            return write()
+        except sqlite3.OperationalError as e:
+            if attempt == retries or not is_busy(e) or get_connection(db_key).in_transaction:
+                raise
+        time.sleep(backoff * 2**attempt * random.uniform(0.5, 1.5))  # noqa: S311
+        attempt += 1
+
+
+def on_commit(conn: sqlite3.Connection, callback: Callable[[], None]) -> None:
+    # ---Defers callback until the transaction() open on conn commits, and drops it on rollback
+    # ---(including rollback of the savepoint it was registered in). Runs at once outside one.
+    pending = _after_commit.get(id(conn))
+    if pending is None:
+        callback()
+    else:
+        pending.append(callback)
+
+
+@contextmanager
+def bound_connections(connections: dict[str, sqlite3.Connection]) -> Iterator[None]:
+    # ---Serves get_connection() from a caller-owned cache for the duration of the block. Pool
+    # ---threads lose their thread-local state after every task, so the pool keeps this per worker.
+    previous = _local.__dict__.get("connections")
+    _local.connections = connections
+    try:
+        yield
+    finally:
+        if previous is None:
+            _local.__dict__.pop("connections", None)
+        else:
+            _local.connections = previous
+
+
+def use_database_dir(directory: Path) -> None:
+    # ---Points every database at same-named files in another directory, e.g. a scratch copy for
+    # ---seeding and benchmarks. Call before any other thread has opened a connection.
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for db_key, path in DB_MAP.items():
+        DB_MAP[db_key] = directory / path.name
+    close_connections()
+
+
+def close_connections() -> None:
+    # ---Close the calling thread's connections (sqlite3 connections are bound to their thread).
+    connections: dict[str, sqlite3.Connection] = _local.__dict__.pop("connections", {})
+    for conn in connections.values():
+        conn.close()
@@ -0,0 +1,127 @@
+# ui/database/events.py
+
+# ---Typed change events published by the write path once the write has committed.
+# ---Screens and caches subscribe by event type and update what they already hold instead of
+# ---re-reading whole tables. Delivery goes through the installed dispatcher; the GUI installs
+# ---one that runs callbacks on its own thread (ui.util.gui_dispatch), otherwise they run inline.
+
+
+import inspect
+import sqlite3
+import threading
+import weakref
+from collections.abc import Callable
+from typing import NamedTuple
+
+from ui.config.logger_config import logger
+from ui.database.connection import on_commit
+
+
+class PatientCreated(NamedTuple):
+    patient_id: str
+    name: str
+    dob: str
+    phone: str
+
+
+class ProviderCreated(NamedTuple):
+    provider_id: str
+    name: str
+    rate: float | None
+    max_visits_per_day: int | None
+
+
+class BookingMade(NamedTuple):
+    schedule_id: str
+    provider_id: str
+    patient_id: str
+    schedule_date: str
+    slot: int
+    patient_name: str
+
+
+class VisitRecorded(NamedTuple):
+    visit_id: int
+    patient_id: str
+    provider_id: str
+    visit_date: str
+    bill_id: str
+    amount_due: float
+    due_date: str
+
+
+class BillPaid(NamedTuple):
+    bill_id: str
+    visit_id: str
+
+
+class RowsWritten(NamedTuple):
+    # ---Generic writes (write_to_database, bulk imports) that have no specific event
+    db_key: str
+    table: str
+    count: int
+
+
+class _Subscriber(NamedTuple):
+    ref: Callable[[], Callable | None]
+    inline: bool
+
+
+class EventBus:
+    def __init__(self) -> None:
+        self._subscribers: dict[type, list[_Subscriber]] = {}
+        self._lock = threading.Lock()
+        self._dispatch: Callable[[Callable[[], None]], None] | None = None
+
+    def set_dispatcher(self, dispatch: Callable[[Callable[[], None]], None] | None) -> None:
+        self._dispatch = dispatch
+
+    def subscribe[E](self, event_type: type[E], callback: Callable[[E], None], inline: bool = False) -> None:
+        # ---Bound methods are held weakly so a closed window is not kept alive by the bus.
+        # ---inline callbacks run on the publishing thread; for thread-safe caches, not widgets.
+        ref = weakref.WeakMethod(callback) if inspect.ismethod(callback) else (lambda: callback)
+        with self._lock:
+            self._subscribers.setdefault(event_type, []).append(_Subscriber(ref, inline))
+
+    def unsubscribe[E](self, event_type: type[E], callback: Callable[[E], None]) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(event_type, [])
+            subscribers[:] = [s for s in subscribers if s.ref() not in (None, callback)]
+
+    def publish(self, event: tuple) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(type(event), ()))
+        if not subscribers:
+            return
+
+        self._deliver(event, [s for s in subscribers if s.inline])
+        queued = [s for s in subscribers if not s.inline]
+        if not queued:
+            return
+        if self._dispatch is None:
+            self._deliver(event, queued)
+        else:
+            self._dispatch(lambda: self._deliver(event, queued))
+
+    def publish_on_commit(self, conn: sqlite3.Connection, event: tuple) -> None:
+        on_commit(conn, lambda: self.publish(event))
+
+    def _deliver(self, event: tuple, subscribers: list[_Subscriber]) -> None:
+        # ---One failing subscriber must not stop the others, nor fail the write that published
+        dead = False
+        for subscriber in subscribers:
+            callback = subscriber.ref()
+            if callback is None:
+                dead = True
+                continue
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"{type(event).__name__} handler {getattr(callback, '__qualname__', callback)} failed: {e}")
+        if dead:
+            with self._lock:
+                for event_type, subscribed in self._subscribers.items():
+                    self._subscribers[event_type] = [s for s in subscribed if s.ref() is not None]
+
+
+event_bus = EventBus()
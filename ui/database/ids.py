@@ -0,0 +1,50 @@
+# ui/database/ids.py
+
+# ---Collision-free ID allocation backed by an IdSequence table in each database file.
+# ---An ID is reserved with a single-row UPDATE inside the caller's write transaction, so two
+# ---workstations saving at once are serialized by SQLite's write lock and can never get the same ID.
+
+
+import sqlite3
+
+# ---Sequence name -> (schema on the patients connection, table, id column)
+SEQUENCES: dict[str, tuple[str, str, str]] = {
+    "Patients": ("main", "Patients", "PatientId"),
+    "Provider": ("main", "Provider", "ProviderId"),
+    "Billing": ("billing", "Billing", "BillId"),
+}
+
+
+def create_sequence(conn: sqlite3.Connection, name: str, table: str, column: str) -> None:
+    # ---Seed the sequence from the highest numeric ID already in use.
+    conn.execute("CREATE TABLE IF NOT EXISTS IdSequence (Name TEXT PRIMARY KEY, Value INTEGER NOT NULL)")
+    conn.execute(
+        f"INSERT OR IGNORE INTO IdSequence (Name, Value) SELECT ?, COALESCE(MAX(CAST({column} AS INTEGER)), 0) FROM {table}",  # noqa: S608
+        (name,),
+    )
+
+
+def allocate_id(conn: sqlite3.Connection, name: str) -> str:
+    if not conn.in_transaction:
+        raise RuntimeError("IDs must be allocated inside the transaction that inserts the row")
+
+    schema = SEQUENCES[name][0]
+    row = conn.execute(f"UPDATE {schema}.IdSequence SET Value = Value + 1 WHERE Name = ? RETURNING Value", (name,)).fetchone()  # noqa: S608
+    if row is None:
+        raise KeyError(f"Unknown ID sequence: {name}")
+    return str(row[0])
+
+
+def allocate_ids(conn: sqlite3.Connection, name: str, count: int) -> list[str]:
+    # ---Reserve a contiguous block for batched inserts with one UPDATE.
+    if count <= 0:
+        return []
+    if not conn.in_transaction:
+        raise RuntimeError("IDs must be allocated inside the transaction that inserts the row")
+
+    schema = SEQUENCES[name][0]
+    row = conn.execute(f"UPDATE {schema}.IdSequence SET Value = Value + ? WHERE Name = ? RETURNING Value", (count, name)).fetchone()  # noqa: S608
+    if row is None:
+        raise KeyError(f"Unknown ID sequence: {name}")
+    last = row[0]
+    return [str(value) for value in range(last - count + 1, last + 1)]
@@ -0,0 +1,575 @@
+# ui/database/migrations.py
+
+# ---Versioned schema migrations, tracked per database file through PRAGMA user_version.
+# ---Each migration runs in its own transaction and bumps user_version on success, so
+# ---existing database files are upgraded in place and a failed step leaves the file untouched.
+
+
+import sqlite3
+from collections.abc import Callable
+from typing import NamedTuple
+
+from ui.config.logger_config import logger
+from ui.database.connection import BUSY_TIMEOUT_MS, DB_MAP, enable_wal, get_connection
+from ui.database.ids import create_sequence
+from ui.database.query_stats import ProfiledConnection
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    apply: Callable[[sqlite3.Connection], None]
+
+
+# ******************************************************************************************
+#  / Helpers
+# ******************************************************************************************
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> list[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def _rebuild_table(conn: sqlite3.Connection, table: str, create_sql: str) -> None:
+    # ---SQLite cannot add keys to an existing table, so copy it into a new definition.
+    # ---Rows that violate the new keys are moved to <table>Conflicts instead of being dropped.
+    old = f"{table}_old"
+    conn.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    conn.execute(create_sql)
+
+    new_cols = set(_columns(conn, table))
+    shared = ", ".join(col for col in _columns(conn, old) if col in new_cols)
+    conn.execute(f"INSERT OR IGNORE INTO {table} (rowid, {shared}) SELECT rowid, {shared} FROM {old} ORDER BY rowid")  # noqa: S608
+
+    skipped = conn.execute(f"SELECT COUNT(*) FROM {old} WHERE rowid NOT IN (SELECT rowid FROM {table})").fetchone()[0]  # noqa: S608
+    if skipped:
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {table}Conflicts AS SELECT * FROM {old} WHERE 0")  # noqa: S608
+        conn.execute(f"INSERT INTO {table}Conflicts SELECT * FROM {old} WHERE rowid NOT IN (SELECT rowid FROM {table})")  # noqa: S608
+        logger.warning(f"Migration moved {skipped} conflicting row(s) from {table} to {table}Conflicts")
+
+    conn.execute(f"DROP TABLE {old}")
+
+
+def _create_repair_log(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS IdRepairLog (
+            TableName TEXT,
+            OldId TEXT,
+            NewId TEXT,
+            RepairedAt TEXT DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+
+
+def _repair_duplicate_ids(
+    conn: sqlite3.Connection,
+    table: str,
+    column: str,
+    linked: tuple[tuple[str, str], ...] = (),
+) -> None:
+    # ---IDs used to come from COUNT(*) + 1, so deletes and concurrent saves produced repeats.
+    # ---The first row keeps its ID and later rows get fresh ones. For one-to-one links (a bill
+    # ---and its visit), the n-th linked row in insertion order follows the n-th renumbered row.
+    dupes = conn.execute(f"SELECT {column} FROM {table} WHERE {column} IS NOT NULL GROUP BY {column} HAVING COUNT(*) > 1").fetchall()  # noqa: S608
+    if not dupes:
+        return
+
+    _create_repair_log(conn)
+    next_id = conn.execute(f"SELECT COALESCE(MAX(CAST({column} AS INTEGER)), 0) FROM {table}").fetchone()[0]  # noqa: S608
+
+    repaired = 0
+    for (old_id,) in dupes:
+        rowids = [r[0] for r in conn.execute(f"SELECT rowid FROM {table} WHERE {column} = ? ORDER BY rowid", (old_id,))]  # noqa: S608
+        linked_rows = {
+            (l_table, l_column): [r[0] for r in conn.execute(f"SELECT rowid FROM {l_table} WHERE {l_column} = ? ORDER BY rowid", (old_id,))]  # noqa: S608
+            for l_table, l_column in linked
+        }
+
+        for pos, rowid in enumerate(rowids[1:], start=1):
+            next_id += 1
+            new_id = str(next_id)
+            conn.execute(f"UPDATE {table} SET {column} = ? WHERE rowid = ?", (new_id, rowid))  # noqa: S608
+            for (l_table, l_column), l_rowids in linked_rows.items():
+                if pos < len(l_rowids):
+                    conn.execute(f"UPDATE {l_table} SET {l_column} = ? WHERE rowid = ?", (new_id, l_rowids[pos]))  # noqa: S608
+            conn.execute("INSERT INTO IdRepairLog (TableName, OldId, NewId) VALUES (?, ?, ?)", (table, old_id, new_id))
+            repaired += 1
+
+    logger.warning(f"Migration reassigned {repaired} duplicate {column} value(s) in {table}; see IdRepairLog")
+
+
+def _split_shared_bills(conn: sqlite3.Connection) -> None:
+    # ---The old save path skipped the bill when one with the same ID already existed, so a later
+    # ---visit could be left pointing at an earlier visit's bill with no bill of its own. The
+    # ---first visit keeps the bill; each later one gets a new bill at its provider's rate, due
+    # ---30 days (record_visit.PAYMENT_TERMS) after the visit, as the save path would have written it.
+    shared = conn.execute("""
+        SELECT vd.rowid, vd.VisitId, vd.BillId, vd.VisitDate,
+               (SELECT p.ProviderRate FROM patients.Provider p WHERE p.ProviderId = vd.ProviderId LIMIT 1)
+        FROM patients.VisitDetails vd
+        WHERE vd.BillId IN (SELECT BillId FROM patients.VisitDetails WHERE BillId IS NOT NULL GROUP BY BillId HAVING COUNT(*) > 1)
+          AND vd.rowid > (SELECT MIN(rowid) FROM patients.VisitDetails WHERE BillId = vd.BillId)
+        ORDER BY vd.rowid
+    """).fetchall()
+    if not shared:
+        return
+
+    _create_repair_log(conn)
+    next_id = conn.execute("""
+        SELECT MAX(COALESCE((SELECT MAX(CAST(BillId AS INTEGER)) FROM Billing), 0),
+                   COALESCE((SELECT MAX(CAST(BillId AS INTEGER)) FROM patients.VisitDetails), 0))
+    """).fetchone()[0]
+
+    for rowid, visit_id, old_id, visit_date, rate in shared:
+        next_id += 1
+        new_id = str(next_id)
+        conn.execute("UPDATE patients.VisitDetails SET BillId = ? WHERE rowid = ?", (new_id, rowid))
+        conn.execute(
+            "INSERT INTO Billing (BillId, BillAmount, VisitId, DueDate, Paid) VALUES (?, ?, ?, COALESCE(date(?, '+30 days'), date('now', '+30 days')), 0)",
+            (new_id, rate or 0, str(visit_id), visit_date),
+        )
+        conn.execute("INSERT INTO IdRepairLog (TableName, OldId, NewId) VALUES ('VisitDetails', ?, ?)", (old_id, new_id))
+
+    logger.warning(f"Migration gave {len(shared)} visit(s) sharing another visit's bill a bill of their own; see IdRepairLog")
+
+
+# ******************************************************************************************
+#  / core.db
+# ******************************************************************************************
+
+
+def _core_v1_baseline(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS Company (
+            CompanyName TEXT,
+            CompanyAddress TEXT,
+            CompanyEmail TEXT,
+            CompanyPhone TEXT
+        );
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS Users (
+            UserName TEXT,
+            UserEmail TEXT,
+            UserPosition TEXT,
+            UserPrivilegeLevel TEXT,
+            UserPassword TEXT
+        );
+    """)
+
+
+def _core_v2_keys(conn: sqlite3.Connection) -> None:
+    _rebuild_table(conn, "Company", """
+        CREATE TABLE Company (
+            CompanyId INTEGER PRIMARY KEY,
+            CompanyName TEXT,
+            CompanyAddress TEXT,
+            CompanyEmail TEXT,
+            CompanyPhone TEXT
+        );
+    """)
+    _rebuild_table(conn, "Users", """
+        CREATE TABLE Users (
+            UserId INTEGER PRIMARY KEY,
+            UserName TEXT,
+            UserEmail TEXT,
+            UserPosition TEXT,
+            UserPrivilegeLevel TEXT,
+            UserPassword TEXT
+        );
+    """)
+    # ---Login check and admin setup check
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_users_login ON Users (UserName, UserPassword, UserPrivilegeLevel)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_users_privilege ON Users (UserPrivilegeLevel)")
+
+
+# ******************************************************************************************
+#  / patients.db
+# ******************************************************************************************
+
+
+def _patients_v1_baseline(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS Patients (
+            PatientId TEXT,
+            PatientName TEXT,
+            DOB TEXT,
+            PhoneNumber TEXT,
+            PatientEmail TEXT
+        );
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS Provider (
+            ProviderId TEXT,
+            ProviderName TEXT,
+            ProviderRate REAL,
+            MaxVisitsPerDay INTEGER
+        );
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS VisitDetails (
+            PatientId TEXT,
+            ProviderId TEXT,
+            VisitDate TEXT,
+            VisitNotes TEXT,
+            FollowUpDetails TEXT,
+            BillId TEXT
+        );
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS Notification (
+            NotificationId TEXT,
+            PatientId TEXT,
+            BillId TEXT,
+            NotificationDate TEXT,
+            Message TEXT
+        );
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS Schedule (
+            ScheduleId TEXT,
+            ProviderId TEXT,
+            PatientId TEXT,
+            ScheduleDate TEXT,
+            ScheduleSlot INTEGER
+        );
+    """)
+
+
+def _patients_v2_keys(conn: sqlite3.Connection) -> None:
+    _rebuild_table(conn, "VisitDetails", """
+        CREATE TABLE VisitDetails (
+            VisitId INTEGER PRIMARY KEY,
+            PatientId TEXT,
+            ProviderId TEXT,
+            VisitDate TEXT,
+            VisitNotes TEXT,
+            FollowUpDetails TEXT,
+            BillId TEXT
+        );
+    """)
+    _rebuild_table(conn, "Notification", """
+        CREATE TABLE Notification (
+            NotificationId TEXT PRIMARY KEY,
+            PatientId TEXT,
+            BillId TEXT,
+            NotificationDate TEXT,
+            Message TEXT
+        );
+    """)
+    # ---A provider can only hold one booking per slot; double bookings go to ScheduleConflicts.
+    _rebuild_table(conn, "Schedule", """
+        CREATE TABLE Schedule (
+            ScheduleId TEXT PRIMARY KEY,
+            ProviderId TEXT,
+            PatientId TEXT,
+            ScheduleDate TEXT,
+            ScheduleSlot INTEGER,
+            UNIQUE (ProviderId, ScheduleDate, ScheduleSlot)
+        );
+    """)
+
+    # ---Patient and provider IDs were handed out with COUNT(*) + 1 and may already repeat,
+    # ---so they are indexed here and made unique once the duplicates are repaired.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_patients_id ON Patients (PatientId, PatientName)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_patients_name ON Patients (PatientName, PatientId)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_provider_id ON Provider (ProviderId, ProviderName, ProviderRate)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_provider_name ON Provider (ProviderName, ProviderId)")
+
+    # ---Reports: visits per patient ordered by date; billing join and lookups by bill
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_visits_patient_date ON VisitDetails (PatientId, VisitDate)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_visits_bill ON VisitDetails (BillId)")
+
+    # ---Schedule: the unique key serves (ProviderId, ScheduleDate); this one covers the day grid
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_schedule_day ON Schedule (ProviderId, ScheduleDate, ScheduleSlot, PatientId)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_schedule_patient ON Schedule (PatientId, ScheduleDate)")
+
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_notification_patient ON Notification (PatientId, NotificationDate)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_notification_bill ON Notification (BillId)")
+
+
+def _patients_v3_unique_ids(conn: sqlite3.Connection) -> None:
+    # ---Visits and bookings reference patients and providers by ID alone, so those links
+    # ---cannot be split between duplicates and stay with the row that kept the original ID.
+    _repair_duplicate_ids(conn, "Patients", "PatientId")
+    _repair_duplicate_ids(conn, "Provider", "ProviderId")
+
+    _rebuild_table(conn, "Patients", """
+        CREATE TABLE Patients (
+            PatientId TEXT PRIMARY KEY,
+            PatientName TEXT,
+            DOB TEXT,
+            PhoneNumber TEXT,
+            PatientEmail TEXT
+        );
+    """)
+    _rebuild_table(conn, "Provider", """
+        CREATE TABLE Provider (
+            ProviderId TEXT PRIMARY KEY,
+            ProviderName TEXT,
+            ProviderRate REAL,
+            MaxVisitsPerDay INTEGER
+        );
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_patients_name ON Patients (PatientName, PatientId)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_provider_name ON Provider (ProviderName, ProviderId)")
+
+    create_sequence(conn, "Patients", "Patients", "PatientId")
+    create_sequence(conn, "Provider", "Provider", "ProviderId")
+
+
+def _patients_v4_schedule_day_index(conn: sqlite3.Connection) -> None:
+    # ---Lets the day view read slot, patient and booking ID straight from the index
+    conn.execute("DROP INDEX IF EXISTS idx_schedule_day")
+    conn.execute("CREATE INDEX idx_schedule_day ON Schedule (ProviderId, ScheduleDate, ScheduleSlot, PatientId, ScheduleId)")
+
+
+def _patients_v5_schedule_date_index(conn: sqlite3.Connection) -> None:
+    # ---Week and month views read every provider's bookings over a date range
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_schedule_date ON Schedule (ScheduleDate, ProviderId, ScheduleSlot, PatientId, ScheduleId)")
+
+
+# ---"(555) 123-4567" -> "5551234567", so digits typed without punctuation still match
+_PHONE_DIGITS = "replace(replace(replace(replace({row}.PhoneNumber, '(', ''), ')', ''), ' ', ''), '-', '')"
+
+
+def rebuild_patient_search(conn: sqlite3.Connection) -> None:
+    conn.execute("DELETE FROM PatientSearch")
+    conn.execute(f"""
+        INSERT INTO PatientSearch (rowid, PatientId, PatientName, DOB, PhoneNumber, PhoneDigits)
+        SELECT rowid, PatientId, PatientName, DOB, PhoneNumber, {_PHONE_DIGITS.format(row="Patients")} FROM Patients
+    """)  # noqa: S608
+
+
+def _patients_v6_patient_search(conn: sqlite3.Connection) -> None:
+    # ---Trigram index over the fields staff type into patient pickers. Rows share the Patients
+    # ---rowid so the triggers can find them; VACUUM may renumber those rowids, so the index is
+    # ---rebuilt (patient_repo.rebuild_search_index) after one.
+    conn.execute("""
+        CREATE VIRTUAL TABLE PatientSearch USING fts5(
+            PatientId UNINDEXED,
+            PatientName,
+            DOB,
+            PhoneNumber UNINDEXED,
+            PhoneDigits,
+            tokenize = 'trigram'
+        );
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER patients_search_insert AFTER INSERT ON Patients BEGIN
+            INSERT INTO PatientSearch (rowid, PatientId, PatientName, DOB, PhoneNumber, PhoneDigits)
+            VALUES (new.rowid, new.PatientId, new.PatientName, new.DOB, new.PhoneNumber, {_PHONE_DIGITS.format(row="new")});
+        END;
+    """)
+    conn.execute("""
+        CREATE TRIGGER patients_search_delete AFTER DELETE ON Patients BEGIN
+            DELETE FROM PatientSearch WHERE rowid = old.rowid;
+        END;
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER patients_search_update AFTER UPDATE ON Patients BEGIN
+            DELETE FROM PatientSearch WHERE rowid = old.rowid;
+            INSERT INTO PatientSearch (rowid, PatientId, PatientName, DOB, PhoneNumber, PhoneDigits)
+            VALUES (new.rowid, new.PatientId, new.PatientName, new.DOB, new.PhoneNumber, {_PHONE_DIGITS.format(row="new")});
+        END;
+    """)
+    rebuild_patient_search(conn)
+
+
+def _patients_v7_visit_notes_search(conn: sqlite3.Connection) -> None:
+    # ---External-content index over the visit free text; the text itself stays in VisitDetails
+    # ---and is keyed by VisitId, which VACUUM keeps stable.
+    conn.execute("""
+        CREATE VIRTUAL TABLE VisitNotesSearch USING fts5(
+            VisitNotes,
+            FollowUpDetails,
+            content = 'VisitDetails',
+            content_rowid = 'VisitId',
+            tokenize = 'porter unicode61 remove_diacritics 2'
+        );
+    """)
+    conn.execute("""
+        CREATE TRIGGER visit_notes_search_insert AFTER INSERT ON VisitDetails BEGIN
+            INSERT INTO VisitNotesSearch (rowid, VisitNotes, FollowUpDetails)
+            VALUES (new.VisitId, new.VisitNotes, new.FollowUpDetails);
+        END;
+    """)
+    conn.execute("""
+        CREATE TRIGGER visit_notes_search_delete AFTER DELETE ON VisitDetails BEGIN
+            INSERT INTO VisitNotesSearch (VisitNotesSearch, rowid, VisitNotes, FollowUpDetails)
+            VALUES ('delete', old.VisitId, old.VisitNotes, old.FollowUpDetails);
+        END;
+    """)
+    conn.execute("""
+        CREATE TRIGGER visit_notes_search_update AFTER UPDATE ON VisitDetails BEGIN
+            INSERT INTO VisitNotesSearch (VisitNotesSearch, rowid, VisitNotes, FollowUpDetails)
+            VALUES ('delete', old.VisitId, old.VisitNotes, old.FollowUpDetails);
+            INSERT INTO VisitNotesSearch (rowid, VisitNotes, FollowUpDetails)
+            VALUES (new.VisitId, new.VisitNotes, new.FollowUpDetails);
+        END;
+    """)
+    conn.execute("INSERT INTO VisitNotesSearch (VisitNotesSearch) VALUES ('rebuild')")
+
+
+def _patients_v8_visit_bill_index(conn: sqlite3.Connection) -> None:
+    # ---Reports sorted by bill number page through this instead of re-sorting every visit
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_visits_patient_bill ON VisitDetails (PatientId, CAST(BillId AS INTEGER))")
+    # ---Without statistics for it the planner keeps reading idx_visits_patient_date and sorting
+    conn.execute("ANALYZE VisitDetails")
+
+
+def _patients_v9_name_nocase_index(conn: sqlite3.Connection) -> None:
+    # ---LIKE ignores case, so a name prefix can only be searched through a NOCASE index;
+    # ---against idx_patients_name (BINARY) it scanned the whole index
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_patients_name_nocase ON Patients (PatientName COLLATE NOCASE, PatientId)")
+
+
+# ******************************************************************************************
+#  / billing.db
+# ******************************************************************************************
+
+
+def _billing_v1_baseline(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS Billing (
+            BillId TEXT,
+            BillAmount FLOAT,
+            VisitId TEXT,
+            DueDate TEXT,
+            Paid INTEGER
+        );
+    """)
+
+
+def _billing_v2_keys(conn: sqlite3.Connection) -> None:
+    # ---BillId repeats for the same reason as PatientId; see _patients_v2_keys.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_billing_id ON Billing (BillId, BillAmount, DueDate, Paid)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_billing_visit ON Billing (VisitId)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_billing_unpaid ON Billing (Paid, DueDate)")
+
+
+def _billing_v3_unique_ids(conn: sqlite3.Connection) -> None:
+    # ---Each bill belongs to exactly one visit and notification, so those follow the repair.
+    _repair_duplicate_ids(
+        conn,
+        "Billing",
+        "BillId",
+        linked=(("patients.VisitDetails", "BillId"), ("patients.Notification", "BillId")),
+    )
+    _split_shared_bills(conn)
+    # ---The old save path stored a copy of the bill ID in VisitId; point it at the visit that owns
+    # ---the bill, as record_visit does. A bill no visit refers to is left without one.
+    conn.execute("""
+        UPDATE Billing SET VisitId = (SELECT vd.VisitId FROM patients.VisitDetails vd WHERE vd.BillId = Billing.BillId)
+    """)
+
+    _rebuild_table(conn, "Billing", """
+        CREATE TABLE Billing (
+            BillId TEXT PRIMARY KEY,
+            BillAmount FLOAT,
+            VisitId TEXT,
+            DueDate TEXT,
+            Paid INTEGER
+        );
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_billing_visit ON Billing (VisitId)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_billing_unpaid ON Billing (Paid, DueDate)")
+
+    create_sequence(conn, "Billing", "Billing", "BillId")
+
+
+# ******************************************************************************************
+#  / Runner
+# ******************************************************************************************
+
+MIGRATIONS: dict[str, list[Migration]] = {
+    "core": [
+        Migration(1, "baseline tables", _core_v1_baseline),
+        Migration(2, "primary keys and login indexes", _core_v2_keys),
+    ],
+    "patients": [
+        Migration(1, "baseline tables", _patients_v1_baseline),
+        Migration(2, "primary keys, unique schedule slot and query indexes", _patients_v2_keys),
+        Migration(3, "repair duplicate patient/provider IDs and add ID sequences", _patients_v3_unique_ids),
+        Migration(4, "covering index for the schedule day view", _patients_v4_schedule_day_index),
+        Migration(5, "date index for schedule range views", _patients_v5_schedule_date_index),
+        Migration(6, "trigram search index over patients", _patients_v6_patient_search),
+        Migration(7, "full-text index over visit notes", _patients_v7_visit_notes_search),
+        Migration(8, "bill number index for report paging", _patients_v8_visit_bill_index),
+        Migration(9, "case-insensitive name index for short patient searches", _patients_v9_name_nocase_index),
+    ],
+    "billing": [
+        Migration(1, "baseline tables", _billing_v1_baseline),
+        Migration(2, "billing indexes", _billing_v2_keys),
+        Migration(3, "repair duplicate bill IDs and add the bill ID sequence", _billing_v3_unique_ids),
+    ],
+}
+
+
+# ---Databases attached to the migration connection: billing v3 relinks bills in patients.db
+MIGRATION_ATTACHMENTS: dict[str, tuple[str, ...]] = {
+    "billing": ("patients",),
+}
+
+
+def latest_version(db_key: str) -> int:
+    return max((m.version for m in MIGRATIONS[db_key]), default=0)
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def is_current(db_key: str) -> bool:
+    # ---Fast path for start-up: one PRAGMA on the app's own connection (which it keeps using)
+    # ---instead of opening a migration connection with every other database attached.
+    if not DB_MAP[db_key].exists():
+        return False
+    return schema_version(get_connection(db_key)) >= latest_version(db_key)
+
+
+def migrate(db_key: str) -> int:
+    # ---Apply every pending migration for one database and return the resulting version.
+    # ---Several desks may start at once: each migration re-reads user_version under the write
+    # ---lock and skips what another process applied while this one waited.
+    db_path = DB_MAP[db_key]
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None, factory=ProfiledConnection)
+    try:
+        enable_wal(conn)
+        # ---Databases whose links a migration fixes up are attached under their key. BEGIN IMMEDIATE
+        # ---locks every attached file too, so only these are attached: a patients migration that also
+        # ---locked billing could deadlock with a billing migration in another process.
+        for other_key in MIGRATION_ATTACHMENTS.get(db_key, ()):
+            conn.execute("ATTACH DATABASE ? AS " + other_key, (str(DB_MAP[other_key]),))
+
+        current = schema_version(conn)
+        for migration in MIGRATIONS[db_key]:
+            if migration.version <= current:
+                continue
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                current = schema_version(conn)
+                if migration.version <= current:
+                    conn.execute("COMMIT")
+                    continue
+                migration.apply(conn)
+                conn.execute(f"PRAGMA user_version = {int(migration.version)}")
+                conn.execute("COMMIT")
+            except Exception as e:
+                conn.execute("ROLLBACK")
+                logger.error(f"Migration {db_key} v{migration.version} ({migration.description}) failed: {e}")
+                raise
+
+            logger.info(f"Migrated {db_key} db to v{migration.version}: {migration.description}")
+            current = migration.version
+        return current
+    finally:
+        conn.close()
+
+
+def migrate_all() -> None:
+    for db_key in MIGRATIONS:
+        if not is_current(db_key):
+            migrate(db_key)
@@ -0,0 +1,144 @@
+# ui/database/notes_search.py
+
+# ---Full-text search over visit notes and follow-up / prescription details.
+# ---VisitNotesSearch (patients migration v7) is kept current by triggers on VisitDetails; the
+# ---rebuild here is for restoring it offline, e.g. after a bulk load with the triggers absent.
+
+
+import argparse
+import re
+import sqlite3
+from datetime import date
+from typing import NamedTuple
+
+from ui.config.logger_config import logger
+from ui.database.connection import get_connection, transaction
+from ui.database.init_db_tables import init_databases
+
+DEFAULT_LIMIT = 100
+SNIPPET_TOKENS = 16
+
+# ---bm25 column weights: a match in the notes counts twice a match in the follow-up
+NOTES_WEIGHT = 2.0
+FOLLOW_UP_WEIGHT = 1.0
+
+_TOKEN = re.compile(r'"[^"]*"|\S+')
+_OPERATORS = ("OR", "NOT", "AND")
+
+
+class NoteHit(NamedTuple):
+    visit_id: int
+    patient_id: str
+    patient_name: str | None
+    provider_name: str | None
+    visit_date: str
+    notes: str  # ---snippets with matches wrapped in the highlight markers
+    follow_up: str
+    score: float  # ---bm25; lower is a better match
+
+
+def build_query(text: str) -> str:
+    # ---Turns what staff type into a safe FTS5 expression: words are ANDed, "quoted phrases"
+    # ---stay phrases, OR / NOT pass through and a trailing * searches by prefix.
+    parts: list[str] = []
+    for token in _TOKEN.findall(text):
+        if token in _OPERATORS:
+            if parts and parts[-1] not in _OPERATORS:
+                parts.append(token)
+            continue
+        prefix = token.endswith("*") and not token.startswith('"')
+        word = token.strip('"').rstrip("*")
+        if not word:
+            continue
+        parts.append('"' + word.replace('"', '""') + '"' + ("*" if prefix else ""))
+    while parts and parts[-1] in _OPERATORS:
+        parts.pop()
+    return " ".join(parts)
+
+
+def search_notes(
+    text: str,
+    start: date | None = None,
+    end: date | None = None,
+    provider_id: str | None = None,
+    limit: int = DEFAULT_LIMIT,
+    markers: tuple[str, str] = ("[", "]"),
+) -> list[NoteHit]:
+    query = build_query(text)
+    if not query:
+        return []
+
+    where = ["VisitNotesSearch MATCH ?"]
+    params: list[object] = [query]
+    if start is not None:
+        where.append("vd.VisitDate >= ?")
+        params.append(start.isoformat())
+    if end is not None:
+        where.append("vd.VisitDate <= ?")
+        params.append(end.isoformat())
+    if provider_id is not None:
+        where.append("vd.ProviderId = ?")
+        params.append(provider_id)
+
+    open_mark, close_mark = markers
+    cur = get_connection("patients").execute(
+        f"""
+        SELECT vd.VisitId,
+            vd.PatientId,
+            pt.PatientName,
+            p.ProviderName,
+            vd.VisitDate,
+            snippet(VisitNotesSearch, 0, ?, ?, '...', {SNIPPET_TOKENS}),
+            snippet(VisitNotesSearch, 1, ?, ?, '...', {SNIPPET_TOKENS}),
+            bm25(VisitNotesSearch, {NOTES_WEIGHT}, {FOLLOW_UP_WEIGHT}) AS score
+        FROM VisitNotesSearch
+        JOIN VisitDetails vd ON vd.VisitId = VisitNotesSearch.rowid
+        LEFT JOIN Patients pt ON vd.PatientId = pt.PatientId
+        LEFT JOIN Provider p ON vd.ProviderId = p.ProviderId
+        WHERE {" AND ".join(where)}
+        ORDER BY score
+        LIMIT ?
+        """,  # noqa: S608
+        (open_mark, close_mark, open_mark, close_mark, *params, limit),
+    )
+    return [NoteHit(*row) for row in cur]
+
+
+def rebuild_notes_index(optimize: bool = True) -> None:
+    # ---Re-reads every VisitDetails row; 'optimize' then merges the index into one segment.
+    with transaction("patients") as conn:
+        conn.execute("INSERT INTO VisitNotesSearch (VisitNotesSearch) VALUES ('rebuild')")
+        if optimize:
+            conn.execute("INSERT INTO VisitNotesSearch (VisitNotesSearch) VALUES ('optimize')")
+    logger.info("Rebuilt the visit notes search index")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Search visit notes, or rebuild the notes index.")
+    parser.add_argument("query", nargs="?", default="", help='search text; "phrases", OR, NOT and prefix* are supported')
+    parser.add_argument("--start", type=date.fromisoformat, default=None, help="first visit date, yyyy-mm-dd")
+    parser.add_argument("--end", type=date.fromisoformat, default=None, help="last visit date, yyyy-mm-dd")
+    parser.add_argument("--provider", default=None, help="ProviderId to restrict to")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT)
+    parser.add_argument("--rebuild", action="store_true", help="rebuild and optimize the index, then exit")
+    args = parser.parse_args(argv)
+
+    init_databases()
+
+    try:
+        if args.rebuild:
+            rebuild_notes_index()
+            return 0
+        for hit in search_notes(args.query, args.start, args.end, args.provider, args.limit):
+            print(f"{hit.visit_date}  {hit.patient_name}  ({hit.provider_name})")
+            print(f"    {hit.notes}")
+            if hit.follow_up:
+                print(f"    {hit.follow_up}")
+    except sqlite3.Error as e:
+        logger.error(f"Notes search failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
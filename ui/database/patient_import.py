@@ -0,0 +1,204 @@
+# ui/database/patient_import.py
+
+# ---Streaming bulk import of patients from CSV or JSONL.
+# ---Rows are read one at a time, validated with the onboarding rules and inserted with executemany
+# ---in chunked transactions, so memory use stays flat regardless of file size. Rows that fail
+# ---validation are written to a reject file with the line number and reason; lines that could not
+# ---be parsed at all are written whole under Raw.
+
+
+import argparse
+import csv
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+from ui.config.logger_config import logger
+from ui.database.connection import transaction
+from ui.database.ids import allocate_ids
+from ui.database.init_db_tables import init_databases
+from ui.database.write_to_db import write_many
+from ui.util.validators import validate_patient
+
+DEFAULT_BATCH_SIZE = 1000
+
+# ---Accepted header names for each Patients column
+FIELD_ALIASES: dict[str, tuple[str, ...]] = {
+    "PatientName": ("patientname", "name", "patient_name", "patient"),
+    "DOB": ("dob", "dateofbirth", "date_of_birth", "birthdate"),
+    "PhoneNumber": ("phonenumber", "phone", "phone_number"),
+    "PatientEmail": ("patientemail", "email", "patient_email"),
+}
+_ALIAS_LOOKUP = {alias: column for column, aliases in FIELD_ALIASES.items() for alias in aliases}
+
+REJECT_HEADER = ["Line", "Error", "PatientName", "DOB", "PhoneNumber", "PatientEmail", "Raw"]
+
+
+class ImportProgress(NamedTuple):
+    rows: int
+    imported: int
+    rejected: int
+    bytes_read: int
+    total_bytes: int
+
+
+class ImportResult(NamedTuple):
+    rows: int
+    imported: int
+    rejected: int
+    reject_path: Path | None
+    cancelled: bool = False
+
+
+class _Rejected(NamedTuple):
+    message: str
+    raw: str
+
+
+COLUMNS = tuple(FIELD_ALIASES)
+
+
+def _column_for(key: object) -> str | None:
+    return _ALIAS_LOOKUP.get(str(key).strip().lower().replace(" ", ""))
+
+
+def _iter_records(handle, suffix: str) -> Iterator[tuple[int, tuple[str, ...] | _Rejected]]:  # noqa: ANN001
+    # ---Yields (line number, row in COLUMNS order) or (line number, _Rejected) for unparseable lines.
+    if suffix in (".jsonl", ".ndjson", ".json"):
+        for line_no, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, _Rejected(f"Invalid JSON: {e.msg}", line.strip())
+                continue
+            if not isinstance(record, dict):
+                yield line_no, _Rejected("Each line must be a JSON object.", line.strip())
+                continue
+
+            fields = {_column_for(key): value for key, value in record.items()}
+            yield line_no, tuple("" if fields.get(col) is None else str(fields[col]).strip() for col in COLUMNS)
+        return
+
+    # ---CSV: resolve the header to column positions once, then index each row directly
+    reader = csv.reader(handle)
+    header = next(reader, None) or []
+    positions = {_column_for(name): pos for pos, name in enumerate(header)}
+    indexes = [positions.get(col) for col in COLUMNS]
+    for row in reader:
+        if not row:
+            continue
+        width = len(row)
+        yield reader.line_num, tuple(row[idx].strip() if idx is not None and idx < width else "" for idx in indexes)
+
+
+def _flush(batch: list[tuple[str, ...]]) -> None:
+    # ---IDs are reserved in the same transaction; write_many joins it as one savepoint
+    with transaction("patients") as conn:
+        ids = allocate_ids(conn, "Patients", len(batch))
+        write_many(
+            "patients",
+            "Patients",
+            [(patient_id, *row) for patient_id, row in zip(ids, batch, strict=True)],
+            columns=("PatientId", *FIELD_ALIASES),
+            chunk_size=len(batch),
+        )
+
+
+def import_patients(
+    source: Path,
+    reject_path: Path | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    progress: Callable[[ImportProgress], None] | None = None,
+    cancel: threading.Event | None = None,
+) -> ImportResult:
+    started = time.perf_counter()
+    source = Path(source)
+    reject_path = Path(reject_path) if reject_path else source.with_name(f"{source.stem}.rejects.csv")
+    total_bytes = source.stat().st_size
+
+    rows = imported = rejected = 0
+    batch: list[tuple[str, ...]] = []
+    cancelled = False
+
+    with source.open("r", newline="", encoding="utf-8-sig") as handle, reject_path.open("w", newline="", encoding="utf-8") as reject_file:
+        rejects = csv.writer(reject_file)
+        rejects.writerow(REJECT_HEADER)
+
+        for line_no, row in _iter_records(handle, source.suffix.lower()):
+            if cancel and cancel.is_set():
+                cancelled = True
+                break
+
+            rows += 1
+            if isinstance(row, _Rejected):
+                rejects.writerow([line_no, row.message, *("" for _ in COLUMNS), row.raw])
+                rejected += 1
+                continue
+
+            issue = validate_patient(*row)
+            if issue:
+                rejects.writerow([line_no, issue.message, *row, ""])
+                rejected += 1
+                continue
+
+            batch.append(row)
+            if len(batch) >= batch_size:
+                _flush(batch)
+                imported += len(batch)
+                batch.clear()
+
+                if progress:
+                    progress(ImportProgress(rows, imported, rejected, handle.buffer.tell(), total_bytes))
+
+        # ---Rows read before a cancel were already validated, so they are kept
+        if batch:
+            _flush(batch)
+            imported += len(batch)
+
+    if progress:
+        progress(ImportProgress(rows, imported, rejected, total_bytes, total_bytes))
+
+    if not rejected:
+        reject_path.unlink(missing_ok=True)
+    log = logger.bind(operation="patient_import", duration_ms=round((time.perf_counter() - started) * 1000, 3))
+    log.info(f"Patient import from {source}: {imported} imported, {rejected} rejected{' (cancelled)' if cancelled else ''}")
+    return ImportResult(rows, imported, rejected, reject_path if rejected else None, cancelled)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk import patients from a CSV or JSONL file.")
+    parser.add_argument("source", type=Path, help="CSV (with header) or JSONL file of patients")
+    parser.add_argument("--rejects", type=Path, default=None, help="where to write rejected rows (default: <source>.rejects.csv)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    init_databases()
+
+    line_open = False
+
+    def report(p: ImportProgress) -> None:
+        # ---The last report ends the progress line, so import_patients' summary starts on its own
+        nonlocal line_open
+        line_open = p.bytes_read < p.total_bytes
+        print(f"\r{p.rows} rows  {p.imported} imported  {p.rejected} rejected", end="" if line_open else "\n", flush=True)
+
+    try:
+        result = import_patients(args.source, args.rejects, args.batch_size, report)
+    except (OSError, sqlite3.Error) as e:
+        if line_open:
+            print()
+        logger.error(f"Patient import failed: {e}")
+        return 1
+    if result.reject_path:
+        print(f"Rejected rows written to {result.reject_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,90 @@
+# ui/database/record_visit.py
+
+# ---Records a visit, its bill and the patient notification as one all-or-nothing write.
+
+
+import datetime
+import uuid
+from datetime import timedelta
+from functools import cache
+from typing import NamedTuple
+
+from ui.database.connection import transaction
+from ui.database.events import VisitRecorded, event_bus
+from ui.database.ids import allocate_id
+from ui.database.reference_cache import reference_cache
+
+PAYMENT_TERMS = timedelta(days=30)
+
+
+@cache
+def _local_zone() -> datetime.tzinfo:
+    # ---Looked up on the first visit recorded rather than at import; tzlocal reads system config
+    from tzlocal import get_localzone
+
+    return get_localzone()
+
+
+class UnknownProvider(LookupError):
+    pass
+
+
+class RecordedVisit(NamedTuple):
+    visit_id: int
+    bill_id: str
+    amount_due: float
+    due_date: str
+    notification_id: str
+
+
+def record_visit(
+    patient_id: str,
+    provider_id: str,
+    visit_date: str,
+    visit_notes: str,
+    follow_up: str,
+    company_name: str | None = None,
+) -> RecordedVisit:
+    # ---billing.db is attached to the patients connection, so the visit, bill and notification
+    # ---share one transaction and one commit. In WAL mode SQLite keeps each file atomic but a
+    # ---power loss mid-commit can still land one file without the other.
+    if company_name is None:
+        company_name = reference_cache.company_name()
+    provider = reference_cache.provider(provider_id)
+
+    now = datetime.datetime.now(tz=_local_zone())
+    due_date = (now.date() + PAYMENT_TERMS).isoformat()
+    notification_id = str(uuid.uuid4())
+
+    with transaction("patients") as conn:
+        if provider is not None:
+            rate = provider.rate
+        else:
+            # ---Not in this process's cache: added at another desk since it was loaded, or unknown
+            row = conn.execute("SELECT ProviderRate FROM Provider WHERE ProviderId = ?", (provider_id,)).fetchone()
+            if row is None:
+                raise UnknownProvider(provider_id)
+            rate = row[0]
+        amount_due = rate if rate is not None else 0
+
+        bill_id = allocate_id(conn, "Billing")
+
+        cur = conn.execute(
+            "INSERT INTO VisitDetails (PatientId, ProviderId, VisitDate, VisitNotes, FollowUpDetails, BillId) VALUES (?, ?, ?, ?, ?, ?)",
+            (patient_id, provider_id, visit_date, visit_notes, follow_up, bill_id),
+        )
+        visit_id = cur.lastrowid
+
+        conn.execute(
+            "INSERT INTO billing.Billing (BillId, BillAmount, VisitId, DueDate, Paid) VALUES (?, ?, ?, ?, 0)",
+            (bill_id, amount_due, str(visit_id), due_date),
+        )
+
+        message = f"Your bill for services provided by {company_name} on {visit_date} is due on {due_date}.\nPlease pay {amount_due} at you're earliest convenience.\nThank You!"
+        conn.execute(
+            "INSERT INTO Notification (NotificationId, PatientId, BillId, NotificationDate, Message) VALUES (?, ?, ?, ?, ?)",
+            (notification_id, patient_id, bill_id, now.isoformat(), message),
+        )
+        event_bus.publish_on_commit(conn, VisitRecorded(visit_id, patient_id, provider_id, visit_date, bill_id, amount_due, due_date))
+
+    return RecordedVisit(visit_id, bill_id, amount_due, due_date, notification_id)
@@ -0,0 +1,127 @@
+# ui/database/reference_cache.py
+
+# ---Reference data read on nearly every screen and save: providers (names, rates, visit caps),
+# ---patient names and the company settings, cached by ID. The Provider table is small and loaded
+# ---whole; patient names are held in an LRU. Change events keep the cache current: new rows are
+# ---added in place, and generic writes to a table drop what was cached from it.
+
+
+import threading
+from collections import OrderedDict
+
+from ui.database.events import PatientCreated, ProviderCreated, RowsWritten, event_bus
+from ui.database.repositories import Company, Provider, company_repo, patient_repo, provider_repo
+
+
+class ReferenceCache:
+    PATIENT_CACHE_SIZE = 2048
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._providers: dict[str, Provider] | None = None  # ---insertion order is the table's order
+        self._patients: OrderedDict[str, str] = OrderedDict()  # ---PatientId -> name, least recently used first
+        self._company: Company | None = None
+        # ---Bumped on every change so a load that raced a write is returned but not kept
+        self._provider_generation = 0
+        self._company_generation = 0
+
+        # ---Inline: the cache is thread-safe and must be current before the write returns
+        event_bus.subscribe(ProviderCreated, self._on_provider_created, inline=True)
+        event_bus.subscribe(PatientCreated, self._on_patient_created, inline=True)
+        event_bus.subscribe(RowsWritten, self._on_rows_written, inline=True)
+
+    # ---Providers
+
+    def providers(self) -> list[Provider]:
+        return list(self._provider_map().values())
+
+    def provider(self, provider_id: str | None) -> Provider | None:
+        return self._provider_map().get(provider_id) if provider_id else None
+
+    def provider_name(self, provider_id: str | None) -> str:
+        provider = self.provider(provider_id)
+        return provider.name if provider else ""
+
+    def _provider_map(self) -> dict[str, Provider]:
+        with self._lock:
+            if self._providers is not None:
+                return self._providers
+            generation = self._provider_generation
+
+        providers = {p.provider_id: p for p in provider_repo.list_all()}
+        with self._lock:
+            if generation == self._provider_generation:
+                self._providers = providers
+        return providers
+
+    # ---Patients
+
+    def patient_name(self, patient_id: str | None) -> str:
+        if not patient_id:
+            return ""
+        with self._lock:
+            name = self._patients.get(patient_id)
+            if name is not None:
+                self._patients.move_to_end(patient_id)
+                return name
+
+        name = patient_repo.name_for(patient_id)
+        if name:
+            self._remember_patient(patient_id, name)
+        return name
+
+    def _remember_patient(self, patient_id: str, name: str) -> None:
+        with self._lock:
+            self._patients[patient_id] = name
+            self._patients.move_to_end(patient_id)
+            while len(self._patients) > self.PATIENT_CACHE_SIZE:
+                self._patients.popitem(last=False)
+
+    # ---Company settings
+
+    def company(self) -> Company | None:
+        with self._lock:
+            if self._company is not None:
+                return self._company
+            generation = self._company_generation
+
+        company = company_repo.get()
+        with self._lock:
+            if generation == self._company_generation:
+                self._company = company
+        return company
+
+    def company_name(self) -> str:
+        company = self.company()
+        return company.name if company and company.name else ""
+
+    def clear(self) -> None:
+        with self._lock:
+            self._providers = None
+            self._patients.clear()
+            self._company = None
+            self._provider_generation += 1
+            self._company_generation += 1
+
+    # ---Change events
+
+    def _on_provider_created(self, event: ProviderCreated) -> None:
+        with self._lock:
+            self._provider_generation += 1
+            if self._providers is not None:
+                self._providers = {**self._providers, event.provider_id: Provider(*event)}
+
+    def _on_patient_created(self, event: PatientCreated) -> None:
+        self._remember_patient(event.patient_id, event.name)
+
+    def _on_rows_written(self, event: RowsWritten) -> None:
+        with self._lock:
+            if event.table == "Provider":
+                self._providers = None
+                self._provider_generation += 1
+            elif event.table == "Company":
+                self._company = None
+                self._company_generation += 1
+
+
+reference_cache = ReferenceCache()
@@ -0,0 +1,586 @@
+# ui/database/repositories.py
+
+# ---Typed data access for each table, served from the shared per-thread connections.
+
+
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Literal, NamedTuple
+
+from ui.database.connection import get_connection, on_commit, transaction
+from ui.database.events import BillPaid, BookingMade, PatientCreated, ProviderCreated, RowsWritten, event_bus
+from ui.database.ids import allocate_id
+from ui.database.migrations import rebuild_patient_search
+
+
+class Patient(NamedTuple):
+    patient_id: str
+    name: str
+    dob: str
+    phone: str
+    email: str
+
+
+class PatientMatch(NamedTuple):
+    patient_id: str
+    name: str
+    dob: str
+    phone: str
+
+
+class Provider(NamedTuple):
+    provider_id: str
+    name: str
+    rate: float | None
+    max_visits_per_day: int | None
+
+
+class Visit(NamedTuple):
+    patient_id: str
+    provider_id: str
+    visit_date: str
+    notes: str
+    follow_up: str
+    bill_id: str
+
+
+class VisitReportRow(NamedTuple):
+    visit_date: str
+    provider_name: str | None
+    notes: str
+    follow_up: str
+    bill_id: str
+    amount: float | None
+    due_date: str | None
+    paid: str
+
+
+class VisitListRow(NamedTuple):
+    visit_id: int
+    visit_date: str
+    provider_name: str | None
+    bill_id: str
+    amount: float | None
+    due_date: str | None
+    paid: str
+    sort_value: object  # ---value of the active sort expression, used as the keyset cursor
+
+
+class Booking(NamedTuple):
+    schedule_id: str
+    provider_id: str
+    patient_id: str
+    schedule_date: str
+    slot: int
+
+
+class DaySlot(NamedTuple):
+    slot: int
+    patient_id: str
+    patient_name: str
+    schedule_id: str
+
+
+class RangeBooking(NamedTuple):
+    schedule_date: str
+    provider_id: str
+    slot: int
+    patient_id: str
+    patient_name: str
+    schedule_id: str
+
+
+# ---What ScheduleRepository.book() did: inserted the booking, found the slot taken, or found the
+# ---provider already at MaxVisitsPerDay for that date
+type BookingOutcome = Literal["booked", "taken", "full", "unknown_patient", "unknown_provider"]
+
+
+class Bill(NamedTuple):
+    bill_id: str
+    amount: float
+    visit_id: str
+    due_date: str
+    paid: int = 0
+
+
+class Notification(NamedTuple):
+    notification_id: str
+    patient_id: str
+    bill_id: str
+    notification_date: str
+    message: str
+
+
+class Company(NamedTuple):
+    name: str
+    address: str
+    email: str
+    phone: str
+
+
+# ******************************************************************************************
+#  / patients.db
+# ******************************************************************************************
+
+
+class PatientRepository:
+    def get(self, patient_id: str) -> Patient | None:
+        row = get_connection("patients").execute(
+            "SELECT PatientId, PatientName, DOB, PhoneNumber, PatientEmail FROM Patients WHERE PatientId = ?",
+            (patient_id,),
+        ).fetchone()
+        return Patient(*row) if row else None
+
+    def name_for(self, patient_id: str | None) -> str:
+        if not patient_id:
+            return ""
+        row = get_connection("patients").execute("SELECT PatientName FROM Patients WHERE PatientId = ?", (patient_id,)).fetchone()
+        return row[0] if row else ""
+
+    def search(self, text: str, limit: int = 20) -> list[PatientMatch]:
+        # ---Type-ahead lookup by name, DOB or phone against the PatientSearch trigram index.
+        # ---Names starting with the input come first. When no patient matches every term, any
+        # ---shared trigram counts, ranked by bm25, so a misspelt name still finds its neighbours.
+        text = text.strip()
+        terms = [t for t in text.split() if len(t) >= 3]
+        if not terms:
+            return self._name_prefix(text, limit) if text else []
+
+        query = " AND ".join(self._term_query(t) for t in terms)
+        matches = self._match(query, limit, name_prefix=text)
+        if len(matches) < limit:
+            seen = {m.patient_id for m in matches}
+            matches += [m for m in self._match(query, limit) if m.patient_id not in seen][: limit - len(matches)]
+        if matches:
+            return matches
+
+        grams = {t.lower()[i : i + 3] for t in terms for i in range(len(t) - 2)}
+        return self._match(" OR ".join(self._quote(g) for g in sorted(grams)), limit, ranked=True)
+
+    @staticmethod
+    def _quote(term: str) -> str:
+        return '"' + term.replace('"', '""') + '"'
+
+    def _term_query(self, term: str) -> str:
+        # ---Phone numbers are indexed as bare digits, so punctuation typed with them is dropped
+        digits = "".join(c for c in term if c.isdigit())
+        if digits != term and len(digits) >= 3 and not any(c.isalpha() for c in term):
+            return f"({self._quote(term)} OR PhoneDigits : {self._quote(digits)})"
+        return self._quote(term)
+
+    def _match(self, query: str, limit: int, name_prefix: str | None = None, ranked: bool = False) -> list[PatientMatch]:
+        # ---Unranked queries stop at the first `limit` hits instead of scoring every match
+        sql = "SELECT PatientId, PatientName, DOB, PhoneNumber FROM PatientSearch WHERE PatientSearch MATCH ?"
+        params: list[object] = [query]
+        if name_prefix is not None:
+            sql += " AND PatientName LIKE ? ESCAPE '\\'"
+            params.append(self._like_prefix(name_prefix))
+        if ranked:
+            sql += " ORDER BY rank"
+        cur = get_connection("patients").execute(f"{sql} LIMIT ?", (*params, limit))
+        return [PatientMatch(*row) for row in cur]
+
+    @staticmethod
+    def _like_prefix(prefix: str) -> str:
+        # ---% and _ typed by the user match themselves, not any text
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return f"{escaped}%"
+
+    def _name_prefix(self, prefix: str, limit: int) -> list[PatientMatch]:
+        # ---Trigrams need three characters; shorter input searches idx_patients_name_nocase, which
+        # ---LIKE can use because it ignores case too
+        cur = get_connection("patients").execute(
+            "SELECT PatientId, PatientName, DOB, PhoneNumber FROM Patients WHERE PatientName LIKE ? ESCAPE '\\' "
+            "ORDER BY PatientName COLLATE NOCASE LIMIT ?",
+            (self._like_prefix(prefix), limit),
+        )
+        return [PatientMatch(*row) for row in cur]
+
+    def rebuild_search_index(self) -> None:
+        with transaction("patients") as conn:
+            rebuild_patient_search(conn)
+
+    def create(self, name: str, dob: str, phone: str, email: str) -> str:
+        with transaction("patients") as conn:
+            patient_id = allocate_id(conn, "Patients")
+            conn.execute(
+                "INSERT INTO Patients (PatientId, PatientName, DOB, PhoneNumber, PatientEmail) VALUES (?, ?, ?, ?, ?)",
+                (patient_id, name, dob, phone, email),
+            )
+            event_bus.publish_on_commit(conn, PatientCreated(patient_id, name, dob, phone))
+        return patient_id
+
+
+class ProviderRepository:
+    def list_all(self) -> list[Provider]:
+        cur = get_connection("patients").execute("SELECT ProviderId, ProviderName, ProviderRate, MaxVisitsPerDay FROM Provider")
+        return [Provider(*row) for row in cur]
+
+    def create(self, name: str, rate: float, max_visits_per_day: int | None = None) -> str:
+        with transaction("patients") as conn:
+            provider_id = allocate_id(conn, "Provider")
+            conn.execute(
+                "INSERT INTO Provider (ProviderId, ProviderName, ProviderRate, MaxVisitsPerDay) VALUES (?, ?, ?, ?)",
+                (provider_id, name, rate, max_visits_per_day),
+            )
+            event_bus.publish_on_commit(conn, ProviderCreated(provider_id, name, rate, max_visits_per_day))
+        return provider_id
+
+
+class VisitRepository:
+    # ---Sortable report columns -> SQL expression. Visit date and bill ID are the expressions of
+    # ---idx_visits_patient_date and idx_visits_patient_bill, so those pages are read in index
+    # ---order; the other columns live in joined tables and are sorted per page (a temp B-tree
+    # ---over one patient's visits). NULLs are handled in the keyset predicate, not coalesced.
+    SORT_EXPRESSIONS: dict[str, str] = {  # noqa: RUF012
+        "visit_date": "vd.VisitDate",
+        "provider_name": "p.ProviderName",
+        "bill_id": "CAST(vd.BillId AS INTEGER)",
+        "amount": "b.BillAmount",
+        "due_date": "b.DueDate",
+        "paid": "b.Paid",
+    }
+
+    @staticmethod
+    def _keyset_steps(sort_expr: str, descending: bool, after: tuple[object, int] | None) -> list[tuple[str | None, list[object], str]]:
+        # ---(predicate, params, ORDER BY) read one after another for the rows after (value, VisitId).
+        # ---SQLite sorts NULLs first ascending and last descending, and comparing with NULL is never
+        # ---true, so the NULL group is its own step (ordered by VisitId alone); an OR of the two would
+        # ---lose the index range. "expr >= ? AND (...)" rather than a row value, which SQLite cannot
+        # ---seek on an expression index.
+        direction = "DESC" if descending else "ASC"
+        order = f"{sort_expr} {direction}, vd.VisitId {direction}"
+        nulls = f"vd.VisitId {direction}"
+        if after is None:
+            return [(None, [], order)]
+        value, visit_id = after
+        if value is None:
+            if descending:
+                return [(f"{sort_expr} IS NULL AND vd.VisitId < ?", [visit_id], nulls)]
+            return [(f"{sort_expr} IS NULL AND vd.VisitId > ?", [visit_id], nulls), (f"{sort_expr} IS NOT NULL", [], order)]
+        if descending:
+            return [(f"{sort_expr} <= ? AND ({sort_expr} < ? OR vd.VisitId < ?)", [value, value, visit_id], order), (f"{sort_expr} IS NULL", [], nulls)]
+        return [(f"{sort_expr} >= ? AND ({sort_expr} > ? OR vd.VisitId > ?)", [value, value, visit_id], order)]
+
+    def add(self, visit: Visit) -> None:
+        with transaction("patients") as conn:
+            conn.execute(
+                "INSERT INTO VisitDetails (PatientId, ProviderId, VisitDate, VisitNotes, FollowUpDetails, BillId) VALUES (?, ?, ?, ?, ?, ?)",
+                visit,
+            )
+            event_bus.publish_on_commit(conn, RowsWritten("patients", "VisitDetails", 1))
+
+    def report_for_patient(self, patient_id: str) -> list[VisitReportRow]:
+        # ---billing.db is attached to the patients connection as "billing"
+        cur = get_connection("patients").execute(
+            """
+            SELECT vd.VisitDate,
+                p.ProviderName,
+                vd.VisitNotes,
+                vd.FollowUpDetails,
+                vd.BillId,
+                b.BillAmount,
+                b.DueDate,
+                CASE b.Paid WHEN 1 THEN 'Yes' ELSE 'No' END
+            FROM VisitDetails vd
+            LEFT JOIN Provider p ON vd.ProviderId = p.ProviderId
+            LEFT JOIN billing.Billing b ON vd.BillId = b.BillId
+            WHERE vd.PatientId = ?
+            ORDER BY vd.VisitDate ASC;
+            """,
+            (patient_id,),
+        )
+        return [VisitReportRow(*row) for row in cur]
+
+    def page_for_patient(
+        self,
+        patient_id: str,
+        after: tuple[object, int] | None = None,
+        sort_key: str = "visit_date",
+        descending: bool = False,
+        filter_text: str = "",
+        limit: int = 200,
+    ) -> list[VisitListRow]:
+        # ---Keyset pagination: the next page starts after the (sort value, VisitId) of the last row,
+        # ---so every page is an index seek rather than an OFFSET scan. Notes are not selected here.
+        sort_expr = self.SORT_EXPRESSIONS[sort_key]
+        where = ["vd.PatientId = ?"]
+        params: list[object] = [patient_id]
+
+        if filter_text:
+            pattern = f"%{filter_text}%"
+            where.append("(vd.VisitNotes LIKE ? OR vd.FollowUpDetails LIKE ? OR p.ProviderName LIKE ? OR vd.VisitDate LIKE ?)")
+            params.extend([pattern] * 4)
+
+        rows: list[VisitListRow] = []
+        for clause, after_params, order in self._keyset_steps(sort_expr, descending, after):
+            cur = get_connection("patients").execute(
+                f"""
+                SELECT vd.VisitId,
+                    vd.VisitDate,
+                    p.ProviderName,
+                    vd.BillId,
+                    b.BillAmount,
+                    b.DueDate,
+                    CASE b.Paid WHEN 1 THEN 'Yes' ELSE 'No' END,
+                    {sort_expr}
+                FROM VisitDetails vd
+                LEFT JOIN Provider p ON vd.ProviderId = p.ProviderId
+                LEFT JOIN billing.Billing b ON vd.BillId = b.BillId
+                WHERE {" AND ".join([*where, clause] if clause else where)}
+                ORDER BY {order}
+                LIMIT ?
+                """,  # noqa: S608
+                (*params, *after_params, limit - len(rows)),
+            )
+            rows.extend(VisitListRow(*row) for row in cur)
+            if len(rows) >= limit:
+                break
+        return rows
+
+    def notes_for(self, visit_id: int) -> tuple[str, str]:
+        row = get_connection("patients").execute("SELECT VisitNotes, FollowUpDetails FROM VisitDetails WHERE VisitId = ?", (visit_id,)).fetchone()
+        return (row[0] or "", row[1] or "") if row else ("", "")
+
+
+class ScheduleRepository:
+    DAY_CACHE_SIZE = 256
+
+    def __init__(self) -> None:
+        # ---(ProviderId, ScheduleDate) -> booked slots, least recently used first
+        self._day_cache: OrderedDict[tuple[str, str], dict[int, DaySlot]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # ---Bumped on every clear, so a day read before a clear is not stored after it
+        self._generation = 0
+        # ---Per thread: (connection, PRAGMA data_version) when this thread last checked
+        self._seen = threading.local()
+        # ---Inline so the cache is dropped before write_to_database() returns, on any thread
+        event_bus.subscribe(RowsWritten, self._on_rows_written, inline=True)
+
+    def _on_rows_written(self, event: RowsWritten) -> None:
+        if event.table == "Schedule":
+            self._clear_days()
+
+    def _clear_days(self) -> None:
+        with self._cache_lock:
+            self._day_cache.clear()
+            self._generation += 1
+
+    def _drop_if_changed_elsewhere(self, conn: sqlite3.Connection) -> None:
+        # ---data_version moves when any other connection (another desk, the API server, another
+        # ---thread here) commits to patients.db. The change could be to any day, so the whole
+        # ---cache goes; this process's own bookings update it in place and do not move it.
+        version = (id(conn), conn.execute("PRAGMA data_version").fetchone()[0])
+        if getattr(self._seen, "version", None) != version:
+            self._seen.version = version
+            self._clear_days()
+
+    def day_view(self, provider_id: str, date_str: str) -> dict[int, DaySlot]:
+        # ---One indexed query per provider-day, joined to the patient name, cached until a booking changes it.
+        key = (provider_id, date_str)
+        conn = get_connection("patients")
+        self._drop_if_changed_elsewhere(conn)
+        with self._cache_lock:
+            cached = self._day_cache.get(key)
+            if cached is not None:
+                self._day_cache.move_to_end(key)
+                return cached
+            generation = self._generation
+
+        cur = conn.execute(
+            """SELECT s.ScheduleSlot, s.PatientId, COALESCE(p.PatientName, ''), s.ScheduleId
+                FROM Schedule s
+                LEFT JOIN Patients p ON p.PatientId = s.PatientId
+                WHERE s.ProviderId = ?
+                    AND s.ScheduleDate = ?""",
+            key,
+        )
+        day = {row[0]: DaySlot(*row) for row in cur}
+
+        with self._cache_lock:
+            if generation == self._generation:
+                self._day_cache[key] = day
+                self._day_cache.move_to_end(key)
+                while len(self._day_cache) > self.DAY_CACHE_SIZE:
+                    self._day_cache.popitem(last=False)
+        return day
+
+    def invalidate_day(self, provider_id: str, date_str: str) -> None:
+        with self._cache_lock:
+            self._day_cache.pop((provider_id, date_str), None)
+            self._generation += 1
+
+    def range_view(self, start_date: str, end_date: str) -> list[RangeBooking]:
+        # ---Every provider's bookings over a date range in one query on the ScheduleDate index
+        cur = get_connection("patients").execute(
+            """SELECT s.ScheduleDate, s.ProviderId, s.ScheduleSlot, s.PatientId, COALESCE(p.PatientName, ''), s.ScheduleId
+                FROM Schedule s
+                LEFT JOIN Patients p ON p.PatientId = s.PatientId
+                WHERE s.ScheduleDate BETWEEN ? AND ?""",
+            (start_date, end_date),
+        )
+        return [RangeBooking(*row) for row in cur]
+
+    def day_map(self, provider_id: str, date_str: str) -> dict[int, str]:
+        return {slot: booked.patient_id for slot, booked in self.day_view(provider_id, date_str).items()}
+
+    def is_booked(self, provider_id: str, date_str: str, slot: int) -> bool:
+        cur = get_connection("patients").execute(
+            "SELECT 1 FROM Schedule WHERE ProviderId=? AND ScheduleDate=? AND ScheduleSlot=?",
+            (provider_id, date_str, slot),
+        )
+        return cur.fetchone() is not None
+
+    def add(self, booking: Booking) -> None:
+        with transaction("patients") as conn:
+            conn.execute(
+                "INSERT INTO Schedule (ScheduleId, ProviderId, PatientId, ScheduleDate, ScheduleSlot) VALUES (?, ?, ?, ?, ?)",
+                booking,
+            )
+            name_row = conn.execute("SELECT PatientName FROM Patients WHERE PatientId = ?", (booking.patient_id,)).fetchone()
+            patient_name = name_row[0] if name_row and name_row[0] else ""
+            on_commit(conn, lambda: self._apply_to_cache(booking, patient_name))
+            event_bus.publish_on_commit(conn, BookingMade(*booking, patient_name))
+
+    def book(self, booking: Booking) -> BookingOutcome:
+        # ---The free-slot and daily-limit checks and the insert are one statement, so two desks
+        # ---booking the same slot cannot both pass the check: the UNIQUE (ProviderId, ScheduleDate,
+        # ---ScheduleSlot) key turns the second into a no-op. The patient and provider must exist too.
+        # ---RETURNING hands back the patient name for the cache and the BookingMade event without
+        # ---another query.
+        with transaction("patients") as conn:
+            row = conn.execute(
+                """INSERT INTO Schedule (ScheduleId, ProviderId, PatientId, ScheduleDate, ScheduleSlot)
+                    SELECT :schedule_id, :provider_id, :patient_id, :schedule_date, :slot
+                    WHERE EXISTS (SELECT 1 FROM Patients WHERE PatientId = :patient_id)
+                        AND EXISTS (SELECT 1 FROM Provider WHERE ProviderId = :provider_id)
+                        AND (COALESCE((SELECT MaxVisitsPerDay FROM Provider WHERE ProviderId = :provider_id), 0) <= 0
+                            OR (SELECT COUNT(*) FROM Schedule WHERE ProviderId = :provider_id AND ScheduleDate = :schedule_date)
+                                < (SELECT MaxVisitsPerDay FROM Provider WHERE ProviderId = :provider_id))
+                    ON CONFLICT (ProviderId, ScheduleDate, ScheduleSlot) DO NOTHING
+                    RETURNING (SELECT COALESCE(PatientName, '') FROM Patients WHERE PatientId = Schedule.PatientId)""",
+                booking._asdict(),
+            ).fetchone()
+            if row is None:
+                patient_known, provider_known = conn.execute(
+                    "SELECT EXISTS (SELECT 1 FROM Patients WHERE PatientId = ?), EXISTS (SELECT 1 FROM Provider WHERE ProviderId = ?)",
+                    (booking.patient_id, booking.provider_id),
+                ).fetchone()
+                if not patient_known:
+                    return "unknown_patient"
+                if not provider_known:
+                    return "unknown_provider"
+                # ---Nothing inserted; the day this desk has cached is out of date either way
+                outcome = "taken" if self.is_booked(booking.provider_id, booking.schedule_date, booking.slot) else "full"
+                on_commit(conn, lambda: self.invalidate_day(booking.provider_id, booking.schedule_date))
+                return outcome
+            patient_name = row[0] or ""
+            on_commit(conn, lambda: self._apply_to_cache(booking, patient_name))
+            event_bus.publish_on_commit(conn, BookingMade(*booking, patient_name))
+        return "booked"
+
+    def _apply_to_cache(self, booking: Booking, patient_name: str) -> None:
+        # ---A cached day gains the new slot in place of being re-read; readers keep their old copy
+        key = (booking.provider_id, booking.schedule_date)
+        with self._cache_lock:
+            cached = self._day_cache.get(key)
+            if cached is not None:
+                self._day_cache[key] = {**cached, booking.slot: DaySlot(booking.slot, booking.patient_id, patient_name, booking.schedule_id)}
+
+
+class NotificationRepository:
+    def add(self, notification: Notification) -> None:
+        with transaction("patients") as conn:
+            conn.execute(
+                "INSERT INTO Notification (NotificationId, PatientId, BillId, NotificationDate, Message) VALUES (?, ?, ?, ?, ?)",
+                notification,
+            )
+            event_bus.publish_on_commit(conn, RowsWritten("patients", "Notification", 1))
+
+
+# ******************************************************************************************
+#  / billing.db
+# ******************************************************************************************
+
+
+class BillingRepository:
+    def add(self, bill: Bill) -> None:
+        with transaction("billing") as conn:
+            conn.execute(
+                "INSERT INTO Billing (BillId, BillAmount, VisitId, DueDate, Paid) VALUES (?, ?, ?, ?, ?)",
+                bill,
+            )
+            event_bus.publish_on_commit(conn, RowsWritten("billing", "Billing", 1))
+
+    def mark_paid(self, bill_id: str) -> bool:
+        # ---False when the bill does not exist or was already paid
+        with transaction("billing") as conn:
+            row = conn.execute("SELECT VisitId FROM Billing WHERE BillId = ? AND Paid = 0", (bill_id,)).fetchone()
+            if row is None:
+                return False
+            conn.execute("UPDATE Billing SET Paid = 1 WHERE BillId = ?", (bill_id,))
+            event_bus.publish_on_commit(conn, BillPaid(bill_id, row[0]))
+        return True
+
+
+# ******************************************************************************************
+#  / core.db
+# ******************************************************************************************
+
+
+class CompanyRepository:
+    def exists(self) -> bool:
+        return get_connection("core").execute("SELECT 1 FROM Company LIMIT 1").fetchone() is not None
+
+    def name(self) -> str:
+        row = get_connection("core").execute("SELECT CompanyName FROM Company LIMIT 1").fetchone()
+        return row[0] if row and row[0] else ""
+
+    def get(self) -> Company | None:
+        row = get_connection("core").execute("SELECT CompanyName, CompanyAddress, CompanyEmail, CompanyPhone FROM Company LIMIT 1").fetchone()
+        return Company(*row) if row else None
+
+    def add(self, company: Company) -> None:
+        with transaction("core") as conn:
+            conn.execute(
+                "INSERT INTO Company (CompanyName, CompanyAddress, CompanyEmail, CompanyPhone) VALUES (?, ?, ?, ?)",
+                company,
+            )
+            event_bus.publish_on_commit(conn, RowsWritten("core", "Company", 1))
+
+
+class UserRepository:
+    def has_admin(self) -> bool:
+        return get_connection("core").execute("SELECT 1 FROM Users WHERE UserPrivilegeLevel = 'Admin' LIMIT 1").fetchone() is not None
+
+    def authenticate(self, username: str, password: str) -> bool:
+        cur = get_connection("core").execute(
+            "SELECT 1 FROM Users WHERE UserName = ? AND UserPassword = ? LIMIT 1",
+            (username, password),
+        )
+        return cur.fetchone() is not None
+
+    def is_admin(self, username: str, password: str) -> bool:
+        cur = get_connection("core").execute(
+            """
+            SELECT 1
+            FROM   Users
+            WHERE  UserName = ?
+            AND  UserPassword = ?
+            AND  UserPrivilegeLevel = 'Admin'
+            LIMIT 1;
+            """,
+            (username, password),
+        )
+        return cur.fetchone() is not None
+
+
+patient_repo = PatientRepository()
+provider_repo = ProviderRepository()
+visit_repo = VisitRepository()
+schedule_repo = ScheduleRepository()
+notification_repo = NotificationRepository()
+billing_repo = BillingRepository()
+company_repo = CompanyRepository()
+user_repo = UserRepository()
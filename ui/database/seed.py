@@ -0,0 +1,288 @@
+# ui/database/seed.py
+
+# ---Fills the databases with synthetic, reproducible data for load testing: patients, providers,
+# ---visits with notes and follow-ups, their bills and notifications, upcoming bookings, and the
+# ---company / staff rows in core.db. A given --seed gives the same rows (dates are relative to
+# ---today). Use --db-dir to seed a scratch copy instead of the live files.
+
+
+import argparse
+import random
+import sqlite3
+from collections.abc import Callable, Iterator
+from datetime import date, timedelta
+from pathlib import Path
+from typing import NamedTuple
+
+from ui.config.logger_config import logger
+from ui.database.connection import get_connection, transaction, use_database_dir
+from ui.database.ids import allocate_ids
+from ui.database.init_db_tables import init_databases
+from ui.database.record_visit import PAYMENT_TERMS
+
+DEFAULT_BATCH_SIZE = 5000
+SCHEDULE_HOURS = range(9, 17)
+
+
+class SeedSize(NamedTuple):
+    patients: int
+    visits: int
+    providers: int
+    bookings: int
+
+
+PRESETS: dict[str, SeedSize] = {
+    "10k": SeedSize(10_000, 10_000, 10, 2_000),
+    "100k": SeedSize(100_000, 100_000, 25, 10_000),
+    "1m": SeedSize(1_000_000, 1_000_000, 50, 40_000),
+}
+
+
+class SeedProgress(NamedTuple):
+    table: str
+    done: int
+    total: int
+
+
+class SeedResult(NamedTuple):
+    patients: int
+    providers: int
+    visits: int
+    bookings: int
+    users: int
+
+
+# ---Vocabulary for names and notes
+
+FIRST_NAMES = (
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+    "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Carlos", "Karen",
+    "Daniel", "Lisa", "Matthew", "Nancy", "Anthony", "Sandra", "Mark", "Betty", "Donald", "Ashley",
+    "Aisha", "Mei", "Santiago", "Priya", "Olga", "Kwame", "Yuki", "Fatima", "Liam", "Sofia",
+)  # fmt: skip
+LAST_NAMES = (
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+    "Lee", "Perez", "Thompson", "White", "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson",
+    "Nguyen", "Patel", "Kim", "Okafor", "Ivanova", "Tanaka", "Haddad", "O'Brien", "Schmidt", "Rossi",
+)  # fmt: skip
+COMPLAINTS = (
+    "persistent cough", "lower back pain", "seasonal allergies", "elevated blood pressure", "migraine headaches",
+    "sore throat", "skin rash", "knee pain after running", "fatigue and poor sleep", "follow-up for type 2 diabetes",
+    "ear infection", "heartburn after meals", "annual physical", "sprained ankle", "anxiety symptoms",
+)  # fmt: skip
+FINDINGS = (
+    "vitals within normal limits", "mild inflammation noted", "lungs clear on auscultation", "BP 142/90",
+    "no fever", "tenderness on palpation", "A1C 7.2", "throat culture pending", "range of motion reduced",
+    "weight stable since last visit",
+)  # fmt: skip
+PLANS = (
+    "rest and fluids", "physical therapy twice weekly", "recheck in two weeks", "lab work ordered",
+    "referred to cardiology", "diet and exercise counselling", "x-ray ordered", "continue current medication",
+)  # fmt: skip
+MEDICATIONS = (
+    "amoxicillin 500mg three times daily for 10 days", "ibuprofen 400mg as needed", "lisinopril 10mg daily",
+    "metformin 500mg twice daily", "cetirizine 10mg daily", "omeprazole 20mg before breakfast",
+    "sumatriptan 50mg at onset", "prednisone taper over 6 days",
+)  # fmt: skip
+
+
+def _name(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def _patient(rng: random.Random, today: date) -> tuple[str, str, str, str]:
+    name = _name(rng)
+    dob = today - timedelta(days=rng.randint(365, 95 * 365))
+    phone = f"({rng.randint(200, 989)}) {rng.randint(200, 999)}-{rng.randint(0, 9999):04d}"
+    email = f"{name.lower().replace(' ', '.').replace(chr(39), '')}{rng.randint(1, 9999)}@example.com"
+    return name, dob.isoformat(), phone, email
+
+
+def _notes(rng: random.Random) -> tuple[str, str]:
+    notes = f"Patient presents with {rng.choice(COMPLAINTS)}; {rng.choice(FINDINGS)}. Plan: {rng.choice(PLANS)}."
+    follow_up = f"Rx {rng.choice(MEDICATIONS)}." if rng.random() < 0.6 else ""
+    if rng.random() < 0.3:
+        follow_up += f" Return in {rng.choice((1, 2, 4, 6, 12))} weeks."
+    return notes, follow_up.strip()
+
+
+def _chunks(total: int, size: int) -> Iterator[int]:
+    while total > 0:
+        yield min(size, total)
+        total -= size
+
+
+def seed_core(users: int) -> int:
+    with transaction("core") as conn:
+        if conn.execute("SELECT 1 FROM Company LIMIT 1").fetchone() is None:
+            conn.execute(
+                "INSERT INTO Company (CompanyName, CompanyAddress, CompanyEmail, CompanyPhone) VALUES (?, ?, ?, ?)",
+                ("Synthetic Health Clinic", "1 Test Way, Springfield", "clinic@example.com", "(555) 010-0000"),
+            )
+        start = conn.execute("SELECT COUNT(*) FROM Users").fetchone()[0]
+        conn.executemany(
+            "INSERT INTO Users (UserName, UserEmail, UserPosition, UserPrivilegeLevel, UserPassword) VALUES (?, ?, 'Staff', 'User', 'password')",
+            [(f"staff{n:04d}", f"staff{n:04d}@example.com") for n in range(start + 1, start + users + 1)],
+        )
+    return users
+
+
+def seed_providers(rng: random.Random, count: int) -> list[tuple[str, float]]:
+    with transaction("patients") as conn:
+        ids = allocate_ids(conn, "Provider", count)
+        rows = [(pid, f"Dr. {_name(rng)}", float(rng.choice((75, 90, 100, 120, 150, 200))), rng.choice((None, 8, 12, 16))) for pid in ids]
+        conn.executemany("INSERT INTO Provider (ProviderId, ProviderName, ProviderRate, MaxVisitsPerDay) VALUES (?, ?, ?, ?)", rows)
+    return [(row[0], row[2]) for row in rows]
+
+
+def seed_patients(rng: random.Random, count: int, batch_size: int, progress: Callable[[SeedProgress], None] | None) -> None:
+    today = date.today()
+    done = 0
+    for size in _chunks(count, batch_size):
+        with transaction("patients") as conn:
+            ids = allocate_ids(conn, "Patients", size)
+            conn.executemany(
+                "INSERT INTO Patients (PatientId, PatientName, DOB, PhoneNumber, PatientEmail) VALUES (?, ?, ?, ?, ?)",
+                [(pid, *_patient(rng, today)) for pid in ids],
+            )
+        done += size
+        if progress:
+            progress(SeedProgress("Patients", done, count))
+
+
+def seed_visits(
+    rng: random.Random,
+    count: int,
+    patient_ids: list[str],
+    providers: list[tuple[str, float]],
+    days: int,
+    batch_size: int,
+    progress: Callable[[SeedProgress], None] | None,
+) -> None:
+    # ---Each visit gets its bill (billing.db, attached) and notification in the same transaction,
+    # ---as record_visit() writes them
+    today = date.today()
+    done = 0
+    for size in _chunks(count, batch_size):
+        visits, bills, notifications = [], [], []
+        with transaction("patients") as conn:
+            bill_ids = allocate_ids(conn, "Billing", size)
+            next_visit = conn.execute("SELECT COALESCE(MAX(VisitId), 0) + 1 FROM VisitDetails").fetchone()[0]
+            for offset, bill_id in enumerate(bill_ids):
+                visit_id = next_visit + offset
+                patient_id = rng.choice(patient_ids)
+                provider_id, rate = rng.choice(providers)
+                visit_date = today - timedelta(days=rng.randint(0, days))
+                due_date = (visit_date + PAYMENT_TERMS).isoformat()
+                paid = 1 if due_date < today.isoformat() and rng.random() < 0.8 else 0
+                visits.append((visit_id, patient_id, provider_id, visit_date.isoformat(), *_notes(rng), bill_id))
+                bills.append((bill_id, rate, str(visit_id), due_date, paid))
+                notifications.append(
+                    (f"seed-{bill_id}", patient_id, bill_id, f"{visit_date.isoformat()}T17:00:00", f"Your bill for {visit_date.isoformat()} is due on {due_date}. Please pay {rate}."),
+                )
+            conn.executemany(
+                "INSERT INTO VisitDetails (VisitId, PatientId, ProviderId, VisitDate, VisitNotes, FollowUpDetails, BillId) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                visits,
+            )
+            conn.executemany("INSERT INTO billing.Billing (BillId, BillAmount, VisitId, DueDate, Paid) VALUES (?, ?, ?, ?, ?)", bills)
+            conn.executemany(
+                "INSERT INTO Notification (NotificationId, PatientId, BillId, NotificationDate, Message) VALUES (?, ?, ?, ?, ?)",
+                notifications,
+            )
+        done += size
+        if progress:
+            progress(SeedProgress("VisitDetails", done, count))
+
+
+def seed_bookings(rng: random.Random, count: int, patient_ids: list[str], provider_ids: list[str], days: int) -> int:
+    # ---Distinct (provider, day, slot) cells over the coming days, so the unique key always holds
+    hours = list(SCHEDULE_HOURS)
+    capacity = len(provider_ids) * days * len(hours)
+    count = min(count, capacity // 2)
+    today = date.today()
+    rows = []
+    for cell in rng.sample(range(capacity), count):
+        day, rest = divmod(cell, len(provider_ids) * len(hours))
+        provider_idx, hour_idx = divmod(rest, len(hours))
+        rows.append(
+            (f"seed-{rng.getrandbits(64):016x}", provider_ids[provider_idx], rng.choice(patient_ids), (today + timedelta(days=day)).isoformat(), hours[hour_idx]),
+        )
+    # ---Cells that already hold a booking are skipped
+    with transaction("patients") as conn:
+        cur = conn.executemany(
+            "INSERT OR IGNORE INTO Schedule (ScheduleId, ProviderId, PatientId, ScheduleDate, ScheduleSlot) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+    return cur.rowcount
+
+
+def seed_database(
+    size: SeedSize,
+    seed: int = 0,
+    history_days: int = 3 * 365,
+    booking_days: int = 90,
+    users: int = 10,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    progress: Callable[[SeedProgress], None] | None = None,
+) -> SeedResult:
+    # ---Adds to whatever is already there; visits and bookings also use existing patients
+    rng = random.Random(seed)
+    seed_core(users)
+    providers = seed_providers(rng, size.providers) if size.providers else []
+    seed_patients(rng, size.patients, batch_size, progress)
+
+    conn = get_connection("patients")
+    patient_ids = [row[0] for row in conn.execute("SELECT PatientId FROM Patients")]
+    if not providers:
+        providers = [(row[0], row[1] or 0) for row in conn.execute("SELECT ProviderId, ProviderRate FROM Provider")]
+
+    visits = bookings = 0
+    if patient_ids and providers:
+        seed_visits(rng, size.visits, patient_ids, providers, history_days, batch_size, progress)
+        visits = size.visits
+        bookings = seed_bookings(rng, size.bookings, patient_ids, [p[0] for p in providers], booking_days)
+
+    conn.execute("ANALYZE")
+    return SeedResult(size.patients, len(providers), visits, bookings, users)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Fill the databases with synthetic patients, visits, bills and bookings.")
+    parser.add_argument("--size", choices=sorted(PRESETS), default="10k", help="preset row counts")
+    parser.add_argument("--patients", type=int, default=None, help="override the preset's patient count")
+    parser.add_argument("--visits", type=int, default=None, help="override the preset's visit count")
+    parser.add_argument("--providers", type=int, default=None, help="override the preset's provider count")
+    parser.add_argument("--bookings", type=int, default=None, help="override the preset's booking count")
+    parser.add_argument("--users", type=int, default=10, help="staff logins to add to core.db")
+    parser.add_argument("--seed", type=int, default=0, help="random seed; the same seed gives the same data")
+    parser.add_argument("--db-dir", type=Path, default=None, help="seed databases in this directory instead of the app's")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    preset = PRESETS[args.size]
+    size = SeedSize(
+        preset.patients if args.patients is None else args.patients,
+        preset.visits if args.visits is None else args.visits,
+        preset.providers if args.providers is None else args.providers,
+        preset.bookings if args.bookings is None else args.bookings,
+    )
+
+    if args.db_dir:
+        use_database_dir(args.db_dir)
+    init_databases()
+
+    def report(p: SeedProgress) -> None:
+        print(f"\r{p.table}: {p.done}/{p.total}", end="" if p.done < p.total else "\n", flush=True)
+
+    try:
+        result = seed_database(size, args.seed, users=args.users, batch_size=args.batch_size, progress=report)
+    except sqlite3.Error as e:
+        logger.error(f"Seeding failed: {e}")
+        return 1
+    logger.info(f"Seeded {result.patients} patients, {result.providers} providers, {result.visits} visits, {result.bookings} bookings, {result.users} users")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
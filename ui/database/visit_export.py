@@ -0,0 +1,162 @@
+# ui/database/visit_export.py
+
+# ---Streaming CSV export of visit history.
+# ---Rows go from a single database cursor to disk fetchmany() chunks at a time, so an export of
+# ---the whole practice runs in bounded memory. Output is written to a .part file and renamed on
+# ---success, so a cancelled or failed export never leaves a truncated file behind.
+
+
+import argparse
+import csv
+import gzip
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from datetime import date
+from pathlib import Path
+from typing import NamedTuple
+
+from ui.config.logger_config import logger
+from ui.database.connection import get_connection
+from ui.database.init_db_tables import init_databases
+
+DEFAULT_CHUNK_SIZE = 1000
+
+VISIT_HEADER = ["Visit Date", "Provider Name", "Visit Notes", "Follow Up", "Bill ID", "Amount", "Due Date", "Paid"]
+PATIENT_HEADER = ["Patient ID", "Patient Name"]
+
+
+class ExportProgress(NamedTuple):
+    rows: int
+    total: int
+
+
+class ExportResult(NamedTuple):
+    rows: int
+    path: Path | None
+    cancelled: bool = False
+
+
+def _where(patient_id: str | None, start: date | None, end: date | None) -> tuple[str, list[str]]:
+    clauses: list[str] = []
+    params: list[str] = []
+    if patient_id is not None:
+        clauses.append("vd.PatientId = ?")
+        params.append(patient_id)
+    if start is not None:
+        clauses.append("vd.VisitDate >= ?")
+        params.append(start.isoformat())
+    if end is not None:
+        clauses.append("vd.VisitDate <= ?")
+        params.append(end.isoformat())
+    return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+
+def count_visits(patient_id: str | None = None, start: date | None = None, end: date | None = None) -> int:
+    where, params = _where(patient_id, start, end)
+    return get_connection("patients").execute(f"SELECT COUNT(*) FROM VisitDetails vd {where}", params).fetchone()[0]  # noqa: S608
+
+
+def export_visits(
+    dest: Path,
+    patient_id: str | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    compress: bool | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Callable[[ExportProgress], None] | None = None,
+    cancel: threading.Event | None = None,
+) -> ExportResult:
+    # ---patient_id=None exports every patient, with Patient ID / Patient Name leading each row.
+    # ---compress=None gzips when dest ends in .gz.
+    started = time.perf_counter()
+    dest = Path(dest)
+    if compress is None:
+        compress = dest.suffix.lower() == ".gz"
+    all_patients = patient_id is None
+
+    where, params = _where(patient_id, start, end)
+    total = count_visits(patient_id, start, end)
+
+    # ---ORDER BY follows idx_visits_patient_date, so rows stream without a temp sort
+    cur = get_connection("patients").execute(
+        f"""
+        SELECT {"vd.PatientId, pt.PatientName," if all_patients else ""}
+            vd.VisitDate,
+            p.ProviderName,
+            vd.VisitNotes,
+            vd.FollowUpDetails,
+            vd.BillId,
+            b.BillAmount,
+            b.DueDate,
+            CASE b.Paid WHEN 1 THEN 'Yes' ELSE 'No' END
+        FROM VisitDetails vd
+        {"LEFT JOIN Patients pt ON vd.PatientId = pt.PatientId" if all_patients else ""}
+        LEFT JOIN Provider p ON vd.ProviderId = p.ProviderId
+        LEFT JOIN billing.Billing b ON vd.BillId = b.BillId
+        {where}
+        ORDER BY vd.PatientId, vd.VisitDate
+        """,  # noqa: S608
+        params,
+    )
+
+    part = dest.with_name(f"{dest.name}.part")
+    rows = 0
+    cancelled = False
+    try:
+        opener = gzip.open if compress else open
+        with opener(part, "wt", encoding="utf-8", newline="") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(PATIENT_HEADER + VISIT_HEADER if all_patients else VISIT_HEADER)
+            while chunk := cur.fetchmany(chunk_size):
+                if cancel and cancel.is_set():
+                    cancelled = True
+                    break
+                writer.writerows(chunk)
+                rows += len(chunk)
+                if progress:
+                    progress(ExportProgress(rows, total))
+    except BaseException:
+        part.unlink(missing_ok=True)
+        raise
+    finally:
+        cur.close()
+
+    log = logger.bind(operation="visit_export", duration_ms=round((time.perf_counter() - started) * 1000, 3))
+    if cancelled:
+        part.unlink(missing_ok=True)
+        log.info(f"Visit export to {dest} cancelled after {rows} rows")
+        return ExportResult(rows, None, cancelled=True)
+
+    part.replace(dest)
+    log.info(f"Visit export to {dest}: {rows} rows")
+    return ExportResult(rows, dest)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Export visit history to CSV.")
+    parser.add_argument("dest", type=Path, help="output file; a .gz suffix writes gzip")
+    parser.add_argument("--patient", default=None, help="PatientId to export (default: all patients)")
+    parser.add_argument("--start", type=date.fromisoformat, default=None, help="first visit date, yyyy-mm-dd")
+    parser.add_argument("--end", type=date.fromisoformat, default=None, help="last visit date, yyyy-mm-dd")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    init_databases()
+
+    def report(p: ExportProgress) -> None:
+        print(f"\r{p.rows}/{p.total} rows", end="", flush=True)
+
+    try:
+        result = export_visits(args.dest, args.patient, args.start, args.end, chunk_size=args.chunk_size, progress=report)
+    except (OSError, sqlite3.Error) as e:
+        logger.error(f"Visit export failed: {e}")
+        return 1
+    print()
+    print(f"Exported {result.rows} visits to {result.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
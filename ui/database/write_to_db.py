@@ -1,28 +1,143 @@
+# ui/database/write_to_db.py
+
+# ---Generic INSERTs for tables without a repository method. write_to_database() writes one row;
+# ---write_many() streams any number of rows through executemany, committing every chunk_size
+# ---rows. Columns are checked against the table once per (database, table, columns), and the
+# ---INSERT text is built once for that key too, so sqlite3's per-connection statement cache
+# ---hands back the same prepared statement on every call.
+
+
 import sqlite3
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from functools import lru_cache
+from typing import Any
 
 from ui.config.logger_config import logger
-from ui.config.paths import BILLING_DB, CORE_DB, PATIENT_DB
+from ui.database.connection import DB_MAP, get_connection, transaction
+from ui.database.events import RowsWritten, event_bus
+
+DEFAULT_CHUNK_SIZE = 1000
+
+type Row = Mapping[str, Any] | Sequence[Any]
 
-DB_MAP = {
-    "core": CORE_DB,
-    "patients": PATIENT_DB,
-    "billing": BILLING_DB,
-}
 
 def write_to_database(db_key: str, table: str, data: dict) -> bool:
-    db_path = DB_MAP.get(db_key)
-    if not db_path or not data:
+    if db_key not in DB_MAP or not data:
         return False
 
     try:
-        with sqlite3.connect(str(db_path)) as conn:
-            cursor = conn.cursor()
-            columns = ", ".join(data.keys())
-            placeholders = ", ".join(["?"] * len(data))
-            values = tuple(data.values())
-            cursor.execute(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})", values)  # noqa: S608
-            conn.commit()
+        sql = insert_statement(db_key, table, tuple(data))
+        with transaction(db_key) as conn:
+            conn.execute(sql, tuple(data.values()))
+            event_bus.publish_on_commit(conn, RowsWritten(db_key, table, 1))
         return True
     except Exception as e:
         logger.error(f"Error writing to {table} in {db_key} db: {e}")
         return False
+
+
+def write_many(
+    db_key: str,
+    table: str,
+    rows: Iterable[Row],
+    columns: Sequence[str] | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    or_ignore: bool = False,
+) -> int:
+    # ---Rows are dicts keyed by column, or sequences in the order of `columns`. Without `columns`
+    # ---the first row's keys are used, and every dict row must carry exactly those keys.
+    # ---Each chunk commits on its own (or joins the caller's transaction as a savepoint), so a
+    # ---failure raises with the earlier chunks kept. Returns the rows inserted; with or_ignore,
+    # ---rows skipped by a constraint are not counted.
+    if db_key not in DB_MAP:
+        raise KeyError(f"Unknown database: {db_key}")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    iterator = iter(rows)
+    first = next(iterator, None)
+    if first is None:
+        return 0
+    if columns is None:
+        if not isinstance(first, Mapping):
+            raise ValueError("columns are required when rows are sequences")
+        columns = tuple(first)
+    columns = tuple(columns)
+    sql = insert_statement(db_key, table, columns, or_ignore)
+
+    to_values = _row_values(columns)
+    written = 0
+    chunk = [to_values(first)]
+    for row in iterator:
+        chunk.append(to_values(row))
+        if len(chunk) >= chunk_size:
+            written += _write_chunk(db_key, table, sql, chunk)
+            chunk = []
+    if chunk:
+        written += _write_chunk(db_key, table, sql, chunk)
+    return written
+
+
+def _write_chunk(db_key: str, table: str, sql: str, chunk: list[Sequence[Any]]) -> int:
+    try:
+        with transaction(db_key) as conn:
+            count = conn.executemany(sql, chunk).rowcount
+            if count:
+                event_bus.publish_on_commit(conn, RowsWritten(db_key, table, count))
+    except sqlite3.Error as e:
+        logger.error(f"Error writing {len(chunk)} rows to {table} in {db_key} db: {e}")
+        raise
+    return count
+
+
+def _row_values(columns: tuple[str, ...]) -> Callable[[Row], Sequence[Any]]:
+    expected = frozenset(columns)
+
+    def to_values(row: Row) -> Sequence[Any]:
+        if isinstance(row, Mapping):
+            if row.keys() != expected:
+                raise ValueError(f"Row columns {sorted(row)} do not match {sorted(columns)}")
+            return tuple(row[column] for column in columns)
+        if len(row) != len(columns):
+            raise ValueError(f"Row has {len(row)} values for {len(columns)} columns")
+        return row
+
+    return to_values
+
+
+def insert_statement(db_key: str, table: str, columns: tuple[str, ...], or_ignore: bool = False) -> str:
+    # ---DB_MAP is part of the key so a repointed database (use_database_dir) is checked afresh
+    return _insert_statement(str(DB_MAP[db_key]), db_key, table, columns, or_ignore)
+
+
+@lru_cache(maxsize=256)
+def _insert_statement(_path: str, db_key: str, table: str, columns: tuple[str, ...], or_ignore: bool) -> str:
+    if not columns:
+        raise ValueError("No columns to insert")
+    if len(set(columns)) != len(columns):
+        raise ValueError(f"Duplicate columns for {table}: {list(columns)}")
+    if not all(column.isidentifier() for column in columns):
+        raise ValueError(f"Invalid column names for {table}: {list(columns)}")
+
+    known = table_columns(db_key, table)
+    unknown = [column for column in columns if column not in known]
+    if unknown:
+        raise ValueError(f"Unknown columns for {table}: {unknown}")
+
+    schema, _, name = table.rpartition(".")
+    target = f'"{schema}"."{name}"' if schema else f'"{name}"'
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    placeholders = ", ".join(["?"] * len(columns))
+    verb = "INSERT OR IGNORE" if or_ignore else "INSERT"
+    return f"{verb} INTO {target} ({column_list}) VALUES ({placeholders})"
+
+
+def table_columns(db_key: str, table: str) -> frozenset[str]:
+    # ---`table` may be schema-qualified for attached databases, e.g. "billing.Billing"
+    schema, _, name = table.rpartition(".")
+    if not name.isidentifier() or (schema and not schema.isidentifier()):
+        raise ValueError(f"Invalid table name: {table!r}")
+    rows = get_connection(db_key).execute(f'PRAGMA "{schema or "main"}".table_info("{name}")').fetchall()
+    if not rows:
+        raise ValueError(f"Unknown table {table} in {db_key} db")
+    return frozenset(row[1] for row in rows)
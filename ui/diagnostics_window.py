@@ -0,0 +1,157 @@
+# diagnostics_window.py
+
+from datetime import datetime
+from pathlib import Path
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QShowEvent
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QCheckBox,
+    QDoubleSpinBox,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QMessageBox,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from ui.config.logger_config import logger, logging_to_files
+from ui.config.paths import SLOW_QUERY_LOG
+from ui.database.query_stats import BUCKETS_MS, QueryStat, query_stats
+
+
+class DiagnosticsWindow(QWidget):
+    # ---Admin only: per-statement SQL timings collected since start-up (or the last reset)
+
+    # ---(header, QueryStat field)
+    COLUMNS = [  # noqa: RUF012
+        ("Statement", "statement"),
+        ("Calls", "calls"),
+        ("Rows", "rows"),
+        ("Mean ms", "mean_ms"),
+        ("p50 ms", "p50_ms"),
+        ("p95 ms", "p95_ms"),
+        ("Max ms", "max_ms"),
+        ("Total ms", "total_ms"),
+        ("Slow", "slow_calls"),
+        ("Histogram", "histogram"),
+        ("Last Called From", "last_site"),
+    ]
+
+    def __init__(self, parent=None) -> None:  # noqa: ANN001
+        super().__init__(parent)
+        self.setWindowTitle("Diagnostics")
+        self.setObjectName("SubWindow")
+
+        main_layout = QVBoxLayout(self)
+
+        # ---Controls
+        controls = QHBoxLayout()
+        # ---Off by default: timing every row roughly doubles the cost of each statement. Slow
+        # ---statements are logged either way
+        self.enabled_check = QCheckBox("Record query timings", self)
+        self.enabled_check.setChecked(query_stats.enabled)
+        self.enabled_check.toggled.connect(self._set_enabled)
+        controls.addWidget(self.enabled_check)
+        controls.addWidget(QLabel("Slow query threshold (ms):", self))
+        self.threshold_input = QDoubleSpinBox(self)
+        self.threshold_input.setRange(1, 60_000)
+        self.threshold_input.setDecimals(0)
+        self.threshold_input.setValue(query_stats.slow_query_ms)
+        self.threshold_input.valueChanged.connect(self._set_threshold)
+        controls.addWidget(self.threshold_input)
+        controls.addStretch()
+
+        self.refresh_button = QPushButton("Refresh", self)
+        self.refresh_button.clicked.connect(self.refresh)
+        controls.addWidget(self.refresh_button)
+
+        self.reset_button = QPushButton("Reset", self)
+        self.reset_button.clicked.connect(self._reset)
+        controls.addWidget(self.reset_button)
+
+        self.dump_button = QPushButton("Dump JSON", self)
+        self.dump_button.clicked.connect(self._dump_json)
+        controls.addWidget(self.dump_button)
+        main_layout.addLayout(controls)
+
+        self.summary_label = QLabel(self)
+        main_layout.addWidget(self.summary_label)
+
+        # ---Statement table, most total time first
+        self.table = QTableWidget(0, len(self.COLUMNS), self)
+        self.table.setHorizontalHeaderLabels([header for header, _ in self.COLUMNS])
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setWordWrap(False)
+        self.table.verticalHeader().setVisible(False)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        histogram_col = next(col for col, (_, field) in enumerate(self.COLUMNS) if field == "histogram")
+        self.table.horizontalHeaderItem(histogram_col).setToolTip("Calls per bucket, up to: " + ", ".join(f"{b} ms" for b in BUCKETS_MS) + ", slower")
+        main_layout.addWidget(self.table)
+
+        if logging_to_files():
+            main_layout.addWidget(QLabel(f"Slow queries are also written to {SLOW_QUERY_LOG}", self))
+
+    def showEvent(self, event: QShowEvent) -> None:  # noqa: N802
+        # ---The numbers move with every query, so re-read them whenever the screen is shown
+        super().showEvent(event)
+        self.refresh()
+
+    def refresh(self) -> None:
+        stats = query_stats.snapshot()
+        self.table.setRowCount(len(stats))
+        for row, stat in enumerate(stats):
+            for col, (_, field) in enumerate(self.COLUMNS):
+                self.table.setItem(row, col, self._item(stat, field))
+
+        calls = sum(s.calls for s in stats)
+        total_ms = sum(s.total_ms for s in stats)
+        slow = sum(s.slow_calls for s in stats)
+        since = query_stats.started.strftime("%Y-%m-%d %H:%M:%S")
+        self.summary_label.setText(
+            f"{len(stats)} statements, {calls} calls, {total_ms:.1f} ms total, {slow} slow since {since}"
+            + ("" if query_stats.enabled else " (recording is off; slow queries are still logged)")
+        )
+
+    def _item(self, stat: QueryStat, field: str) -> QTableWidgetItem:
+        value = getattr(stat, field)
+        if field == "histogram":
+            item = QTableWidgetItem(" ".join(str(n) for n in value))
+        elif isinstance(value, float):
+            item = QTableWidgetItem(f"{value:.2f}")
+        else:
+            item = QTableWidgetItem(str(value))
+        if isinstance(value, (int, float)):
+            item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        if field == "statement":
+            item.setToolTip(stat.statement)
+        return item
+
+    def _set_enabled(self, enabled: bool) -> None:
+        query_stats.enabled = enabled
+        self.refresh()
+
+    def _set_threshold(self, value: float) -> None:
+        query_stats.slow_query_ms = value
+
+    def _reset(self) -> None:
+        query_stats.reset()
+        self.refresh()
+
+    def _dump_json(self) -> None:
+        path = Path.home() / "Desktop" / f"query_stats_{datetime.now():%Y%m%d_%H%M%S}.json"  # noqa: DTZ005
+        try:
+            query_stats.dump_json(path)
+        except OSError as e:
+            logger.error(f"Failed to write query stats to {path}: {e}")
+            QMessageBox.critical(self, "Dump Failed", f"Could not write {path}.")
+            return
+        QMessageBox.information(self, "Dump Complete", f"Query statistics written to:\n{path}", QMessageBox.StandardButton.Ok)
@@ -0,0 +1,166 @@
+# find_slot_dialog.py
+
+from datetime import date
+
+from PySide6.QtCore import QDate, Qt
+from PySide6.QtWidgets import (
+    QCheckBox,
+    QComboBox,
+    QDateEdit,
+    QDialog,
+    QDialogButtonBox,
+    QFormLayout,
+    QHBoxLayout,
+    QListWidget,
+    QListWidgetItem,
+    QMessageBox,
+    QPushButton,
+    QSpinBox,
+    QVBoxLayout,
+)
+
+from ui.database.availability import OpenSlot, find_available_slots
+from ui.database.reference_cache import reference_cache
+from ui.util.async_query import busy_bar, query_pool
+from ui.util.resize_window import size_and_center_window
+
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+class FindSlotDialog(QDialog):
+    def __init__(self, hours: range, parent=None) -> None:  # noqa: ANN001
+        super().__init__(parent)
+        self.setWindowTitle("Find Next Available")
+        self.setObjectName("SubWindow")
+        size_and_center_window(self, 0.40, 0.55)
+
+        self.hours = hours
+        self.selected_slot: OpenSlot | None = None
+        self._slots: list[OpenSlot] = []
+        self.providers = reference_cache.providers()
+
+        form_layout = QFormLayout()
+
+        self.provider_combo = QComboBox(self)
+        self.provider_combo.addItem("Any provider", None)
+        for provider in self.providers:
+            self.provider_combo.addItem(provider.name, provider.provider_id)
+        form_layout.addRow("Provider:", self.provider_combo)
+
+        self.from_date = QDateEdit(self)
+        self.from_date.setCalendarPopup(True)
+        self.from_date.setDate(QDate.currentDate())
+        self.to_date = QDateEdit(self)
+        self.to_date.setCalendarPopup(True)
+        self.to_date.setDate(QDate.currentDate().addYears(1))
+        form_layout.addRow("From:", self.from_date)
+        form_layout.addRow("To:", self.to_date)
+
+        hour_row = QHBoxLayout()
+        self.from_hour = QComboBox(self)
+        self.to_hour = QComboBox(self)
+        for h in hours:
+            self.from_hour.addItem(f"{h % 12 or 12}:00 {'AM' if h < 12 else 'PM'}", h)
+            self.to_hour.addItem(f"{(h + 1) % 12 or 12}:00 {'AM' if h + 1 < 12 else 'PM'}", h + 1)
+        self.to_hour.setCurrentIndex(self.to_hour.count() - 1)
+        hour_row.addWidget(self.from_hour)
+        hour_row.addWidget(self.to_hour)
+        form_layout.addRow("Between:", hour_row)
+
+        day_row = QHBoxLayout()
+        self.day_checks: list[QCheckBox] = []
+        for i, label in enumerate(WEEKDAYS):
+            check = QCheckBox(label, self)
+            check.setChecked(i < 5)
+            self.day_checks.append(check)
+            day_row.addWidget(check)
+        form_layout.addRow("Days:", day_row)
+
+        self.count_spin = QSpinBox(self)
+        self.count_spin.setRange(1, 100)
+        self.count_spin.setValue(10)
+        form_layout.addRow("Show:", self.count_spin)
+
+        main_layout = QVBoxLayout(self)
+        main_layout.addLayout(form_layout)
+
+        self.search_button = QPushButton("Search", self)
+        self.search_button.clicked.connect(self._search)
+        main_layout.addWidget(self.search_button, alignment=Qt.AlignmentFlag.AlignHCenter)
+
+        self.busy = busy_bar(self)
+        self._search_key = f"find_slot.{id(self)}"
+        main_layout.addWidget(self.busy)
+
+        self.results = QListWidget(self)
+        self.results.itemDoubleClicked.connect(lambda _item: self.accept())
+        main_layout.addWidget(self.results)
+
+        self.button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        self.button_box.setObjectName("SetupBTN")
+        self.button_box.accepted.connect(self.accept)
+        self.button_box.rejected.connect(self.reject)
+        main_layout.addWidget(self.button_box)
+
+    @staticmethod
+    def _to_date(value: QDate) -> date:
+        return date(value.year(), value.month(), value.day())
+
+    def _search(self) -> None:
+        provider_id = self.provider_combo.currentData()
+        start_hour = self.from_hour.currentData()
+        end_hour = self.to_hour.currentData()
+        if end_hour <= start_hour:
+            QMessageBox.warning(self, "Input Error", "End time must be after start time.")
+            return
+        weekdays = [i + 1 for i, check in enumerate(self.day_checks) if check.isChecked()]
+        if not weekdays:
+            QMessageBox.warning(self, "Input Error", "Select at least one day of the week.")
+            return
+
+        self.busy.setVisible(True)
+        self.search_button.setEnabled(False)
+        query_pool.submit(
+            find_available_slots,
+            self._to_date(self.from_date.date()),
+            self._to_date(self.to_date.date()),
+            None if provider_id is None else [provider_id],
+            range(start_hour, end_hour),
+            weekdays,
+            self.count_spin.value(),
+            self.providers,
+            on_result=self._show_slots,
+            on_error=self._search_failed,
+            key=self._search_key,
+        )
+
+    def _search_failed(self, error: Exception) -> None:
+        self.busy.setVisible(False)
+        self.search_button.setEnabled(True)
+        QMessageBox.warning(self, "Search Error", f"Could not search for open slots:\n{error}")
+
+    def _show_slots(self, slots: list[OpenSlot]) -> None:
+        self.busy.setVisible(False)
+        self.search_button.setEnabled(True)
+        self.results.clear()
+        self._slots = slots
+        for i, slot in enumerate(slots):
+            label = f"{slot.slot_date:%a %m/%d/%Y}  {slot.hour % 12 or 12}:00 {'AM' if slot.hour < 12 else 'PM'}  -  {slot.provider_name}"
+            item = QListWidgetItem(label, self.results)
+            item.setData(Qt.ItemDataRole.UserRole, i)
+        if not slots:
+            self.results.addItem("No open slots match these constraints.")
+
+    def done(self, result: int) -> None:
+        # ---A search still running when the dialog closes is dropped
+        query_pool.cancel(self._search_key)
+        super().done(result)
+
+    def accept(self) -> None:
+        item = self.results.currentItem()
+        pos = item.data(Qt.ItemDataRole.UserRole) if item else None
+        if pos is None:
+            QMessageBox.warning(self, "Input Error", "Select a slot from the results.")
+            return
+        self.selected_slot = self._slots[pos]
+        super().accept()
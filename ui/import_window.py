@@ -0,0 +1,145 @@
+# import_window.py
+
+import threading
+from pathlib import Path
+
+from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtWidgets import (
+    QFileDialog,
+    QHBoxLayout,
+    QLabel,
+    QMessageBox,
+    QProgressBar,
+    QPushButton,
+    QVBoxLayout,
+    QWidget,
+)
+
+from ui.config.logger_config import logger
+from ui.database.connection import close_connections
+from ui.database.patient_import import ImportProgress, ImportResult, import_patients
+
+
+class _ImportWorker(QThread):
+    progressed = Signal(object)  # ---ImportProgress
+    completed = Signal(object)  # ---ImportResult
+    failed = Signal(str)
+
+    def __init__(self, source: Path, parent=None) -> None:  # noqa: ANN001
+        super().__init__(parent)
+        self.source = source
+        self.cancel_event = threading.Event()
+
+    def run(self) -> None:
+        try:
+            result = import_patients(self.source, progress=self.progressed.emit, cancel=self.cancel_event)
+            self.completed.emit(result)
+        except Exception as e:
+            logger.error(f"Patient import from {self.source} failed: {e}")
+            self.failed.emit(str(e))
+        finally:
+            close_connections()
+
+
+class ImportPatientsWindow(QWidget):
+    def __init__(self, parent=None) -> None:  # noqa: ANN001
+        super().__init__(parent)
+        self.setWindowTitle("Import Patients")
+        self.setObjectName("SubWindow")
+
+        self.source: Path | None = None
+        self.worker: _ImportWorker | None = None
+
+        main_layout = QVBoxLayout(self)
+
+        container = QWidget(self)
+        container_layout = QVBoxLayout(container)
+        container_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        # ---File selection
+        file_row = QHBoxLayout()
+        self.file_label = QLabel("No file selected (CSV with header, or JSONL)", self)
+        self.browse_button = QPushButton("Choose File", self)
+        self.browse_button.clicked.connect(self._choose_file)
+        file_row.addWidget(self.file_label, 1)
+        file_row.addWidget(self.browse_button)
+        container_layout.addLayout(file_row)
+
+        # ---Progress
+        self.progress_bar = QProgressBar(self)
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        container_layout.addWidget(self.progress_bar)
+
+        self.status_label = QLabel("", self)
+        container_layout.addWidget(self.status_label)
+
+        # ---Start / Cancel
+        button_row = QHBoxLayout()
+        self.start_button = QPushButton("Import", self)
+        self.start_button.setEnabled(False)
+        self.start_button.clicked.connect(self._start_import)
+        self.cancel_button = QPushButton("Cancel", self)
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self._cancel_import)
+        button_row.addWidget(self.start_button)
+        button_row.addWidget(self.cancel_button)
+        container_layout.addLayout(button_row)
+
+        main_layout.addWidget(container)
+
+    def _choose_file(self) -> None:
+        path, _ = QFileDialog.getOpenFileName(self, "Select Patient File", str(Path.home()), "Patient files (*.csv *.jsonl *.ndjson);;All files (*)")
+        if not path:
+            return
+        self.source = Path(path)
+        self.file_label.setText(str(self.source))
+        self.start_button.setEnabled(True)
+        self.progress_bar.setValue(0)
+        self.status_label.clear()
+
+    def _start_import(self) -> None:
+        if self.source is None or self.worker is not None:
+            return
+
+        self.worker = _ImportWorker(self.source, self)
+        self.worker.progressed.connect(self._on_progress)
+        self.worker.completed.connect(self._on_completed)
+        self.worker.failed.connect(self._on_failed)
+        self.worker.finished.connect(self._on_finished)
+
+        self.start_button.setEnabled(False)
+        self.browse_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.status_label.setText("Importing...")
+        self.worker.start()
+
+    def _cancel_import(self) -> None:
+        if self.worker is not None:
+            self.worker.cancel_event.set()
+            self.cancel_button.setEnabled(False)
+            self.status_label.setText("Cancelling...")
+
+    def _on_progress(self, progress: ImportProgress) -> None:
+        if progress.total_bytes:
+            self.progress_bar.setValue(int(progress.bytes_read * 100 / progress.total_bytes))
+        self.status_label.setText(f"{progress.rows} rows read, {progress.imported} imported, {progress.rejected} rejected")
+
+    def _on_completed(self, result: ImportResult) -> None:
+        message = f"{result.imported} patients imported, {result.rejected} rejected."
+        if result.cancelled:
+            message = "Import cancelled. " + message
+        if result.reject_path:
+            message += f"\nRejected rows written to:\n{result.reject_path}"
+        self.status_label.setText(message)
+        QMessageBox.information(self, "Import Finished", message)
+
+    def _on_failed(self, error: str) -> None:
+        self.status_label.setText("Import failed.")
+        QMessageBox.critical(self, "Import Failed", f"Could not import patients:\n{error}")
+
+    def _on_finished(self) -> None:
+        self.worker = None
+        self.browse_button.setEnabled(True)
+        self.start_button.setEnabled(self.source is not None)
+        self.cancel_button.setEnabled(False)
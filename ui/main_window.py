@@ -1,6 +1,5 @@
 from collections.abc import Callable
 
-from PySide6.QtGui import QBrush, QPalette, QPixmap
 from PySide6.QtWidgets import (
     QApplication,
     QHBoxLayout,
@@ -12,20 +11,32 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from ui.new_patients import NewPatientWindow
-from ui.reports_window import ReportsWindow
-from ui.schedule_window import Schedule
-from ui.update_providers import UpdateProvidersWindow
-from ui.visit_details import VisitDetailsWindow
+from ui.config.paths import ROOT_BACKGROUND
+from ui.database.events import RowsWritten, event_bus
+from ui.util.backgrounds import apply_background
+from ui.window_registry import WindowRegistry, lazy
 from ui.working_area import WorkingArea
 
 
 class MainWindow(QMainWindow):
-    def __init__(self, root: QApplication, company_name: str, user_name: str, parent=None) -> None:  # noqa: ANN001
+    MAX_HEAVY_WINDOWS = 2  # ---report / overview / search screens kept alive at once
+
+    # ---Tables behind each registry topic. Screens apply specific events (new provider, visit,
+    # ---booking) themselves; generic writes to these tables mark them for a refresh instead.
+    TABLE_TOPICS = {  # noqa: RUF012
+        "Provider": "providers",
+        "VisitDetails": "visits",
+        "Billing": "visits",
+    }
+
+    def __init__(self, root: QApplication, company_name: str, user_name: str, is_admin: bool = False, parent=None) -> None:  # noqa: ANN001
         super().__init__(parent)
 
         self.root = root  # ---Main Application
+        self.is_admin = is_admin
         self.working_area = WorkingArea(self)
+        self.windows = self._build_registry()
+        event_bus.subscribe(RowsWritten, self._on_rows_written)
 
         self.company_name = company_name
         self.user_name = user_name
@@ -45,11 +56,8 @@ class MainWindow(QMainWindow):
         main_layout = QHBoxLayout(root_widget)
         self.setCentralWidget(root_widget)
 
-        # ---Set the background image
-        pixmap = QPixmap("ui/resources/gooddr.png")
-        palette = self.palette()
-        palette.setBrush(QPalette.ColorRole.Window, QBrush(pixmap))
-        self.setPalette(palette)
+        # ---Set the background image, scaled to the window and rescaled as it resizes
+        apply_background(self, ROOT_BACKGROUND)
 
         # ---Widget for sidebar btns.
         sidebar_widget: QWidget = QWidget(self)
@@ -70,6 +78,29 @@ class MainWindow(QMainWindow):
         main_layout.addWidget(sidebar_widget, 1)
         main_layout.addWidget(self.working_area, 5)
 
+    # ******************************************************************************************
+    #  / Sub Windows
+    # ******************************************************************************************
+
+    def _build_registry(self) -> WindowRegistry:
+        # ---Each screen is imported and built on first use and kept; "depends" names the data it displays
+        registry = WindowRegistry(self.working_area, self, max_heavy=self.MAX_HEAVY_WINDOWS)
+        registry.register("new_patient", lazy("ui.new_patients", "NewPatientWindow"))
+        registry.register("import_patients", lazy("ui.import_window", "ImportPatientsWindow"))
+        registry.register("add_visit_details", lazy("ui.visit_details", "VisitDetailsWindow"), depends=("providers",))
+        registry.register("schedule", lazy("ui.schedule_window", "Schedule"), depends=("providers",))
+        registry.register("schedule_overview", lazy("ui.schedule_overview", "ScheduleOverviewWindow"), heavy=True, depends=("providers",))
+        registry.register("reports", lazy("ui.reports_window", "ReportsWindow"), heavy=True, depends=("visits",))
+        registry.register("notes_search", lazy("ui.notes_search_window", "NotesSearchWindow"), heavy=True, depends=("providers",))
+        registry.register("update_providers", lazy("ui.update_providers", "UpdateProvidersWindow"))
+        registry.register("diagnostics", lazy("ui.diagnostics_window", "DiagnosticsWindow"))
+        return registry
+
+    def _on_rows_written(self, event: RowsWritten) -> None:
+        topic = self.TABLE_TOPICS.get(event.table)
+        if topic is not None:
+            self.windows.invalidate(topic)
+
     # ******************************************************************************************
     #  / Handle Buttons
     # ******************************************************************************************
@@ -87,11 +118,16 @@ class MainWindow(QMainWindow):
         # ---Add sidebar buttons to the layout with functions
         buttons_info: list[tuple[str, Callable[[], None]]] = [
             ("Patient Onboarding", self._open_new_patient_portal),
+            ("Import Patients", self._open_import_patients),
             ("Add Visit Details", self._open_add_visit_details),
             ("Schedule", self._open_schedule_window),
+            ("Schedule Overview", self._open_schedule_overview),
             ("Reports", self._open_reports_window),
+            ("Search Notes", self._open_notes_search),
             ("Update Providers", self._open_update_providers),
         ]
+        if self.is_admin:
+            buttons_info.append(("Diagnostics", self._open_diagnostics))
 
         for btn_label, function in buttons_info:
             sidebar_layout.addWidget(self._build_button(btn_label, function))
@@ -100,26 +136,29 @@ class MainWindow(QMainWindow):
         print("btn clicked...")
 
     def _open_new_patient_portal(self) -> None:
-        self.new_patients_window = NewPatientWindow(self)
-        self.working_area.addWidget(self.new_patients_window)
-        self.working_area.setCurrentWidget(self.new_patients_window)
+        self.windows.show("new_patient")
+
+    def _open_import_patients(self) -> None:
+        self.windows.show("import_patients")
 
     def _open_add_visit_details(self) -> None:
-        self.add_visit_details = VisitDetailsWindow(self)
-        self.working_area.addWidget(self.add_visit_details)
-        self.working_area.setCurrentWidget(self.add_visit_details)
+        self.windows.show("add_visit_details")
 
     def _open_schedule_window(self) -> None:
-        self.schedule = Schedule(self)
-        self.working_area.addWidget(self.schedule)
-        self.working_area.setCurrentWidget(self.schedule)
+        self.windows.show("schedule")
+
+    def _open_schedule_overview(self) -> None:
+        self.windows.show("schedule_overview")
 
     def _open_reports_window(self) -> None:
-        self.reports = ReportsWindow(self)
-        self.working_area.addWidget(self.reports)
-        self.working_area.setCurrentWidget(self.reports)
+        self.windows.show("reports")
+
+    def _open_notes_search(self) -> None:
+        self.windows.show("notes_search")
 
     def _open_update_providers(self) -> None:
-        self.update_providers = UpdateProvidersWindow(self)
-        self.working_area.addWidget(self.update_providers)
-        self.working_area.setCurrentWidget(self.update_providers)
+        self.windows.show("update_providers")
+
+    def _open_diagnostics(self) -> None:
+        if self.is_admin:
+            self.windows.show("diagnostics")
@@ -1,8 +1,5 @@
 # new_patients.py
 
-import sqlite3
-
-import simplematch as sm
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
     QDialogButtonBox,
@@ -14,9 +11,9 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from ui.config.logger_config import logger
-from ui.config.paths import PATIENT_DB
-from ui.database.write_to_db import write_to_database
+from ui.services.errors import ServiceError
+from ui.services.patients import onboard_patient
+from ui.util.async_query import busy_bar, query_pool
 
 
 class NewPatientWindow(QWidget):
@@ -55,98 +52,41 @@ class NewPatientWindow(QWidget):
         # self.button_box.rejected.connect(self.reject)
         container_layout.addWidget(self.button_box, alignment=Qt.AlignmentFlag.AlignHCenter)
 
+        self.busy = busy_bar(self)
+        self._save_key = f"new_patient.save.{id(self)}"
+        container_layout.addWidget(self.busy)
+
         main_layout.addWidget(container)
 
     def accept(self) -> None:
-        name = self.patient_name_input.text().strip()
-        dob = self.patient_dob_input.text().strip()
-        phone = self.patient_phone_number.text().strip()
-        email = self.patient_email.text().strip()
-
-        if not name:
-            QMessageBox.warning(self, "Input Error", "Name is required.")
-            return
-
-        if not dob:
-            QMessageBox.warning(self, "Input Error", "Address is required.")
-            return
-
-        # ---Validate dob format.
-        dob_pattern = "{year}-{month}-{day}"
-        match_result = sm.match(dob_pattern, dob)
-        if not match_result:
-            QMessageBox.warning(self, "Invalid Input", "DOB must be in the format of yyyy-mm-dd.")
-            return
-
-        # ---Ensure that 'year', 'month', and 'day' are all digits
-        if not all(match_result.get(part, "").isdigit() for part in ("year", "month", "day")):
-            QMessageBox.warning(self, "Invalid Input", "DOB components must be numeric.")
-            return
-
-        if not phone:
-            QMessageBox.warning(self, "Input Error", "Phone is required.")
-            return
-
-        # ---Validate company phone format using simplematch with expected pattern: (###) ###-####
-        phone_pattern = "({area}) {prefix}-{line}"
-        match_result = sm.match(phone_pattern, phone)
-        if not match_result:
-            QMessageBox.warning(self, "Invalid Input", "Phone must be in the format (###) ###-####.")
-            return
-
-        if not email:
-            QMessageBox.warning(self, "Input Error", "Email is required.")
-            return
-
-        # ---Validate Email, expected pattern: username@domain
-        email_pattern = "{username}@{domain}"
-        email_result = sm.match(email_pattern, email)
-        if not email_result:
-            QMessageBox.warning(self, "Invalid Input", "Email must be in the format username@domain.")
-            return
-
-        # ---Ensure the domain contains a period (e.g., yahoo.com)
-        if "." not in email_result.get("domain", ""):
-            QMessageBox.warning(self, "Invalid Input", "Email domain must contain a period (e.g., yahoo.com).")
-            return
-
-        # ---Verify that each input contains the correct number of digits and only digits
-        if len(match_result.get("area", "")) != 3 or not match_result["area"].isdigit():
-            QMessageBox.warning(self, "Invalid Input", "Area code must be exactly 3 digits.")
-            return
-        if len(match_result.get("prefix", "")) != 3 or not match_result["prefix"].isdigit():
-            QMessageBox.warning(self, "Invalid Input", "Prefix must be exactly 3 digits.")
-            return
-        if len(match_result.get("line", "")) != 4 or not match_result["line"].isdigit():
-            QMessageBox.warning(self, "Invalid Input", "Line number must be exactly 4 digits.")
-            return
-
-        try:
-            with sqlite3.connect(PATIENT_DB) as conn:
-                cursor = conn.cursor()
-            patient_count = cursor.execute("SELECT COUNT(*) FROM Patients").fetchone()[0]
-
-            patient_id = patient_count + 1
-
-            patient_data = {
-                "PatientId": patient_id,
-                "PatientName": name,
-                "DOB": dob,
-                "PhoneNumber": phone,
-                "PatientEmail": email,
-            }
-
-            success = write_to_database("patients", "Patients", patient_data)
-            if not success:
-                QMessageBox.critical(self, "Error", "Failed to save company info to database.")
-                return
-
-            QMessageBox.information(self, "Success", "Patient Added.", QMessageBox.StandardButton.Ok)
-            self._clear_inputs()
-
-        except Exception as e:
-            logger.error(f"Error saving setup configuration to SQLite: {e}")
-            return
+        # ---Saved on the query pool so a database locked by another desk cannot freeze the window
+        self._set_saving(True)
+        query_pool.submit(
+            onboard_patient,
+            self.patient_name_input.text(),
+            self.patient_dob_input.text(),
+            self.patient_phone_number.text(),
+            self.patient_email.text(),
+            on_result=self._patient_added,
+            on_error=self._save_failed,
+            key=self._save_key,
+        )
+
+    def _set_saving(self, saving: bool) -> None:
+        self.busy.setVisible(saving)
+        self.button_box.setEnabled(not saving)
+
+    def _patient_added(self, _patient_id: str) -> None:
+        self._set_saving(False)
+        QMessageBox.information(self, "Success", "Patient Added.", QMessageBox.StandardButton.Ok)
+        self._clear_inputs()
+
+    def _save_failed(self, error: Exception) -> None:
+        self._set_saving(False)
+        if isinstance(error, ServiceError):
+            QMessageBox.warning(self, error.title, error.message)
+        else:
+            QMessageBox.critical(self, "Error", "Failed to save the patient to the database.")
 
     def _clear_inputs(self) -> None:
         for child in self.findChildren(QLineEdit):
@@ -0,0 +1,153 @@
+# notes_search_window.py
+
+import html
+from datetime import date
+
+from PySide6.QtCore import QDate
+from PySide6.QtWidgets import (
+    QCheckBox,
+    QComboBox,
+    QDateEdit,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QMessageBox,
+    QPushButton,
+    QTextBrowser,
+    QVBoxLayout,
+    QWidget,
+)
+
+from ui.database.events import ProviderCreated, event_bus
+from ui.database.notes_search import NoteHit, search_notes
+from ui.database.reference_cache import reference_cache
+from ui.util.async_query import busy_bar, query_pool
+
+# ---Control characters never appear in notes, so they can mark matches before HTML escaping
+_MARK_OPEN, _MARK_CLOSE = "\x02", "\x03"
+
+
+class NotesSearchWindow(QWidget):
+    RESULT_LIMIT = 100
+
+    def __init__(self, parent=None) -> None:  # noqa: ANN001
+        super().__init__(parent)
+        self.setObjectName("SubWindow")
+        self.setWindowTitle("Search Visit Notes")
+
+        main_layout = QVBoxLayout(self)
+
+        query_row = QHBoxLayout()
+        self.query_edit = QLineEdit(self)
+        self.query_edit.setPlaceholderText('e.g. amoxicillin, "blood pressure", amox*, rash OR fever')
+        self.query_edit.returnPressed.connect(self._search)
+        self.search_button = QPushButton("Search", self)
+        self.search_button.clicked.connect(self._search)
+        query_row.addWidget(self.query_edit, 1)
+        query_row.addWidget(self.search_button)
+        main_layout.addLayout(query_row)
+
+        filter_row = QHBoxLayout()
+        self.provider_combo = QComboBox(self)
+        self._load_providers()
+        filter_row.addWidget(QLabel("Provider:"))
+        filter_row.addWidget(self.provider_combo)
+
+        self.range_check = QCheckBox("Visits from", self)
+        self.from_date = QDateEdit(self)
+        self.from_date.setCalendarPopup(True)
+        self.from_date.setDate(QDate.currentDate().addMonths(-3))
+        self.to_date = QDateEdit(self)
+        self.to_date.setCalendarPopup(True)
+        self.to_date.setDate(QDate.currentDate())
+        for widget in (self.from_date, self.to_date):
+            widget.setEnabled(False)
+            self.range_check.toggled.connect(widget.setEnabled)
+        filter_row.addWidget(self.range_check)
+        filter_row.addWidget(self.from_date)
+        filter_row.addWidget(QLabel("to"))
+        filter_row.addWidget(self.to_date)
+        filter_row.addStretch()
+        main_layout.addLayout(filter_row)
+
+        self.status_label = QLabel("", self)
+        main_layout.addWidget(self.status_label)
+
+        self.busy = busy_bar(self)
+        self._search_key = f"notes_search.{id(self)}"
+        main_layout.addWidget(self.busy)
+
+        self.results = QTextBrowser(self)
+        main_layout.addWidget(self.results, 1)
+
+        event_bus.subscribe(ProviderCreated, self._on_provider_created)
+
+    def refresh(self) -> None:
+        provider_id = self.provider_combo.currentData()
+        self._load_providers()
+        self.provider_combo.setCurrentIndex(max(0, self.provider_combo.findData(provider_id)))
+
+    def can_evict(self) -> bool:
+        return not query_pool.is_pending(self._search_key)
+
+    def _load_providers(self) -> None:
+        self.provider_combo.clear()
+        self.provider_combo.addItem("Any provider", None)
+        for provider in reference_cache.providers():
+            self.provider_combo.addItem(provider.name, provider.provider_id)
+
+    def _on_provider_created(self, event: ProviderCreated) -> None:
+        self.provider_combo.addItem(event.name, event.provider_id)
+
+    @staticmethod
+    def _to_date(value: QDate) -> date:
+        return date(value.year(), value.month(), value.day())
+
+    @staticmethod
+    def _highlight(snippet: str) -> str:
+        return html.escape(snippet).replace(_MARK_OPEN, "<b style='background-color: #fff3a0'>").replace(_MARK_CLOSE, "</b>")
+
+    def _search(self) -> None:
+        text = self.query_edit.text().strip()
+        if not text:
+            return
+
+        start = end = None
+        if self.range_check.isChecked():
+            start, end = self._to_date(self.from_date.date()), self._to_date(self.to_date.date())
+
+        self.busy.setVisible(True)
+        self.status_label.setText("Searching...")
+        query_pool.submit(
+            search_notes,
+            text,
+            start,
+            end,
+            self.provider_combo.currentData(),
+            self.RESULT_LIMIT,
+            (_MARK_OPEN, _MARK_CLOSE),
+            on_result=self._show_hits,
+            on_error=self._search_failed,
+            key=self._search_key,
+        )
+
+    def _search_failed(self, error: Exception) -> None:
+        self.busy.setVisible(False)
+        self.status_label.clear()
+        QMessageBox.warning(self, "Search Error", f"Could not run that search:\n{error}")
+
+    def _show_hits(self, hits: list[NoteHit]) -> None:
+        self.busy.setVisible(False)
+        self.status_label.setText(f"{len(hits)} visit(s){' (best matches shown)' if len(hits) >= self.RESULT_LIMIT else ''}")
+        self.results.setHtml("".join(self._render(hit) for hit in hits))
+
+    def _render(self, hit: NoteHit) -> str:
+        parts = [
+            f"<p><b>{html.escape(hit.visit_date or '')}</b> &nbsp; {html.escape(hit.patient_name or '')}"
+            f" &nbsp; <i>{html.escape(hit.provider_name or '')}</i><br>",
+            f"Notes: {self._highlight(hit.notes)}",
+        ]
+        if hit.follow_up:
+            parts.append(f"<br>Follow up: {self._highlight(hit.follow_up)}")
+        parts.append("</p>")
+        return "".join(parts)
@@ -0,0 +1,124 @@
+# patient_picker.py
+
+# ---Type-ahead patient field used in place of a combo box holding every patient.
+# ---Typing runs a debounced search against the PatientSearch index on the query pool and shows
+# ---the best matches in a completer popup; choosing one selects that patient's ID.
+
+
+from PySide6.QtCore import QModelIndex, QStringListModel, Qt, QTimer, Signal
+from PySide6.QtWidgets import QCompleter, QLineEdit
+
+from ui.database.events import PatientCreated, event_bus
+from ui.database.reference_cache import reference_cache
+from ui.database.repositories import PatientMatch, patient_repo
+from ui.util.async_query import query_pool
+
+
+class PatientPicker(QLineEdit):
+    patient_changed = Signal(object)  # ---PatientId, or None when cleared
+
+    SEARCH_DELAY_MS = 200
+    MAX_MATCHES = 20
+
+    def __init__(self, parent=None) -> None:  # noqa: ANN001
+        super().__init__(parent)
+        self.setPlaceholderText("Search by name, DOB or phone")
+        self.setClearButtonEnabled(True)
+
+        self._patient_id: str | None = None
+        self._patient_name = ""
+        self._matches: list[PatientMatch] = []
+        self._pick_single = False  # ---Enter was pressed before the search finished
+        self._key = f"patient_picker.{id(self)}"
+
+        self._model = QStringListModel(self)
+        self._completer = QCompleter(self._model, self)
+        self._completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self._completer.setMaxVisibleItems(10)
+        self._completer.setWidget(self)
+        self._completer.activated[QModelIndex].connect(self._on_activated)
+
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(self._search)
+
+        # ---textEdited fires for typing only, not for the text set when a match is chosen
+        self.textEdited.connect(self._on_edited)
+        event_bus.subscribe(PatientCreated, self._on_patient_created)
+
+    def patient_id(self) -> str | None:
+        return self._patient_id
+
+    def patient_name(self) -> str:
+        return self._patient_name
+
+    def set_patient(self, patient_id: str | None) -> None:
+        name = reference_cache.patient_name(patient_id)
+        self._select(patient_id if name else None, name)
+
+    def clear_selection(self) -> None:
+        self._select(None, "")
+
+    def _select(self, patient_id: str | None, name: str) -> None:
+        self._search_timer.stop()
+        query_pool.cancel(self._key)
+        self._pick_single = False
+        self.setText(name)
+        self._patient_name = name
+        if patient_id != self._patient_id:
+            self._patient_id = patient_id
+            self.patient_changed.emit(patient_id)
+
+    def _on_edited(self, text: str) -> None:
+        if self._patient_id is not None:
+            self._patient_id = None
+            self._patient_name = ""
+            self.patient_changed.emit(None)
+        if text.strip():
+            self._search_timer.start()
+        else:
+            self._search_timer.stop()
+            query_pool.cancel(self._key)
+            self._pick_single = False
+            self._completer.popup().hide()
+
+    def _on_patient_created(self, _event: PatientCreated) -> None:
+        # ---Matches on show may now be missing the new patient
+        if self._patient_id is None and self._completer.popup().isVisible():
+            self._search()
+
+    def _search(self) -> None:
+        query_pool.submit(patient_repo.search, self.text(), self.MAX_MATCHES, on_result=self._show_matches, key=self._key)
+
+    def _show_matches(self, matches: list[PatientMatch]) -> None:
+        self._matches = matches
+        if self._pick_single and len(matches) == 1:
+            self._select(matches[0].patient_id, matches[0].name)
+            return
+        self._pick_single = False
+        self._model.setStringList([f"{m.name}  ({m.dob}, {m.phone})" for m in self._matches])
+        if self._matches:
+            self._completer.complete()
+        else:
+            self._completer.popup().hide()
+
+    def _on_activated(self, index: QModelIndex) -> None:
+        row = index.row()
+        if 0 <= row < len(self._matches):
+            match = self._matches[row]
+            self._select(match.patient_id, match.name)
+
+    def keyPressEvent(self, event) -> None:  # noqa: ANN001, N802
+        # ---Enter with a single match picks it without opening the popup
+        if event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter) and self._patient_id is None:
+            if self._search_timer.isActive() or query_pool.is_pending(self._key):
+                self._search_timer.stop()
+                self._pick_single = True
+                self._search()
+                return
+            if len(self._matches) == 1:
+                self._select(self._matches[0].patient_id, self._matches[0].name)
+                self._completer.popup().hide()
+                return
+        super().keyPressEvent(event)
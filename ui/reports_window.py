@@ -1,38 +1,211 @@
-import csv
-import sqlite3
+import threading
+from datetime import date
 from pathlib import Path
+from typing import Any
 
+from PySide6.QtCore import QAbstractTableModel, QDate, QModelIndex, QPersistentModelIndex, Qt, QThread, QTimer, Signal
 from PySide6.QtWidgets import (
     QAbstractItemView,
+    QCheckBox,
     QComboBox,
+    QDateEdit,
     QHBoxLayout,
     QHeaderView,
     QLabel,
+    QLineEdit,
     QMessageBox,
+    QProgressBar,
     QPushButton,
     QSizePolicy,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
+    QTextEdit,
     QVBoxLayout,
     QWidget,
 )
 
-from ui.config.paths import BILLING_DB, PATIENT_DB
+from ui.config.logger_config import logger
+from ui.database.connection import close_connections
+from ui.database.events import BillPaid, VisitRecorded, event_bus
+from ui.database.repositories import VisitListRow, visit_repo
+from ui.database.visit_export import ExportProgress, ExportResult, export_visits
+from ui.patient_picker import PatientPicker
+from ui.util.async_query import busy_bar, query_pool
 
+type _Index = QModelIndex | QPersistentModelIndex
 
-class ReportsWindow(QWidget):
 
-    COLS = [  # noqa: RUF012
-        "Visit Date",
-        "Provider Name",
-        "Visit Notes",
-        "Follow Up",
-        "Bill ID",
-        "Amount",
-        "Due Date",
-        "Paid",
+class VisitTableModel(QAbstractTableModel):
+    # ---Visit history for one patient, fetched a page at a time as the view scrolls.
+    # ---Sorting and filtering re-query from the first page instead of touching loaded rows.
+    # ---Pages load on the query pool; a reset cancels the page still in flight.
+
+    PAGE_SIZE = 200
+
+    loading_changed = Signal(bool)
+
+    # ---(header, VisitListRow field, VisitRepository sort key)
+    COLUMNS = [  # noqa: RUF012
+        ("Visit Date", "visit_date", "visit_date"),
+        ("Provider Name", "provider_name", "provider_name"),
+        ("Bill ID", "bill_id", "bill_id"),
+        ("Amount", "amount", "amount"),
+        ("Due Date", "due_date", "due_date"),
+        ("Paid", "paid", "paid"),
     ]
 
+    def __init__(self, parent=None) -> None:  # noqa: ANN001
+        super().__init__(parent)
+        self.patient_id: str | None = None
+        self.filter_text = ""
+        self.sort_key = "visit_date"
+        self.descending = False
+        self._rows: list[VisitListRow] = []
+        self._exhausted = True
+        self._fetching = False
+        self._key = f"reports.visits.{id(self)}"
+
+    def set_patient(self, patient_id: str | None) -> None:
+        self.patient_id = patient_id
+        self._reload()
+
+    def is_loading(self) -> bool:
+        return query_pool.is_pending(self._key)
+
+    def set_filter(self, text: str) -> None:
+        text = text.strip()
+        if text != self.filter_text:
+            self.filter_text = text
+            self._reload()
+
+    def row_at(self, row: int) -> VisitListRow | None:
+        return self._rows[row] if 0 <= row < len(self._rows) else None
+
+    def apply_visit(self, event: VisitRecorded) -> None:
+        # ---Where a new visit lands depends on the sort and filter, so the listing is re-read,
+        # ---but only when it belongs to the patient on screen
+        if event.patient_id == self.patient_id:
+            self._reload()
+
+    def apply_bill_paid(self, event: BillPaid) -> None:
+        paid_col = next(col for col, (_, field, _) in enumerate(self.COLUMNS) if field == "paid")
+        for row, visit in enumerate(self._rows):
+            if visit.bill_id == event.bill_id:
+                self._rows[row] = visit._replace(paid="Yes")
+                index = self.index(row, paid_col)
+                self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole])
+
+    def _reload(self) -> None:
+        query_pool.cancel(self._key)
+        self._set_fetching(False)
+        self.beginResetModel()
+        self._rows = []
+        self._exhausted = self.patient_id is None
+        self.endResetModel()
+        if self.canFetchMore():
+            self.fetchMore()
+
+    def _set_fetching(self, fetching: bool) -> None:
+        if fetching != self._fetching:
+            self._fetching = fetching
+            self.loading_changed.emit(fetching)
+
+    def _append_page(self, page: list[VisitListRow]) -> None:
+        self._set_fetching(False)
+        self._exhausted = len(page) < self.PAGE_SIZE
+        if not page:
+            return
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(page) - 1)
+        self._rows.extend(page)
+        self.endInsertRows()
+
+    def _page_failed(self, _error: Exception) -> None:
+        self._set_fetching(False)
+        self._exhausted = True
+
+    # ---QAbstractTableModel interface
+
+    def rowCount(self, parent: _Index = QModelIndex()) -> int:  # noqa: B008, N802
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: _Index = QModelIndex()) -> int:  # noqa: B008, N802
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def canFetchMore(self, parent: _Index = QModelIndex()) -> bool:  # noqa: B008, N802
+        return not parent.isValid() and not self._exhausted and not self._fetching
+
+    def fetchMore(self, parent: _Index = QModelIndex()) -> None:  # noqa: B008, N802
+        if not self.canFetchMore(parent):
+            return
+        last = self._rows[-1] if self._rows else None
+        self._set_fetching(True)
+        query_pool.submit(
+            visit_repo.page_for_patient,
+            self.patient_id,
+            (last.sort_value, last.visit_id) if last else None,
+            self.sort_key,
+            self.descending,
+            self.filter_text,
+            self.PAGE_SIZE,
+            on_result=self._append_page,
+            on_error=self._page_failed,
+            key=self._key,
+        )
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        if not 0 <= column < len(self.COLUMNS):
+            return
+        self.sort_key = self.COLUMNS[column][2]
+        self.descending = order == Qt.SortOrder.DescendingOrder
+        self._reload()
+
+    def data(self, index: _Index, role: int = Qt.ItemDataRole.DisplayRole) -> Any:  # noqa: ANN401
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        value = getattr(self._rows[index.row()], self.COLUMNS[index.column()][1])
+        return "" if value is None else str(value)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:  # noqa: ANN401, N802
+        if role != Qt.ItemDataRole.DisplayRole or orientation != Qt.Orientation.Horizontal:
+            return None
+        return self.COLUMNS[section][0] if section < len(self.COLUMNS) else None
+
+
+class _ExportWorker(QThread):
+    progressed = Signal(object)  # ---ExportProgress
+    completed = Signal(object)  # ---ExportResult
+    failed = Signal(str)
+
+    def __init__(self, dest: Path, patient_id: str | None, start: date | None, end: date | None, parent=None) -> None:  # noqa: ANN001
+        super().__init__(parent)
+        self.dest = dest
+        self.patient_id = patient_id
+        self.start_date = start
+        self.end_date = end
+        self.cancel_event = threading.Event()
+
+    def run(self) -> None:
+        try:
+            result = export_visits(
+                self.dest,
+                self.patient_id,
+                self.start_date,
+                self.end_date,
+                progress=self.progressed.emit,
+                cancel=self.cancel_event,
+            )
+            self.completed.emit(result)
+        except Exception as e:
+            logger.error(f"Visit export to {self.dest} failed: {e}")
+            self.failed.emit(str(e))
+        finally:
+            close_connections()
+
+
+class ReportsWindow(QWidget):
+
+    FILTER_DELAY_MS = 300
+
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
         self.setObjectName("SubWindow")
@@ -40,84 +213,176 @@ class ReportsWindow(QWidget):
         main_layout = QVBoxLayout(self)
 
         dropdown_container = QHBoxLayout()
-        self.patient_combo = QComboBox(self)
+        self.patient_picker = PatientPicker(self)
         dropdown_container.addWidget(QLabel("Select Patient:"))
-        dropdown_container.addWidget(self.patient_combo)
+        dropdown_container.addWidget(self.patient_picker)
+        self.filter_edit = QLineEdit(self)
+        self.filter_edit.setPlaceholderText("Filter visits (notes, provider, date)")
+        self.filter_edit.setClearButtonEnabled(True)
+        dropdown_container.addWidget(self.filter_edit)
         main_layout.addLayout(dropdown_container)
 
-        self.visits_table = QTableWidget(self)
-        self.visits_table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        # ---Filter is applied once typing pauses, not on every keystroke
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(self.FILTER_DELAY_MS)
+        self.filter_timer.timeout.connect(lambda: self.visits_model.set_filter(self.filter_edit.text()))
+        self.filter_edit.textChanged.connect(lambda _text: self.filter_timer.start())
+
+        self.busy = busy_bar(self)
+        main_layout.addWidget(self.busy)
+
+        self.visits_model = VisitTableModel(self)
+        self.visits_model.loading_changed.connect(self.busy.setVisible)
+        self._notes_key = f"reports.notes.{id(self)}"
+        self.visits_table = QTableView(self)
+        self.visits_table.setModel(self.visits_model)
+        self.visits_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.visits_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
         self.visits_table.verticalHeader().setVisible(False)
-        self.visits_table.setColumnCount(len(self.COLS))
-        self.visits_table.setHorizontalHeaderLabels(self.COLS)
         self.visits_table.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         self.visits_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.visits_table.horizontalHeader().setSortIndicator(0, Qt.SortOrder.AscendingOrder)
+        self.visits_table.setSortingEnabled(True)
         self.visits_table.setAlternatingRowColors(True)
-        main_layout.addWidget(self.visits_table)
+        self.visits_table.selectionModel().currentRowChanged.connect(self._show_notes)
+        main_layout.addWidget(self.visits_table, 1)
+
+        # ---Notes for the selected visit only; the list query never reads the note columns
+        self.notes_view = QTextEdit(self)
+        self.notes_view.setReadOnly(True)
+        self.notes_view.setPlaceholderText("Select a visit to view its notes.")
+        self.notes_view.setMaximumHeight(150)
+        main_layout.addWidget(self.notes_view)
 
+        # ---Export options
+        export_options = QHBoxLayout()
+        self.export_scope = QComboBox(self)
+        self.export_scope.addItems(["Selected patient", "All patients"])
+        export_options.addWidget(QLabel("Export:"))
+        export_options.addWidget(self.export_scope)
+        self.range_check = QCheckBox("Visits from", self)
+        self.from_date = QDateEdit(self)
+        self.from_date.setCalendarPopup(True)
+        self.from_date.setDate(QDate.currentDate().addYears(-1))
+        self.to_date = QDateEdit(self)
+        self.to_date.setCalendarPopup(True)
+        self.to_date.setDate(QDate.currentDate())
+        for widget in (self.from_date, self.to_date):
+            widget.setEnabled(False)
+            self.range_check.toggled.connect(widget.setEnabled)
+        export_options.addWidget(self.range_check)
+        export_options.addWidget(self.from_date)
+        export_options.addWidget(QLabel("to"))
+        export_options.addWidget(self.to_date)
+        self.gzip_check = QCheckBox("Gzip", self)
+        export_options.addWidget(self.gzip_check)
+        export_options.addStretch()
+        main_layout.addLayout(export_options)
+
+        self.export_progress = QProgressBar(self)
+        self.export_progress.setRange(0, 100)
+        self.export_progress.setVisible(False)
+        main_layout.addWidget(self.export_progress)
+
+        export_buttons = QHBoxLayout()
         self.export_button = QPushButton("Export", self)
         self.export_button.setObjectName("ExportButton")
         self.export_button.clicked.connect(self._export_csv)
-        main_layout.addWidget(self.export_button)
-
-        main_layout.setStretch(1, 1)
+        self.cancel_export_button = QPushButton("Cancel Export", self)
+        self.cancel_export_button.setVisible(False)
+        self.cancel_export_button.clicked.connect(self._cancel_export)
+        export_buttons.addWidget(self.export_button)
+        export_buttons.addWidget(self.cancel_export_button)
+        main_layout.addLayout(export_buttons)
+        self.export_worker: _ExportWorker | None = None
 
-        self.patient_combo.currentIndexChanged.connect(self._load_visits)
+        self.patient_picker.patient_changed.connect(self.visits_model.set_patient)
+        self.visits_model.modelReset.connect(self.notes_view.clear)
+        event_bus.subscribe(VisitRecorded, self.visits_model.apply_visit)
+        event_bus.subscribe(BillPaid, self.visits_model.apply_bill_paid)
 
-        self._load_patients()
+    def refresh(self) -> None:
+        self.visits_model.set_patient(self.patient_picker.patient_id())
 
-    def _load_patients(self) -> None:
-        with sqlite3.connect(PATIENT_DB) as conn:
-            cur = conn.execute("SELECT PatientId, PatientName FROM Patients")
-            self.patient_combo.clear()
-            for pid, name in cur.fetchall():
-                self.patient_combo.addItem(name, pid)
-        self._load_visits()
+    def can_evict(self) -> bool:
+        # ---The window registry keeps this screen while its export thread or a query is running
+        exporting = self.export_worker is not None and self.export_worker.isRunning()
+        return not exporting and not self.visits_model.is_loading() and not query_pool.is_pending(self._notes_key)
 
-    def _load_visits(self) -> None:
-        patient_id = self.patient_combo.currentData()
-        if patient_id is None:
+    def _show_notes(self, current: QModelIndex, _previous: QModelIndex) -> None:
+        row = self.visits_model.row_at(current.row()) if current.isValid() else None
+        self.notes_view.clear()
+        if row is None:
+            query_pool.cancel(self._notes_key)
             return
+        query_pool.submit(visit_repo.notes_for, row.visit_id, on_result=self._set_notes, key=self._notes_key)
 
-        billing_path = str(BILLING_DB)
-        with sqlite3.connect(PATIENT_DB) as conn:
-            conn.execute(f"ATTACH DATABASE '{billing_path}' AS billing;")
-            query = """
-                SELECT vd.VisitDate,
-                    p.ProviderName,
-                    vd.VisitNotes,
-                    vd.FollowUpDetails,
-                    vd.BillId,
-                    b.BillAmount,
-                    b.DueDate,
-                    CASE b.Paid WHEN 1 THEN 'Yes' ELSE 'No' END
-                FROM VisitDetails vd
-                LEFT JOIN Provider p ON vd.ProviderId = p.ProviderId
-                LEFT JOIN billing.Billing b ON vd.BillId = b.BillId
-                WHERE vd.PatientId = ?
-                ORDER BY vd.VisitDate ASC;
-                """
-            rows = conn.execute(query, (patient_id,)).fetchall()
-            conn.execute("DETACH DATABASE billing;")
-
-        self.visits_table.setRowCount(len(rows))
-        for r, row in enumerate(rows):
-            for c, value in enumerate(row):
-                self.visits_table.setItem(r, c, QTableWidgetItem(str(value)))
+    def _set_notes(self, notes: tuple[str, str]) -> None:
+        visit_notes, follow_up = notes
+        self.notes_view.setPlainText(f"Visit Notes:\n{visit_notes}\n\nFollow Up:\n{follow_up}")
+
+    @staticmethod
+    def _to_date(value: QDate) -> date:
+        return date(value.year(), value.month(), value.day())
 
     def _export_csv(self) -> None:
-        patient_name = self.patient_combo.currentText()
-        path = Path.home() / "Desktop" / f"{patient_name}.csv"
-        try:
-            with path.open("w", newline="", encoding="utf-8") as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(self.COLS)
-                for r in range(self.visits_table.rowCount()):
-                    row_data = []
-                    for c in range(self.visits_table.columnCount()):
-                        item = self.visits_table.item(r, c)
-                        row_data.append(item.text() if item is not None else "")
-                    writer.writerow(row_data)
-            QMessageBox.information(self, "Export Successful", f"Exported to:\n{path}")
-        except Exception as exc:
-            QMessageBox.critical(self, "Export Failed", f"Could not export CSV:\n{exc}")
+        if self.export_worker is not None:
+            return
+
+        if self.export_scope.currentText() == "All patients":
+            patient_id = None
+            stem = "all_patients"
+        else:
+            patient_id = self.patient_picker.patient_id()
+            if patient_id is None:
+                QMessageBox.warning(self, "Input Error", "Please select a patient.")
+                return
+            stem = self.patient_picker.patient_name()
+
+        start = end = None
+        if self.range_check.isChecked():
+            start, end = self._to_date(self.from_date.date()), self._to_date(self.to_date.date())
+            if end < start:
+                QMessageBox.warning(self, "Input Error", "End date must not be before start date.")
+                return
+            stem += f"_{start:%Y%m%d}-{end:%Y%m%d}"
+
+        path = Path.home() / "Desktop" / f"{stem}.csv{'.gz' if self.gzip_check.isChecked() else ''}"
+
+        self.export_worker = _ExportWorker(path, patient_id, start, end, self)
+        self.export_worker.progressed.connect(self._on_export_progress)
+        self.export_worker.completed.connect(self._on_export_completed)
+        self.export_worker.failed.connect(self._on_export_failed)
+        self.export_worker.finished.connect(self._on_export_finished)
+
+        self.export_button.setEnabled(False)
+        self.export_progress.setValue(0)
+        self.export_progress.setVisible(True)
+        self.cancel_export_button.setEnabled(True)
+        self.cancel_export_button.setVisible(True)
+        self.export_worker.start()
+
+    def _cancel_export(self) -> None:
+        if self.export_worker is not None:
+            self.export_worker.cancel_event.set()
+            self.cancel_export_button.setEnabled(False)
+
+    def _on_export_progress(self, progress: ExportProgress) -> None:
+        if progress.total:
+            self.export_progress.setValue(int(progress.rows * 100 / progress.total))
+
+    def _on_export_completed(self, result: ExportResult) -> None:
+        if result.cancelled:
+            QMessageBox.information(self, "Export Cancelled", "The export was cancelled; no file was written.")
+            return
+        QMessageBox.information(self, "Export Successful", f"Exported {result.rows} visits to:\n{result.path}")
+
+    def _on_export_failed(self, error: str) -> None:
+        QMessageBox.critical(self, "Export Failed", f"Could not export CSV:\n{error}")
+
+    def _on_export_finished(self) -> None:
+        self.export_worker = None
+        self.export_button.setEnabled(True)
+        self.export_progress.setVisible(False)
+        self.cancel_export_button.setVisible(False)
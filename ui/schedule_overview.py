@@ -0,0 +1,214 @@
+# schedule_overview.py
+
+# ---Week / month grid of every provider's bookings.
+# ---Rows are (date, time slot), columns are providers. A whole range is loaded with one query
+# ---and served through a table model; new bookings and providers arrive as events, so only the
+# ---booked cell is repainted and a new provider column is appended without reloading the range.
+
+
+from typing import Any
+
+from PySide6.QtCore import QAbstractTableModel, QDate, QModelIndex, QPersistentModelIndex, Qt
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import (
+    QComboBox,
+    QDateEdit,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QPushButton,
+    QTableView,
+    QVBoxLayout,
+    QWidget,
+)
+
+from ui.database.events import BookingMade, ProviderCreated, event_bus
+from ui.database.reference_cache import reference_cache
+from ui.database.repositories import Provider, RangeBooking, schedule_repo
+from ui.schedule_window import Schedule
+from ui.util.async_query import busy_bar, query_pool
+
+BOOKED_COLOR = QColor("#f8d7da")
+
+type _Index = QModelIndex | QPersistentModelIndex
+
+
+class ScheduleRangeModel(QAbstractTableModel):
+    def __init__(self, parent=None) -> None:  # noqa: ANN001
+        super().__init__(parent)
+        self.hours = list(Schedule.HOURS)
+        self.dates: list[QDate] = []
+        self.providers: list[Provider] = []
+        self._date_rows: dict[str, int] = {}
+        self._provider_cols: dict[str, int] = {}
+        self._cells: dict[tuple[int, int], str] = {}  # ---(row, col) -> patient name
+
+    @staticmethod
+    def fetch(start: str, end: str) -> tuple[list[Provider], list[RangeBooking]]:
+        # ---Runs on the query pool
+        return reference_cache.providers(), schedule_repo.range_view(start, end)
+
+    def load(self, start: QDate, end: QDate, providers: list[Provider], bookings: list[RangeBooking]) -> None:
+        self.beginResetModel()
+        self.providers = providers
+        self._provider_cols = {p.provider_id: col for col, p in enumerate(self.providers)}
+
+        self.dates = []
+        day = start
+        while day <= end:
+            self.dates.append(day)
+            day = day.addDays(1)
+        self._date_rows = {d.toString("yyyy-MM-dd"): i * len(self.hours) for i, d in enumerate(self.dates)}
+
+        self._cells = {}
+        for booking in bookings:
+            cell = self._cell_for(booking.schedule_date, booking.provider_id, booking.slot)
+            if cell:
+                self._cells[cell] = booking.patient_name
+        self.endResetModel()
+
+    def _cell_for(self, date_str: str, provider_id: str, slot: int) -> tuple[int, int] | None:
+        base = self._date_rows.get(date_str)
+        col = self._provider_cols.get(provider_id)
+        if base is None or col is None or slot not in self.hours:
+            return None
+        return base + self.hours.index(slot), col
+
+    def apply_booking(self, booking: BookingMade) -> None:
+        cell = self._cell_for(booking.schedule_date, booking.provider_id, booking.slot)
+        if cell is None:
+            return
+        self._cells[cell] = booking.patient_name
+        index = self.index(*cell)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.BackgroundRole])
+
+    def add_provider(self, provider: Provider) -> None:
+        # ---A new provider has no bookings yet, so the column starts empty
+        if provider.provider_id in self._provider_cols or not self.dates:
+            return
+        col = len(self.providers)
+        self.beginInsertColumns(QModelIndex(), col, col)
+        self.providers.append(provider)
+        self._provider_cols[provider.provider_id] = col
+        self.endInsertColumns()
+
+    # ---QAbstractTableModel interface
+
+    def rowCount(self, parent: _Index = QModelIndex()) -> int:  # noqa: B008, N802
+        return 0 if parent.isValid() else len(self.dates) * len(self.hours)
+
+    def columnCount(self, parent: _Index = QModelIndex()) -> int:  # noqa: B008, N802
+        return 0 if parent.isValid() else len(self.providers)
+
+    def data(self, index: _Index, role: int = Qt.ItemDataRole.DisplayRole) -> Any:  # noqa: ANN401
+        if not index.isValid():
+            return None
+        name = self._cells.get((index.row(), index.column()))
+        if role == Qt.ItemDataRole.DisplayRole:
+            return name or ""
+        if role == Qt.ItemDataRole.BackgroundRole and name is not None:
+            return BOOKED_COLOR
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:  # noqa: ANN401, N802
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.providers[section].name if section < len(self.providers) else None
+        day, slot = divmod(section, len(self.hours))
+        if day >= len(self.dates):
+            return None
+        return f"{self.dates[day].toString('ddd MM/dd')}  {Schedule._slot_label(self.hours[slot])}"
+
+
+class ScheduleOverviewWindow(QWidget):
+    def __init__(self, parent=None) -> None:  # noqa: ANN001
+        super().__init__(parent)
+        self.setObjectName("SubWindow")
+        self.setWindowTitle("Schedule Overview")
+
+        main_layout = QVBoxLayout(self)
+
+        controls = QHBoxLayout()
+        self.range_combo = QComboBox(self)
+        self.range_combo.addItems(["Week", "Month"])
+        self.range_combo.currentIndexChanged.connect(self._reload)
+        controls.addWidget(QLabel("View:"))
+        controls.addWidget(self.range_combo)
+
+        self.prev_button = QPushButton("<", self)
+        self.prev_button.clicked.connect(lambda: self._step(-1))
+        self.date_edit = QDateEdit(self)
+        self.date_edit.setCalendarPopup(True)
+        self.date_edit.setDate(QDate.currentDate())
+        self.date_edit.dateChanged.connect(self._reload)
+        self.next_button = QPushButton(">", self)
+        self.next_button.clicked.connect(lambda: self._step(1))
+        controls.addWidget(self.prev_button)
+        controls.addWidget(self.date_edit)
+        controls.addWidget(self.next_button)
+        controls.addStretch()
+
+        self.range_label = QLabel("", self)
+        controls.addWidget(self.range_label)
+        main_layout.addLayout(controls)
+
+        self.busy = busy_bar(self)
+        self._range_key = f"schedule_overview.{id(self)}"
+        main_layout.addWidget(self.busy)
+
+        self.model = ScheduleRangeModel(self)
+        self.table = QTableView(self)
+        self.table.setModel(self.model)
+        self.table.setSelectionMode(QTableView.SelectionMode.NoSelection)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        main_layout.addWidget(self.table)
+
+        event_bus.subscribe(BookingMade, self._on_booking_made)
+        event_bus.subscribe(ProviderCreated, self._on_provider_created)
+        self._reload()
+
+    def refresh(self) -> None:
+        self._reload()
+
+    def can_evict(self) -> bool:
+        return not query_pool.is_pending(self._range_key)
+
+    def _range(self) -> tuple[QDate, QDate]:
+        anchor = self.date_edit.date()
+        if self.range_combo.currentText() == "Month":
+            start = QDate(anchor.year(), anchor.month(), 1)
+            return start, start.addMonths(1).addDays(-1)
+        start = anchor.addDays(1 - anchor.dayOfWeek())  # ---Monday
+        return start, start.addDays(6)
+
+    def _step(self, direction: int) -> None:
+        anchor = self.date_edit.date()
+        if self.range_combo.currentText() == "Month":
+            self.date_edit.setDate(anchor.addMonths(direction))
+        else:
+            self.date_edit.setDate(anchor.addDays(7 * direction))
+
+    def _reload(self) -> None:
+        start, end = self._range()
+        self.range_label.setText(f"{start.toString('MMM d, yyyy')} - {end.toString('MMM d, yyyy')}")
+        self.busy.setVisible(True)
+        query_pool.submit(
+            ScheduleRangeModel.fetch,
+            start.toString("yyyy-MM-dd"),
+            end.toString("yyyy-MM-dd"),
+            on_result=lambda result: self._show_range(start, end, *result),
+            on_error=lambda _error: self.busy.setVisible(False),
+            key=self._range_key,
+        )
+
+    def _show_range(self, start: QDate, end: QDate, providers: list[Provider], bookings: list[RangeBooking]) -> None:
+        self.busy.setVisible(False)
+        self.model.load(start, end, providers, bookings)
+
+    def _on_booking_made(self, event: BookingMade) -> None:
+        query_pool.reload_or_apply(self._range_key, self._reload, lambda: self.model.apply_booking(event))
+
+    def _on_provider_created(self, event: ProviderCreated) -> None:
+        query_pool.reload_or_apply(self._range_key, self._reload, lambda: self.model.add_provider(Provider(*event)))
@@ -1,5 +1,3 @@
-import sqlite3
-import uuid
 from datetime import time
 
 from PySide6.QtCore import QDate, Qt
@@ -8,7 +6,9 @@ from PySide6.QtWidgets import (
     QAbstractItemView,
     QComboBox,
     QDateEdit,
+    QDialog,
     QFormLayout,
+    QHBoxLayout,
     QHeaderView,
     QMessageBox,
     QPushButton,
@@ -18,8 +18,14 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from ui.config.paths import PATIENT_DB
-from ui.database.write_to_db import write_to_database
+from ui.database.events import BookingMade, ProviderCreated, event_bus
+from ui.database.reference_cache import reference_cache
+from ui.database.repositories import Booking, DaySlot, Provider, schedule_repo
+from ui.find_slot_dialog import FindSlotDialog
+from ui.patient_picker import PatientPicker
+from ui.services.errors import ServiceError
+from ui.services.scheduling import SlotTaken, book_visit
+from ui.util.async_query import busy_bar, query_pool
 
 
 class Schedule(QWidget):
@@ -40,8 +46,8 @@ class Schedule(QWidget):
         self.provider_combo.currentIndexChanged.connect(self._refresh_controls)
         form_layout.addRow("Provider:", self.provider_combo)
 
-        self.patient_combo = QComboBox(self)
-        form_layout.addRow("Patient:", self.patient_combo)
+        self.patient_picker = PatientPicker(self)
+        form_layout.addRow("Patient:", self.patient_picker)
 
         self.date_edit = QDateEdit(self)
         self.date_edit.setCalendarPopup(True)
@@ -54,6 +60,13 @@ class Schedule(QWidget):
 
         container_layout.addLayout(form_layout)
 
+        self.busy = busy_bar(self)
+        self._day_key = f"schedule.day.{id(self)}"
+        self._pending_slot: int | None = None  # ---slot to select once the day view arrives
+        self._providers_key = f"schedule.providers.{id(self)}"
+        self._booking_key = f"schedule.book.{id(self)}"
+        container_layout.addWidget(self.busy)
+
         self.day_grid = QTableWidget(self)
         self.day_grid.setColumnCount(2)
         self.day_grid.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
@@ -62,30 +75,55 @@ class Schedule(QWidget):
         self.day_grid.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         container_layout.addWidget(self.day_grid)
 
+        button_row = QHBoxLayout()
+        self.find_btn = QPushButton("Find Next Available", self)
+        self.find_btn.clicked.connect(self._find_next_available)
+        button_row.addWidget(self.find_btn)
+
         self.schedule_btn = QPushButton("Schedule", self)
         self.schedule_btn.clicked.connect(self._schedule_visit)
-        container_layout.addWidget(self.schedule_btn, alignment=Qt.AlignmentFlag.AlignHCenter)
+        button_row.addWidget(self.schedule_btn)
+        container_layout.addLayout(button_row)
 
         main_layout = QVBoxLayout(self)
         main_layout.addWidget(container)
 
         self._load_providers()
-        self._load_patients()
-        self._refresh_controls()
+        event_bus.subscribe(ProviderCreated, self._on_provider_created)
+        event_bus.subscribe(BookingMade, self._on_booking_made)
 
-    @staticmethod
-    def _conn():
-        return sqlite3.connect(PATIENT_DB)
+    def refresh(self) -> None:
+        self._load_providers()
 
     def _load_providers(self) -> None:
-        with self._conn() as conn:
-            for pid, name in conn.execute("SELECT ProviderId, ProviderName FROM Provider"):
-                self.provider_combo.addItem(name, pid)
+        self._set_loading(True)
+        query_pool.submit(
+            reference_cache.providers,
+            on_result=self._show_providers,
+            on_error=lambda _error: self._set_loading(False),
+            key=self._providers_key,
+        )
+
+    def _show_providers(self, providers: list[Provider]) -> None:
+        # ---Keeps the selected provider; the day view is reloaded for it
+        provider_id = self.provider_combo.currentData()
+        self.provider_combo.blockSignals(True)
+        self.provider_combo.clear()
+        for provider in providers:
+            self.provider_combo.addItem(provider.name, provider.provider_id)
+        self.provider_combo.setCurrentIndex(max(0, self.provider_combo.findData(provider_id)))
+        self.provider_combo.blockSignals(False)
+        self._refresh_controls()
 
-    def _load_patients(self) -> None:
-        with self._conn() as conn:
-            for pid, name in conn.execute("SELECT PatientId, PatientName FROM Patients"):
-                self.patient_combo.addItem(name, pid)
+    def _on_provider_created(self, event: ProviderCreated) -> None:
+        query_pool.reload_or_apply(
+            self._providers_key, self._load_providers, lambda: self.provider_combo.addItem(event.name, event.provider_id)
+        )
+
+    def _on_booking_made(self, event: BookingMade) -> None:
+        # ---Bookings for the day on screen, from here or elsewhere; the cached day already has the slot
+        if event.provider_id == self.provider_combo.currentData() and event.schedule_date == self._current_date():
+            self._refresh_controls()
 
     @staticmethod
     def _slot_label(hour: int) -> str:
@@ -96,30 +134,25 @@ class Schedule(QWidget):
     def _current_date(self) -> str:
         return self.date_edit.date().toString("yyyy-MM-dd")
 
-    def _day_map(self, provider_id: str, date_str: str) -> dict[int, str]:
-        with self._conn() as conn:
-            cur = conn.execute(
-                """SELECT ScheduleSlot, PatientId
-                    FROM Schedule
-                    WHERE ProviderId = ?
-                        AND ScheduleDate = ?""",
-                (provider_id, date_str),
-            )
-            return {row[0]: row[1] for row in cur.fetchall()}
-
-    def _patient_name(self, pid: str | None) -> str:
-        if not pid:
-            return ""
-        with self._conn() as conn:
-            cur = conn.execute("SELECT PatientName FROM Patients WHERE PatientId = ?", (pid,))
-            row = cur.fetchone()
-            return row[0] if row else ""
-
     def _refresh_controls(self) -> None:
-        provider_id = self.provider_combo.currentData()
-        date_str = self._current_date()
-        bookings = self._day_map(provider_id, date_str)
-
+        # ---The day view loads on the query pool; a newer provider/date cancels the pending one
+        self._set_loading(True)
+        query_pool.submit(
+            schedule_repo.day_view,
+            self.provider_combo.currentData(),
+            self._current_date(),
+            on_result=self._show_day,
+            on_error=lambda _error: self._set_loading(False),
+            key=self._day_key,
+        )
+
+    def _set_loading(self, loading: bool) -> None:
+        saving = query_pool.is_pending(self._booking_key)
+        self.busy.setVisible(loading or saving)
+        self.schedule_btn.setEnabled(not loading and not saving)
+
+    def _show_day(self, bookings: dict[int, DaySlot]) -> None:
+        self._set_loading(False)
         self.slot_combo.blockSignals(True)
         self.slot_combo.clear()
         for h in self.HOURS:
@@ -129,12 +162,16 @@ class Schedule(QWidget):
             if h in bookings:
                 index = self.slot_combo.model().index(idx, 0)
                 self.slot_combo.model().setData(index, False, Qt.ItemDataRole.AccessibleTextRole)
+        if self._pending_slot is not None:
+            self.slot_combo.setCurrentIndex(self.slot_combo.findData(self._pending_slot))
+            self._pending_slot = None
         self.slot_combo.blockSignals(False)
 
         self.day_grid.setRowCount(len(self.HOURS))
         for row, h in enumerate(self.HOURS):
             label = self._slot_label(h)
-            patient_name = self._patient_name(bookings.get(h))
+            booked = bookings.get(h)
+            patient_name = booked.patient_name if booked else ""
 
             slot_item = QTableWidgetItem(label)
             patient_item = QTableWidgetItem(patient_name)
@@ -147,40 +184,42 @@ class Schedule(QWidget):
             self.day_grid.setItem(row, 1, patient_item)
 
     def _schedule_visit(self) -> None:
-        provider_id = self.provider_combo.currentData()
-        patient_id = self.patient_combo.currentData()
-        date_str = self._current_date()
-        slot_hour = self.slot_combo.currentData()
-
-        if slot_hour is None:
-            QMessageBox.warning(self, "Slot unavailable", "Selected time block is already booked.")
-            return
-
-        with self._conn() as conn:
-            cur = conn.execute(
-                "SELECT 1 FROM Schedule WHERE ProviderId=? AND ScheduleDate=? AND ScheduleSlot=?",
-                (provider_id, date_str, slot_hour),
-            )
-            if cur.fetchone():
-                QMessageBox.warning(
-                    self,
-                    "Slot taken",
-                    "The provider is already booked for that time.",
-                )
-                self._refresh_controls()
-                return
-
-        schedule_id = str(uuid.uuid4())
-        data = {
-            "ScheduleId": schedule_id,
-            "ProviderId": provider_id,
-            "PatientId": patient_id,
-            "ScheduleDate": date_str,
-            "ScheduleSlot": slot_hour,
-        }
-
-        if write_to_database("patients", "Schedule", data):
-            QMessageBox.information(self, "Scheduled", "Office visit scheduled successfully.")
+        # ---Booked on the query pool: with another desk holding the write lock the insert waits out
+        # ---busy_timeout and its retries. Committing it updates the cached day, and the BookingMade
+        # ---event reloads the grid.
+        query_pool.submit(
+            book_visit,
+            self.provider_combo.currentData(),
+            self.patient_picker.patient_id(),
+            self._current_date(),
+            self.slot_combo.currentData(),
+            on_result=self._booked,
+            on_error=self._booking_failed,
+            key=self._booking_key,
+        )
+        self._set_loading(query_pool.is_pending(self._day_key))
+
+    def _booked(self, _booking: Booking) -> None:
+        self._set_loading(query_pool.is_pending(self._day_key))
+        QMessageBox.information(self, "Scheduled", "Office visit scheduled successfully.")
+
+    def _booking_failed(self, error: Exception) -> None:
+        self._set_loading(query_pool.is_pending(self._day_key))
+        if isinstance(error, SlotTaken):
+            QMessageBox.warning(self, error.title, error.message)
             self._refresh_controls()
+        elif isinstance(error, ServiceError):
+            QMessageBox.warning(self, error.title, error.message)
         else:
             QMessageBox.critical(self, "Error", "Failed to schedule office visit.")
+
+    def _find_next_available(self) -> None:
+        dialog = FindSlotDialog(self.HOURS, self)
+        if dialog.exec() != QDialog.DialogCode.Accepted or dialog.selected_slot is None:
+            return
+
+        slot = dialog.selected_slot
+        self.provider_combo.setCurrentIndex(self.provider_combo.findData(slot.provider_id))
+        self._pending_slot = slot.hour
+        self.date_edit.setDate(QDate(slot.slot_date.year, slot.slot_date.month, slot.slot_date.day))
+        self._refresh_controls()
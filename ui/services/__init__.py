@@ -0,0 +1,26 @@
+# ---Business operations with no Qt dependency, shared by the windows and the command line
+# ---(ui/cli.py). Names are imported on first access, like ui and ui.database.
+
+import importlib
+
+_MODULES = {
+    "BillRunResult": ".billing",
+    "MaintenanceResult": ".maintenance",
+    "ServiceError": ".errors",
+    "SlotTaken": ".scheduling",
+    "add_visit": ".visits",
+    "bill_run": ".billing",
+    "book_visit": ".scheduling",
+    "onboard_patient": ".patients",
+    "run_maintenance": ".maintenance",
+}
+
+
+def __getattr__(name: str) -> object:
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
+
+
+__all__ = ["BillRunResult", "MaintenanceResult", "ServiceError", "SlotTaken", "add_visit", "bill_run", "book_visit", "onboard_patient", "run_maintenance"]
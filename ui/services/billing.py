@@ -0,0 +1,89 @@
+# ui/services/billing.py
+
+# ---Bill run: a reminder notification for every unpaid bill past its due date. A bill is reminded
+# ---once; any notification dated on or after its due date counts as the reminder, so the run can be
+# ---repeated (daily from a scheduler, say) without notifying anyone twice.
+
+
+import sqlite3
+import time
+import uuid
+from datetime import date, datetime
+from typing import NamedTuple
+
+from ui.config.logger_config import logger
+from ui.database.connection import get_connection, transaction
+from ui.database.reference_cache import reference_cache
+from ui.database.write_to_db import write_many
+
+NOTIFICATION_COLUMNS = ("NotificationId", "PatientId", "BillId", "NotificationDate", "Message")
+
+
+class OverdueBill(NamedTuple):
+    bill_id: str
+    amount: float
+    due_date: str
+    patient_id: str
+    visit_date: str
+
+
+class BillRunResult(NamedTuple):
+    overdue: int  # ---unpaid bills past due that had not been reminded yet
+    notified: int
+    outstanding: float  # ---total owed on those bills
+
+
+def overdue_bills(as_of: date) -> list[OverdueBill]:
+    # ---Every unpaid bill past its due date, reminded or not
+    return _overdue(as_of, "")
+
+
+def _unreminded_bills(as_of: date) -> list[OverdueBill]:
+    # ---The bill run's share: overdue bills with no reminder dated on or after the due date
+    return _overdue(as_of, "AND NOT EXISTS (SELECT 1 FROM Notification n WHERE n.BillId = b.BillId AND n.NotificationDate >= b.DueDate)")
+
+
+def _overdue(as_of: date, condition: str) -> list[OverdueBill]:
+    # ---idx_billing_unpaid (Paid, DueDate) finds the bills; VisitDetails and Notification by BillId
+    cur = get_connection("patients").execute(
+        f"""SELECT b.BillId, b.BillAmount, b.DueDate, vd.PatientId, vd.VisitDate
+            FROM billing.Billing b
+            JOIN VisitDetails vd ON vd.BillId = b.BillId
+            WHERE b.Paid = 0
+                AND b.DueDate < ?
+                {condition}
+            ORDER BY b.DueDate, b.BillId""",  # noqa: S608
+        (as_of.isoformat(),),
+    )
+    return [OverdueBill(*row) for row in cur]
+
+
+def bill_run(as_of: date | None = None, dry_run: bool = False) -> BillRunResult:
+    started = time.perf_counter()
+    as_of = as_of or date.today()
+    company_name = reference_cache.company_name()
+    now = datetime.now().astimezone().isoformat()
+
+    try:
+        with transaction("patients"):
+            # ---Read and written under one write lock, so two runs cannot remind the same bill
+            bills = _unreminded_bills(as_of)
+            rows = [
+                (
+                    str(uuid.uuid4()),
+                    bill.patient_id,
+                    bill.bill_id,
+                    now,
+                    f"Your bill for services provided by {company_name} on {bill.visit_date} was due on {bill.due_date}.\nPlease pay {bill.amount} at your earliest convenience.\nThank You!",
+                )
+                for bill in bills
+            ]
+            notified = 0 if dry_run else write_many("patients", "Notification", rows, columns=NOTIFICATION_COLUMNS)
+    except sqlite3.Error as e:
+        logger.error(f"Bill run failed: {e}")
+        raise
+
+    result = BillRunResult(len(bills), notified, round(sum(bill.amount or 0 for bill in bills), 2))
+    log = logger.bind(operation="bill_run", duration_ms=round((time.perf_counter() - started) * 1000, 3))
+    log.info(f"Bill run as of {as_of}: {result.overdue} overdue bills, {result.notified} reminders, {result.outstanding} outstanding{' (dry run)' if dry_run else ''}")
+    return result
@@ -0,0 +1,11 @@
+# ui/services/errors.py
+
+
+class ServiceError(Exception):
+    # ---A request the business rules turn down. title/message are worded for the user: windows
+    # ---show them in a message box, the command line prints them.
+
+    def __init__(self, title: str, message: str) -> None:
+        super().__init__(message)
+        self.title = title
+        self.message = message
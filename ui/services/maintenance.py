@@ -0,0 +1,66 @@
+# ui/services/maintenance.py
+
+# ---Routine upkeep for every database file: a quick integrity check, fresh planner statistics,
+# ---VACUUM to return free pages, and a WAL checkpoint. VACUUM may renumber the Patients rowids the
+# ---patient search index is keyed on, so both search indexes are rebuilt afterwards.
+
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+from ui.config.logger_config import logger
+from ui.database.connection import DB_MAP, get_connection
+from ui.database.notes_search import rebuild_notes_index
+from ui.database.repositories import patient_repo
+
+
+class MaintenanceResult(NamedTuple):
+    db_key: str
+    integrity: str  # ---"ok", or the first problem quick_check reported
+    bytes_before: int
+    bytes_after: int
+    duration_ms: float
+
+
+def _file_size(path: Path) -> int:
+    # ---The database plus its write-ahead log
+    return sum(p.stat().st_size for p in (path, path.with_name(path.name + "-wal")) if p.exists())
+
+
+def maintain_database(db_key: str, vacuum: bool = True) -> MaintenanceResult:
+    # ---Must not run inside a transaction (VACUUM cannot) and blocks writers while it runs
+    started = time.perf_counter()
+    path = DB_MAP[db_key]
+    before = _file_size(path)
+    conn = get_connection(db_key)
+
+    integrity = conn.execute("PRAGMA main.quick_check(1)").fetchone()[0]
+    if integrity != "ok":
+        # ---Rewriting a damaged file can make it worse; leave it for a restore
+        logger.error(f"{db_key} db failed its integrity check: {integrity}")
+    else:
+        conn.execute("ANALYZE main")
+        if vacuum:
+            conn.execute("VACUUM main")
+        conn.execute("PRAGMA main.wal_checkpoint(TRUNCATE)")
+
+    return MaintenanceResult(db_key, integrity, before, _file_size(path), round((time.perf_counter() - started) * 1000, 3))
+
+
+def run_maintenance(vacuum: bool = True) -> list[MaintenanceResult]:
+    started = time.perf_counter()
+    try:
+        results = [maintain_database(db_key, vacuum) for db_key in DB_MAP]
+        if vacuum and next(r for r in results if r.db_key == "patients").integrity == "ok":
+            patient_repo.rebuild_search_index()
+            rebuild_notes_index()
+    except sqlite3.Error as e:
+        logger.error(f"Maintenance failed: {e}")
+        raise
+
+    freed = sum(r.bytes_before - r.bytes_after for r in results)
+    log = logger.bind(operation="maintenance", duration_ms=round((time.perf_counter() - started) * 1000, 3))
+    log.info(f"Maintenance finished: {', '.join(f'{r.db_key} {r.integrity}' for r in results)}; {freed} bytes freed")
+    return results
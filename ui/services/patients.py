@@ -0,0 +1,26 @@
+# ui/services/patients.py
+
+# ---Patient onboarding: the form rules, then the insert.
+
+
+import sqlite3
+
+from ui.config.logger_config import logger
+from ui.database.repositories import patient_repo
+from ui.services.errors import ServiceError
+from ui.util.validators import validate_patient
+
+
+def onboard_patient(name: str, dob: str, phone: str, email: str) -> str:
+    # ---Returns the new PatientId; raises ServiceError for the first invalid field
+    name, dob, phone, email = name.strip(), dob.strip(), phone.strip(), email.strip()
+    issue = validate_patient(name, dob, phone, email)
+    if issue:
+        raise ServiceError(issue.title, issue.message)
+
+    try:
+        # ---The PatientId is reserved inside the insert transaction
+        return patient_repo.create(name, dob, phone, email)
+    except sqlite3.Error as e:
+        logger.error(f"Error saving patient {name}: {e}")
+        raise
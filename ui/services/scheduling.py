@@ -0,0 +1,47 @@
+# ui/services/scheduling.py
+
+# ---Booking an office visit: the patient and provider must exist, the slot must be free and the
+# ---provider under their daily limit. All are checked by the insert itself (schedule_repo.book),
+# ---which is retried if the database stays locked past busy_timeout.
+
+
+import sqlite3
+import uuid
+
+from ui.config.logger_config import logger
+from ui.database.connection import retry_busy
+from ui.database.reference_cache import reference_cache
+from ui.database.repositories import Booking, schedule_repo
+from ui.services.errors import ServiceError
+
+
+class SlotTaken(ServiceError):
+    # ---The slot was booked by someone else; views of that day are out of date
+    pass
+
+
+def book_visit(provider_id: str, patient_id: str | None, date_str: str, slot_hour: int | None) -> Booking:
+    if patient_id is None:
+        raise ServiceError("Input Error", "Please select a patient.")
+    if slot_hour is None:
+        raise ServiceError("Slot unavailable", "Selected time block is already booked.")
+
+    booking = Booking(str(uuid.uuid4()), provider_id, patient_id, date_str, slot_hour)
+    try:
+        # ---One conditional insert; committing it updates the cached day and publishes BookingMade
+        outcome = retry_busy(lambda: schedule_repo.book(booking), "patients")
+    except sqlite3.Error as e:
+        logger.error(f"Error writing to Schedule in patients db: {e}")
+        raise
+
+    if outcome == "unknown_patient":
+        raise ServiceError("Input Error", "That patient does not exist.")
+    if outcome == "unknown_provider":
+        raise ServiceError("Input Error", "That provider does not exist.")
+    if outcome == "taken":
+        raise SlotTaken("Slot taken", "The provider is already booked for that time.")
+    if outcome == "full":
+        provider = reference_cache.provider(provider_id)
+        max_visits = provider.max_visits_per_day if provider else None
+        raise ServiceError("Provider unavailable", f"The provider is limited to {max_visits} visits per day.")
+    return booking
@@ -0,0 +1,26 @@
+# ui/services/visits.py
+
+# ---Recording a visit: required fields, then the visit, bill and notification in one transaction
+# ---(ui/database/record_visit.py).
+
+
+import sqlite3
+
+from ui.config.logger_config import logger
+from ui.database.record_visit import RecordedVisit, UnknownProvider, record_visit
+from ui.services.errors import ServiceError
+
+
+def add_visit(patient_id: str | None, provider_id: str | None, visit_date: str, visit_notes: str, follow_up: str) -> RecordedVisit:
+    if patient_id is None:
+        raise ServiceError("Input Error", "Please select a patient.")
+    if provider_id is None:
+        raise ServiceError("Input Error", "Please select a provider.")
+
+    try:
+        return record_visit(patient_id, provider_id, visit_date, visit_notes.strip(), follow_up.strip())
+    except UnknownProvider:
+        raise ServiceError("Input Error", "That provider does not exist.") from None
+    except sqlite3.Error as e:
+        logger.error(f"Error recording visit: {e}")
+        raise
@@ -6,27 +6,14 @@ from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QDialog, QDialogButtonBox, QFormLayout, QLineEdit, QMessageBox, QVBoxLayout
 
 from ui.config.logger_config import logger
-from ui.config.paths import CORE_DB
+from ui.database.repositories import user_repo
 from ui.database.write_to_db import write_to_database
 from ui.util.resize_window import size_and_center_window
 
 
 def verify_admin_credentials(username: str, password: str) -> bool:
     try:
-        with sqlite3.connect(CORE_DB) as conn:
-            conn.row_factory = sqlite3.Row
-            cur = conn.execute(
-                """
-                SELECT 1
-                FROM   Users
-                WHERE  UserName = ?
-                AND  UserPassword = ?
-                AND  UserPrivilegeLevel = 'Admin'
-                LIMIT 1;
-                """,
-                (username, password),
-            )
-            return cur.fetchone() is not None
+        return user_repo.is_admin(username, password)
     except sqlite3.Error as exc:
         logger.error("SQLite error while validating admin credentials: %s", exc)
         return False
@@ -1,7 +1,5 @@
 # update_providers.py
 
-import sqlite3
-
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
     QFormLayout,
@@ -12,8 +10,8 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from ui.config.paths import PATIENT_DB
-from ui.database.write_to_db import write_to_database
+from ui.database.repositories import provider_repo
+from ui.util.async_query import busy_bar, query_pool
 
 
 class UpdateProvidersWindow(QWidget):
@@ -42,9 +40,9 @@ class UpdateProvidersWindow(QWidget):
         self.provider_rate_input = QLineEdit(self)
         form_layout.addRow("Provider Rate:", self.provider_rate_input)
 
-        # ---Max Visits Per Day
-        """self.max_visits_input = QLineEdit(self)
-        form_layout.addRow("Max Visits Per Day:", self.max_visits_input)"""
+        # ---Max Visits Per Day (optional, blank means no limit)
+        self.max_visits_input = QLineEdit(self, placeholderText="No limit")
+        form_layout.addRow("Max Visits Per Day:", self.max_visits_input)
 
         container_layout.addLayout(form_layout)
 
@@ -53,43 +51,37 @@ class UpdateProvidersWindow(QWidget):
         self.add_button.clicked.connect(self.add_provider)
         container_layout.addWidget(self.add_button, alignment=Qt.AlignmentFlag.AlignHCenter)
 
-        main_layout.addWidget(container)
+        self.busy = busy_bar(self)
+        self._save_key = f"update_providers.save.{id(self)}"
+        container_layout.addWidget(self.busy)
 
-    def _generate_provider_id(self) -> str:
-        # ---Count existing providers and return next ID
-        try:
-            conn = sqlite3.connect(PATIENT_DB)
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM Provider;")
-            count = cursor.fetchone()[0] or 0
-        finally:
-            conn.close()
-        return str(count + 1)
+        main_layout.addWidget(container)
 
     def add_provider(self) -> None:
-        provider_id = self._generate_provider_id()
         provider_name = self.provider_name_input.text().strip()
         # user_id = self.user_id_input.text().strip()
 
         # ---Rate and Max Visits validation
         rate_text = self.provider_rate_input.text().strip()
-        # max_visits_text = self.max_visits_input.text().strip()
+        max_visits_text = self.max_visits_input.text().strip()
         if not rate_text:
             QMessageBox.warning(self, "Input Error", "Provider Rate is required.")
             return
-        """if not max_visits_text:
-            QMessageBox.warning(self, "Input Error", "Max Visits Per Day is required.")
-            return"""
         try:
             provider_rate = float(rate_text)
         except ValueError:
             QMessageBox.warning(self, "Input Error", "Provider Rate must be a number.")
             return
-        """try:
-            max_visits = int(max_visits_text)
-        except ValueError:
-            QMessageBox.warning(self, "Input Error", "Max Visits Per Day must be an integer.")
-            return"""
+        max_visits = None
+        if max_visits_text:
+            try:
+                max_visits = int(max_visits_text)
+            except ValueError:
+                QMessageBox.warning(self, "Input Error", "Max Visits Per Day must be an integer.")
+                return
+            if max_visits < 1:
+                QMessageBox.warning(self, "Input Error", "Max Visits Per Day must be at least 1.")
+                return
 
         # ---Validation
         if not provider_name:
@@ -99,28 +91,38 @@ class UpdateProvidersWindow(QWidget):
             QMessageBox.warning(self, "Input Error", "User ID is required.")
             return"""
 
-        # ---Prepare data for database insertion
-        provider_data = {
-            "ProviderId": provider_id,
-            "ProviderName": provider_name,
-            # "UserId": user_id,
-            "ProviderRate": provider_rate,
-            # "MaxVisitsPerDay": max_visits,
-        }
-
-        # ---Insert provider details into the database
-        success = write_to_database("patients", "Provider", provider_data)
-        if success:
-            QMessageBox.information(
-                self,
-                "Success",
-                "Provider added successfully.",
-                QMessageBox.StandardButton.Ok,
-            )
-            # ---Clear input fields
-            self._clear_inputs()
-        else:
-            QMessageBox.critical(self, "Database Error", "Failed to add provider.")
+        # ---Insert provider details into the database; the ProviderId is reserved in the same transaction.
+        # ---Open screens pick the new provider up from the ProviderCreated event. The insert runs on
+        # ---the query pool so a database locked by another desk cannot freeze the window.
+        self._set_saving(True)
+        query_pool.submit(
+            provider_repo.create,
+            provider_name,
+            provider_rate,
+            max_visits,
+            on_result=self._provider_added,
+            on_error=self._add_failed,
+            key=self._save_key,
+        )
+
+    def _set_saving(self, saving: bool) -> None:
+        self.busy.setVisible(saving)
+        self.add_button.setEnabled(not saving)
+
+    def _provider_added(self, _provider_id: str) -> None:
+        self._set_saving(False)
+        QMessageBox.information(
+            self,
+            "Success",
+            "Provider added successfully.",
+            QMessageBox.StandardButton.Ok,
+        )
+        # ---Clear input fields
+        self._clear_inputs()
+
+    def _add_failed(self, _error: Exception) -> None:
+        self._set_saving(False)
+        QMessageBox.critical(self, "Database Error", "Failed to add provider.")
 
     def _clear_inputs(self) -> None:
         for child in self.findChildren(QLineEdit):
@@ -0,0 +1,164 @@
+# ui/util/async_query.py
+
+# ---Runs database calls on a QThreadPool and hands results back to widgets through signals.
+# ---Each pool thread keeps its own connections (see connection.bound_connections). Requests can
+# ---be given a key; submitting a new request under the same key cancels the older one, so a
+# ---quick succession of selections only ever delivers the last result. Writes go through the
+# ---pool too, so a database another desk has locked cannot freeze the window that saves.
+
+
+import threading
+from collections.abc import Callable
+from typing import Any
+
+from PySide6.QtCore import QEventLoop, QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtWidgets import QProgressBar, QWidget
+
+from ui.config.logger_config import logger
+from ui.database.connection import bound_connections
+from ui.services.errors import ServiceError
+
+
+class _QuerySignals(QObject):
+    succeeded = Signal(object)
+    failed = Signal(object)  # ---the exception
+
+
+class QueryTask(QRunnable):
+    def __init__(self, pool: "QueryPool", fn: Callable[..., Any], args: tuple) -> None:
+        super().__init__()
+        self.setAutoDelete(False)  # ---the pool holds the reference until the result is delivered
+        self.pool = pool
+        self.fn = fn
+        self.args = args
+        self.signals = _QuerySignals()
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        # ---A running query finishes, but its result is dropped
+        self.cancelled = True
+
+    def run(self) -> None:
+        if self.cancelled:
+            return
+        try:
+            with bound_connections(self.pool._connections_for_thread()):
+                result = self.fn(*self.args)
+        except Exception as e:
+            # ---A ServiceError is a refusal worded for the user, not a failure
+            if not isinstance(e, ServiceError):
+                logger.error(f"Background query {getattr(self.fn, '__qualname__', self.fn)} failed: {e}")
+            self.signals.failed.emit(e)
+            return
+        self.signals.succeeded.emit(result)
+
+
+class QueryPool(QObject):
+    busy_changed = Signal(str, bool)  # ---key, pending
+
+    def __init__(self, max_threads: int = 4, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self.pool.setExpiryTimeout(-1)  # ---keep workers, and with them their connections
+        self._connections: dict[int, dict] = {}
+        self._connections_lock = threading.Lock()
+        self._pending: set[QueryTask] = set()
+        self._keyed: dict[str, QueryTask] = {}
+
+    def _connections_for_thread(self) -> dict:
+        with self._connections_lock:
+            return self._connections.setdefault(threading.get_ident(), {})
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,  # noqa: ANN401
+        on_result: Callable[[Any], None] | None = None,
+        on_error: Callable[[Exception], None] | None = None,
+        key: str | None = None,
+    ) -> QueryTask:
+        if key is not None:
+            self.cancel(key)
+
+        task = QueryTask(self, fn, args)
+        task.signals.succeeded.connect(lambda result: self._deliver(task, key, on_result, result))
+        task.signals.failed.connect(lambda error: self._deliver(task, key, on_error, error))
+        self._pending.add(task)
+        if key is not None:
+            self._keyed[key] = task
+            self.busy_changed.emit(key, True)
+        self.pool.start(task)
+        return task
+
+    def cancel(self, key: str) -> None:
+        task = self._keyed.pop(key, None)
+        if task is None:
+            return
+        task.cancel()
+        if self.pool.tryTake(task):
+            self._pending.discard(task)
+        self.busy_changed.emit(key, False)
+
+    def is_pending(self, key: str) -> bool:
+        return key in self._keyed
+
+    def reload_or_apply(self, key: str, reload: Callable[[], None], apply: Callable[[], None]) -> None:
+        # ---For a change announced on the event bus: a load still running under `key` may have read
+        # ---the data before the change, so it is started again; otherwise the change is applied to
+        # ---what is already on screen
+        if self.is_pending(key):
+            reload()
+        else:
+            apply()
+
+    def _deliver(self, task: QueryTask, key: str | None, callback: Callable[[Any], None] | None, value: Any) -> None:  # noqa: ANN401
+        # ---Runs on the GUI thread (queued from the worker)
+        self._pending.discard(task)
+        if task.cancelled:
+            return
+        if key is not None and self._keyed.get(key) is task:
+            del self._keyed[key]
+            self.busy_changed.emit(key, False)
+        if callback is not None:
+            callback(value)
+
+    def wait(self, fn: Callable[..., Any], *args: Any) -> Any:  # noqa: ANN401
+        # ---Runs fn on the pool while the GUI keeps processing events; for modal flows such as login.
+        loop = QEventLoop()
+        outcome: dict[str, Any] = {}
+
+        def finish(name: str, value: Any) -> None:  # noqa: ANN401
+            outcome[name] = value
+            loop.quit()
+
+        self.submit(fn, *args, on_result=lambda value: finish("result", value), on_error=lambda error: finish("error", error))
+        loop.exec()
+        if "error" in outcome:
+            raise RuntimeError(str(outcome["error"])) from outcome["error"]
+        return outcome["result"]
+
+    def shutdown(self) -> None:
+        # ---Waiting removes the pool's threads; their connections are then closed when released
+        for key in list(self._keyed):
+            self.cancel(key)
+        self.pool.clear()
+        self.pool.waitForDone()
+        self._pending.clear()
+        with self._connections_lock:
+            for connections in self._connections.values():
+                connections.clear()
+            self._connections.clear()
+
+
+def busy_bar(parent: QWidget) -> QProgressBar:
+    # ---Thin indeterminate bar shown while a window's data is loading
+    bar = QProgressBar(parent)
+    bar.setRange(0, 0)
+    bar.setTextVisible(False)
+    bar.setMaximumHeight(4)
+    bar.setVisible(False)
+    return bar
+
+
+query_pool = QueryPool()
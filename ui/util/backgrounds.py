@@ -0,0 +1,176 @@
+# ui/util/backgrounds.py
+
+# ---Background images for windows and dialogs. Each file is decoded once; scaled copies are cached
+# ---per (file, size, device pixel ratio), so a repaint blits a pixmap that is already the window's
+# ---size instead of tiling the full-resolution image. Scaling runs on a worker thread (QImage may
+# ---be used off the GUI thread, QPixmap may not); until it finishes the window keeps its previous
+# ---background, and a burst of resizes only scales for the last size.
+
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+
+from PySide6.QtCore import QEvent, QObject, QRect, QSize, Qt, QTimer
+from PySide6.QtGui import QBrush, QImage, QPalette, QPixmap
+from PySide6.QtWidgets import QWidget
+from shiboken6 import isValid
+
+from ui.config.logger_config import logger
+from ui.config.paths import ROOT_BACKGROUND
+from ui.util.async_query import QueryPool
+
+type _Variant = tuple[Path, int, int, float]  # ---file, width and height in device pixels, DPR
+
+
+def _cover(image: QImage, width: int, height: int) -> QImage:
+    # ---Scale to fill width x height (device pixels) and crop the overflow evenly
+    scaled = image.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatioByExpanding, Qt.TransformationMode.SmoothTransformation)
+    x = (scaled.width() - width) // 2
+    y = (scaled.height() - height) // 2
+    return scaled.copy(QRect(x, y, width, height)).convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+
+
+def _variant(path: Path, size: QSize, dpr: float) -> _Variant:
+    return (Path(path), max(1, round(size.width() * dpr)), max(1, round(size.height() * dpr)), dpr)
+
+
+class BackgroundCache:
+    MAX_VARIANTS = 8  # ---scaled pixmaps kept across all files; a full-screen one is ~8 MB at DPR 1
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()  # ---guards _images, which the scaling thread reads too
+        self._images: dict[Path, QImage] = {}
+        self._variants: OrderedDict[_Variant, QPixmap] = OrderedDict()  # ---least recently used first
+        self._pool: QueryPool | None = None
+
+    def image(self, path: Path) -> QImage:
+        # ---Decoded once per file; safe from any thread
+        path = Path(path)
+        with self._lock:
+            image = self._images.get(path)
+        if image is None:
+            image = QImage(str(path))
+            if image.isNull():
+                logger.error(f"Could not load background image {path}")
+            with self._lock:
+                image = self._images.setdefault(path, image)
+        return image
+
+    def cached(self, path: Path, size: QSize, dpr: float) -> QPixmap | None:
+        variant = _variant(path, size, dpr)
+        pixmap = self._variants.get(variant)
+        if pixmap is not None:
+            self._variants.move_to_end(variant)
+        return pixmap
+
+    def scaled(self, path: Path, size: QSize, dpr: float) -> QPixmap:
+        # ---Synchronous; GUI thread only
+        pixmap = self.cached(path, size, dpr)
+        if pixmap is None:
+            variant = _variant(path, size, dpr)
+            pixmap = self._store(variant, _cover(self.image(variant[0]), variant[1], variant[2]))
+        return pixmap
+
+    def request(self, path: Path, size: QSize, dpr: float, on_ready: Callable[[QPixmap], None], key: str) -> None:
+        # ---on_ready(pixmap) runs on the GUI thread: at once when cached, else after scaling. A newer
+        # ---request under the same key replaces one that has not finished.
+        pixmap = self.cached(path, size, dpr)
+        if pixmap is not None:
+            self._scale_pool().cancel(key)
+            on_ready(pixmap)
+            return
+        variant = _variant(path, size, dpr)
+        self._scale_pool().submit(
+            self._scale,
+            variant,
+            on_result=lambda image: on_ready(self._store(variant, image)),
+            key=key,
+        )
+
+    def cancel(self, key: str) -> None:
+        if self._pool is not None and self._pool.is_pending(key):
+            self._pool.cancel(key)
+
+    def clear(self) -> None:
+        self._variants.clear()
+        with self._lock:
+            self._images.clear()
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _scale(self, variant: _Variant) -> QImage:
+        return _cover(self.image(variant[0]), variant[1], variant[2])
+
+    def _store(self, variant: _Variant, image: QImage) -> QPixmap:
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(variant[3])
+        self._variants[variant] = pixmap
+        self._variants.move_to_end(variant)
+        while len(self._variants) > self.MAX_VARIANTS:
+            self._variants.popitem(last=False)
+        return pixmap
+
+    def _scale_pool(self) -> QueryPool:
+        # ---One thread: scaling is CPU-bound and only the newest size per window matters
+        if self._pool is None:
+            self._pool = QueryPool(max_threads=1)
+        return self._pool
+
+
+
+class _BackgroundUpdater(QObject):
+    # ---Keeps one widget's palette brush matched to its size and screen
+    RESIZE_DELAY_MS = 60  # ---wait for a drag-resize to pause before scaling
+
+    def __init__(self, widget: QWidget, path: Path) -> None:
+        super().__init__(widget)
+        self.widget = widget
+        self.path = Path(path)
+        self.key = f"background.{id(widget)}"
+        self.applied: _Variant | None = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.RESIZE_DELAY_MS)
+        self._timer.timeout.connect(self.update)
+        widget.installEventFilter(self)
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:  # noqa: N802
+        if watched is self.widget and event.type() in (QEvent.Type.Resize, QEvent.Type.DevicePixelRatioChange, QEvent.Type.Show):
+            # ---The current cached variant is applied straight away; otherwise scale after the pause
+            size, dpr = self.widget.size(), self.widget.devicePixelRatioF()
+            pixmap = background_cache.cached(self.path, size, dpr)
+            if pixmap is not None:
+                self._timer.stop()
+                self._apply(pixmap, _variant(self.path, size, dpr))
+            else:
+                self._timer.start()
+        return False
+
+    def update(self) -> None:
+        size, dpr = self.widget.size(), self.widget.devicePixelRatioF()
+        variant = _variant(self.path, size, dpr)
+        if variant != self.applied:
+            background_cache.request(self.path, size, dpr, lambda pixmap: self._apply(pixmap, variant), self.key)
+
+    def _apply(self, pixmap: QPixmap, variant: _Variant) -> None:
+        # ---A scale can finish after its window has been closed and deleted
+        if variant == self.applied or not isValid(self.widget):
+            return
+        self.applied = variant
+        palette = self.widget.palette()
+        palette.setBrush(QPalette.ColorRole.Window, QBrush(pixmap))
+        self.widget.setPalette(palette)
+
+
+def apply_background(widget: QWidget, path: Path = ROOT_BACKGROUND) -> None:
+    # ---Any window or dialog: the image covers the widget and follows its size and screen
+    updater = _BackgroundUpdater(widget, path)
+    updater.update()
+
+
+background_cache = BackgroundCache()
@@ -0,0 +1,35 @@
+# ui/util/gui_dispatch.py
+
+# ---Delivers event bus callbacks on the GUI thread. Events published on the GUI thread are
+# ---handled before publish() returns; events from import/export workers or the query pool are
+# ---queued through a signal and handled by the event loop.
+
+
+from collections.abc import Callable
+
+from PySide6.QtCore import QCoreApplication, QObject, QThread, Signal
+
+from ui.database.events import event_bus
+
+
+class _GuiDispatcher(QObject):
+    _queued = Signal(object)
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        # ---Auto connection: queued whenever the emitting thread is not this object's thread
+        self._queued.connect(self._run)
+
+    def __call__(self, fn: Callable[[], None]) -> None:
+        if QThread.currentThread() is self.thread():
+            fn()
+        else:
+            self._queued.emit(fn)
+
+    def _run(self, fn: Callable[[], None]) -> None:
+        fn()
+
+
+def install_gui_dispatcher(app: QCoreApplication) -> None:
+    # ---Call from the GUI thread once the application object exists
+    event_bus.set_dispatcher(_GuiDispatcher(app))
@@ -0,0 +1,119 @@
+# ui/util/paint_benchmark.py
+
+# ---Repaint and resize timings for the main window background, before (the full-resolution
+# ---image as a tiled palette brush, as MainWindow used to set it) and after (background_cache's
+# ---pre-scaled pixmap). Runs headless on the offscreen platform unless QT_QPA_PLATFORM is set,
+# ---and emulates a high-DPI screen with --scale. Output matches ui.database.benchmark.
+
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from PySide6.QtGui import QBrush, QPalette, QPixmap, QPixmapCache
+from PySide6.QtWidgets import QApplication, QWidget
+
+from ui.config.paths import ROOT_BACKGROUND
+from ui.database.benchmark import Scenario, ScenarioResult, run_scenario
+from ui.util.backgrounds import apply_background, background_cache
+
+DEFAULT_ITERATIONS = 100
+DEFAULT_WARMUP = 5
+DEFAULT_SIZE = (1600, 900)  # ---MainWindow opens at 85% x 75% of the screen
+
+
+def run_paint_benchmarks(path: Path, width: int, height: int, iterations: int, warmup: int) -> list[ScenarioResult]:
+    app = QApplication.instance() or QApplication([])
+    sizes = [(width, height), (width - 200, height - 150)]
+
+    def window() -> QWidget:
+        widget = QWidget()
+        widget.resize(width, height)
+        widget.show()
+        app.processEvents()
+        return widget
+
+    def settle(widget: QWidget) -> None:
+        # ---Let the scaling thread deliver the variant for the current size
+        deadline = time.monotonic() + 5
+        while background_cache.cached(path, widget.size(), widget.devicePixelRatioF()) is None and time.monotonic() < deadline:
+            app.processEvents()
+            time.sleep(0.001)
+        app.processEvents()
+
+    before = window()
+    palette = before.palette()
+    palette.setBrush(QPalette.ColorRole.Window, QBrush(QPixmap(str(path))))
+    before.setPalette(palette)
+
+    after = window()
+    apply_background(after, path)
+    settle(after)
+    for w, h in sizes:  # ---both resize targets cached, as after the first drag back and forth
+        after.resize(w, h)
+        settle(after)
+
+    def resize(widget: QWidget) -> object:
+        def run(_rng: object, _sample: object, i: int) -> None:
+            widget.resize(*sizes[i % 2])
+            app.processEvents()
+            widget.repaint()
+
+        return run
+
+    def resize_uncached(_rng: object, _sample: object, i: int) -> None:
+        # ---A size never seen before: the GUI thread only resizes and repaints, scaling is queued
+        after.resize(width - 100 - i % 97, height - 100 - i % 89)
+        app.processEvents()
+        after.repaint()
+
+    def load_pixmap(_rng: object, _sample: object, _i: int) -> None:
+        QPixmapCache.clear()  # ---QPixmap(path) is otherwise served from Qt's pixmap cache
+        QPixmap(str(path))
+
+    def load_image(_rng: object, _sample: object, _i: int) -> None:
+        background_cache.clear()
+        background_cache.image(path)
+
+    scenarios = [
+        Scenario("before.repaint", lambda *_: before.repaint()),
+        Scenario("after.repaint", lambda *_: after.repaint()),
+        Scenario("before.resize", resize(before)),
+        Scenario("after.resize", resize(after)),
+        Scenario("after.resize_uncached", resize_uncached),
+        Scenario("before.load_pixmap", load_pixmap),
+        Scenario("after.load_image", load_image),
+    ]
+    results = [run_scenario(scenario, None, iterations, warmup) for scenario in scenarios]  # type: ignore[arg-type]
+    background_cache.shutdown()
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Time main window background repaints before and after pre-scaling.")
+    parser.add_argument("--image", type=Path, default=ROOT_BACKGROUND)
+    parser.add_argument("--width", type=int, default=DEFAULT_SIZE[0])
+    parser.add_argument("--height", type=int, default=DEFAULT_SIZE[1])
+    parser.add_argument("--scale", type=float, default=None, help="device pixel ratio to emulate, e.g. 2")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    if args.scale:
+        os.environ["QT_SCALE_FACTOR"] = str(args.scale)
+    if not args.image.exists():
+        print(f"No such image: {args.image}", file=sys.stderr)
+        return 1
+
+    print(f"{args.image.name} at {args.width}x{args.height}{f' x{args.scale}' if args.scale else ''}")
+    print(f"{'scenario':<28}{'p50 ms':>10}{'p90 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'ops/s':>10}")
+    for r in run_paint_benchmarks(args.image, args.width, args.height, args.iterations, args.warmup):
+        print(f"{r.name:<28}{r.p50_ms:>10.2f}{r.p90_ms:>10.2f}{r.p95_ms:>10.2f}{r.p99_ms:>10.2f}{r.max_ms:>10.2f}{r.ops_per_sec:>10.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,141 @@
+# ui/util/startup_profiler.py
+
+# ---Cold-start timings: phases marked by main.py (imports, QApplication, schema check, setup
+# ---check, first dialog on screen) are logged once the first dialog is up, and checked against
+# ---STARTUP_BUDGET_MS. With HEALTHCARE_PROFILE_STARTUP=1 every module import is timed as well and
+# ---the slowest are logged. Imported first by main.py, so it may only use the standard library
+# ---at module level.
+
+
+import importlib.machinery
+import os
+import sys
+import time
+from types import ModuleType
+from typing import NamedTuple
+
+# ---Process start to the first dialog on screen, with compiled bytecode (__pycache__ or a frozen
+# ---build): about 370 ms against ~320 ms for PySide6 and loguru alone. The first run after an
+# ---install, or PYTHONDONTWRITEBYTECODE=1, compiles every module and takes ~100 ms longer.
+STARTUP_BUDGET_MS = 400.0
+TOP_IMPORTS = 15
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_ms: float  # ---excluding the modules it imported
+    total_ms: float
+
+
+class _TimedLoader:
+    # ---Plain classes rather than importlib.abc, which would pull in importlib.resources (~50 ms)
+
+    def __init__(self, loader: object, profiler: "StartupProfiler") -> None:
+        self.loader = loader
+        self.profiler = profiler
+
+    def create_module(self, spec: importlib.machinery.ModuleSpec) -> ModuleType | None:
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        self.profiler._exec_timed(self.loader, module)  # noqa: SLF001
+
+    def __getattr__(self, name: str) -> object:
+        # ---get_resource_reader, is_package, ... go to the real loader
+        return getattr(self.loader, name)
+
+
+class _TimingFinder:
+    def __init__(self, profiler: "StartupProfiler") -> None:
+        self.profiler = profiler
+        self._busy = False
+
+    def find_spec(self, fullname: str, path: object, target: ModuleType | None = None) -> importlib.machinery.ModuleSpec | None:
+        if self._busy:
+            return None
+        self._busy = True
+        try:
+            # ---Let the other finders resolve it, then wrap whatever loader they chose
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._busy = False
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self.profiler)
+        return spec
+
+
+class StartupProfiler:
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.phases: list[tuple[str, float]] = []  # ---(phase, ms it took), in order
+        self.imports: dict[str, ImportTime] = {}
+        self.finished = False
+        self._last = self.started
+        self._stack: list[float] = []  # ---child time accumulated per import in progress
+        self._finder: _TimingFinder | None = None
+
+    def trace_imports(self) -> None:
+        if self._finder is None:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def mark(self, phase: str) -> None:
+        # ---Ends a phase: the time since the previous mark is put down to it
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self._last) * 1000))
+        self._last = now
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def finish(self, phase: str) -> None:
+        # ---Marks the last phase and logs the report; later calls do nothing
+        if self.finished:
+            return
+        self.mark(phase)
+        self.finished = True
+        if self._finder is not None:
+            sys.meta_path.remove(self._finder)
+            self._finder = None
+        self._report()
+
+    def slowest_imports(self, count: int = TOP_IMPORTS) -> list[ImportTime]:
+        return sorted(self.imports.values(), key=lambda i: i.self_ms, reverse=True)[:count]
+
+    def _exec_timed(self, loader: object, module: ModuleType) -> None:
+        start = time.perf_counter()
+        self._stack.append(0.0)
+        try:
+            loader.exec_module(module)
+        finally:
+            total = (time.perf_counter() - start) * 1000
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += total
+            self.imports[module.__name__] = ImportTime(module.__name__, round(total - children, 3), round(total, 3))
+
+    def _report(self) -> None:
+        from ui.config.logger_config import logger
+
+        total = sum(ms for _, ms in self.phases)
+        phases = ", ".join(f"{phase} {ms:.0f} ms" for phase, ms in self.phases)
+        log = logger.bind(operation="startup", duration_ms=round(total, 3))
+        if total > STARTUP_BUDGET_MS:
+            log.warning(f"Startup took {total:.0f} ms, over the {STARTUP_BUDGET_MS:.0f} ms budget: {phases}")
+        else:
+            log.info(f"Startup took {total:.0f} ms: {phases}")
+        if self.imports:
+            slowest = ", ".join(f"{i.module} {i.self_ms:.1f} ms" for i in self.slowest_imports())
+            logger.info(f"Slowest imports (self time): {slowest}")
+
+
+startup = StartupProfiler()
+if os.environ.get("HEALTHCARE_PROFILE_STARTUP") == "1":
+    startup.trace_imports()
@@ -0,0 +1,86 @@
+# ui/util/validators.py
+
+# ---Patient field rules shared by the onboarding form and the bulk importer.
+# ---Patterns are written in simplematch syntax and compiled to regexes once at import, instead of
+# ---being re-parsed by every sm.match() call.
+
+
+import re
+from typing import NamedTuple
+
+import simplematch as sm
+
+
+class _Pattern:
+    def __init__(self, pattern: str) -> None:
+        self.regex = re.compile(sm.Matcher(pattern).regex)
+
+    def match(self, string: str) -> dict[str, str] | None:
+        result = self.regex.match(string)
+        return result.groupdict() if result else None
+
+
+DOB_MATCHER = _Pattern("{year}-{month}-{day}")
+PHONE_MATCHER = _Pattern("({area}) {prefix}-{line}")
+EMAIL_MATCHER = _Pattern("{username}@{domain}")
+
+
+class ValidationIssue(NamedTuple):
+    title: str
+    message: str
+
+
+def validate_dob(dob: str) -> ValidationIssue | None:
+    if not dob:
+        return ValidationIssue("Input Error", "DOB is required.")
+
+    # ---Validate dob format.
+    match_result = DOB_MATCHER.match(dob)
+    if not match_result:
+        return ValidationIssue("Invalid Input", "DOB must be in the format of yyyy-mm-dd.")
+
+    # ---Ensure that 'year', 'month', and 'day' are all digits
+    if not all(match_result.get(part, "").isdigit() for part in ("year", "month", "day")):
+        return ValidationIssue("Invalid Input", "DOB components must be numeric.")
+    return None
+
+
+def validate_phone(phone: str) -> ValidationIssue | None:
+    if not phone:
+        return ValidationIssue("Input Error", "Phone is required.")
+
+    # ---Expected pattern: (###) ###-####
+    match_result = PHONE_MATCHER.match(phone)
+    if not match_result:
+        return ValidationIssue("Invalid Input", "Phone must be in the format (###) ###-####.")
+
+    # ---Verify that each input contains the correct number of digits and only digits
+    if len(match_result.get("area", "")) != 3 or not match_result["area"].isdigit():
+        return ValidationIssue("Invalid Input", "Area code must be exactly 3 digits.")
+    if len(match_result.get("prefix", "")) != 3 or not match_result["prefix"].isdigit():
+        return ValidationIssue("Invalid Input", "Prefix must be exactly 3 digits.")
+    if len(match_result.get("line", "")) != 4 or not match_result["line"].isdigit():
+        return ValidationIssue("Invalid Input", "Line number must be exactly 4 digits.")
+    return None
+
+
+def validate_email(email: str) -> ValidationIssue | None:
+    if not email:
+        return ValidationIssue("Input Error", "Email is required.")
+
+    # ---Expected pattern: username@domain
+    email_result = EMAIL_MATCHER.match(email)
+    if not email_result:
+        return ValidationIssue("Invalid Input", "Email must be in the format username@domain.")
+
+    # ---Ensure the domain contains a period (e.g., yahoo.com)
+    if "." not in email_result.get("domain", ""):
+        return ValidationIssue("Invalid Input", "Email domain must contain a period (e.g., yahoo.com).")
+    return None
+
+
+def validate_patient(name: str, dob: str, phone: str, email: str) -> ValidationIssue | None:
+    # ---Returns the first problem found, in form order, or None when the patient is valid.
+    if not name:
+        return ValidationIssue("Input Error", "Name is required.")
+    return validate_dob(dob) or validate_phone(phone) or validate_email(email)
@@ -0,0 +1,123 @@
+# window_registry.py
+
+# ---Creates each sub-window the first time it is opened and reuses it afterwards.
+# ---Screens declare the data they show (e.g. "providers"); invalidating that data marks them
+# ---stale, and a stale screen calls its refresh() the next time it is shown, or straight away
+# ---when it is already on screen. Heavy screens can be capped with an LRU: opening one more than
+# ---the cap closes the least recently used heavy screen, which is rebuilt if opened again.
+# ---A screen that still owns running work (an export thread, a pending query) says so through
+# ---can_evict() and is kept open until a later eviction finds it idle.
+# ---Factories made with lazy() import the screen's module on first open, not at start-up.
+
+
+import importlib
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from typing import NamedTuple
+
+from PySide6.QtWidgets import QStackedWidget, QWidget
+
+from ui.config.logger_config import log_operation, logger, set_log_context
+
+
+class _Screen(NamedTuple):
+    factory: Callable[[QWidget], QWidget]
+    heavy: bool
+    depends: frozenset[str]
+
+
+def lazy(module: str, name: str) -> Callable[[QWidget], QWidget]:
+    # ---Factory for a window class that is imported the first time the window is built
+    def factory(parent: QWidget) -> QWidget:
+        return getattr(importlib.import_module(module), name)(parent)
+
+    return factory
+
+
+class WindowRegistry:
+    def __init__(self, area: QStackedWidget, parent: QWidget, max_heavy: int | None = None) -> None:
+        self.area = area
+        self.parent = parent
+        self.max_heavy = max_heavy
+        self._screens: dict[str, _Screen] = {}
+        self._open: OrderedDict[str, QWidget] = OrderedDict()  # ---least recently shown first
+        self._stale: set[str] = set()
+
+    def register(self, key: str, factory: Callable[[QWidget], QWidget], heavy: bool = False, depends: Iterable[str] = ()) -> None:
+        self._screens[key] = _Screen(factory, heavy, frozenset(depends))
+
+    def get(self, key: str) -> QWidget | None:
+        return self._open.get(key)
+
+    def show(self, key: str) -> QWidget:
+        set_log_context(window=key)
+        widget = self._open.get(key)
+        if widget is None:
+            with log_operation("open_window", level="DEBUG"):
+                widget = self._screens[key].factory(self.parent)
+            self.area.addWidget(widget)
+            self._open[key] = widget
+            self._stale.discard(key)
+        else:
+            self._open.move_to_end(key)
+            if key in self._stale:
+                self._refresh(key, widget)
+
+        self.area.setCurrentWidget(widget)
+        self._evict_heavy()
+        return widget
+
+    def invalidate(self, *topics: str) -> None:
+        # ---Marks open screens that depend on any of the topics; closed screens load fresh anyway
+        current = self.area.currentWidget()
+        for key, widget in list(self._open.items()):
+            if self._screens[key].depends.isdisjoint(topics):
+                continue
+            if widget is current:
+                self._refresh(key, widget)
+            else:
+                self._stale.add(key)
+
+    def evict(self, key: str) -> bool:
+        # ---False, leaving the screen open, while it is busy
+        widget = self._open.get(key)
+        if widget is not None and not _can_evict(widget):
+            return False
+        self._open.pop(key, None)
+        self._stale.discard(key)
+        if widget is not None:
+            self.area.removeWidget(widget)
+            widget.deleteLater()
+        return True
+
+    def _refresh(self, key: str, widget: QWidget) -> None:
+        self._stale.discard(key)
+        refresh = getattr(widget, "refresh", None)
+        if refresh is None:
+            # ---Screens without a refresh() are rebuilt the next time they are opened
+            if not self.evict(key):
+                self._stale.add(key)
+            return
+        try:
+            refresh()
+        except Exception as e:
+            logger.error(f"Refreshing the {key} window failed: {e}")
+
+    def _evict_heavy(self) -> None:
+        if self.max_heavy is None:
+            return
+        heavy = [key for key in self._open if self._screens[key].heavy]
+        current = self.area.currentWidget()
+        # ---Least recently shown first; a busy screen is skipped for the next one
+        excess = len(heavy) - self.max_heavy
+        for key in heavy:
+            if excess <= 0:
+                break
+            if self._open[key] is not current and self.evict(key):
+                excess -= 1
+
+
+def _can_evict(widget: QWidget) -> bool:
+    # ---Deleting a screen mid-export destroys its running QThread and aborts the process
+    can_evict = getattr(widget, "can_evict", None)
+    return can_evict is None or can_evict()